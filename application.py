@@ -5,8 +5,10 @@ import os
 import uuid
 import json
 from collections import defaultdict
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
+from typing import List, Literal
 
 # Set Windows event loop policy to prevent "Event loop is closed" errors
 if sys.platform == "win32":
@@ -18,10 +20,16 @@ from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Depe
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 # Import WebSocket manager
 from backend.services.websocket_manager import WebSocketManager
+from backend.nodes.cleaner import shutdown_process_pool
+from backend.services.clients import clients
+from backend.services.outreach import outreach
+from backend.services.telemetry import telemetry
+from backend.services.usage import usage
+from backend.utils.tokens import load_tokenizer
 
 # Load environment variables from .env file at startup
 env_path = Path(__file__).parent / '.env'
@@ -34,7 +42,30 @@ logger.setLevel(logging.INFO)
 console_handler = logging.StreamHandler()
 logger.addHandler(console_handler)
 
-app = FastAPI(title="IntelCraft API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the shared provider clients, load the tokenizer and compile the research graph on startup; close the clients, the cleaner's process pool and the database on shutdown"""
+    clients.start()
+    # The first load downloads the BPE file; do it now rather than on the event loop mid-request
+    if not await asyncio.to_thread(load_tokenizer):
+        logger.warning("tiktoken unavailable, token counts will use the calibrated estimator")
+    try:
+        from backend.graph import get_graph
+        get_graph()
+    except Exception as e:
+        logger.warning(f"Research graph not compiled at startup, will retry on the first job: {e}")
+    yield
+    logger.info("Shutting down...")
+    await clients.close()
+    shutdown_process_pool()
+    try:
+        from backend.database.session import engine
+        await engine.dispose()
+        logger.info("Database connections closed")
+    except:
+        logger.info("No database connections to close")
+
+app = FastAPI(title="IntelCraft API", lifespan=lifespan)
 
 # Include OAuth routes
 try:
@@ -157,23 +188,25 @@ if os.getenv("DATABASE_URL"):
 else:
     logger.info("No DATABASE_URL provided - skipping database initialization")
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Gracefully close database connections on shutdown"""
-    logger.info("Shutting down...")
-    try:
-        from backend.database.session import engine
-        await engine.dispose()
-        logger.info("Database connections closed")
-    except:
-        logger.info("No database connections to close")
-
 class ResearchRequest(BaseModel):
     company: str
     company_url: str | None = None
     industry: str | None = None
     hq_location: str | None = None
     help_description: str | None = None
+    # "fast" favours smaller, quicker models, "quality" the larger ones; defaults to ROUTER_DEFAULT_TIER
+    latency_tier: Literal["fast", "standard", "quality"] | None = None
+
+class OutreachRequest(BaseModel):
+    help_description: str | None = None
+
+class OutreachVariant(BaseModel):
+    persona: str | None = None
+    help_description: str | None = None
+
+class OutreachBatchRequest(BaseModel):
+    kind: Literal["email", "proposal"] = "email"
+    variants: List[OutreachVariant] = Field(min_length=1, max_length=20)
 
 @app.get("/")
 async def ping():
@@ -199,7 +232,7 @@ async def health():
         "version": "1.0.0"
     }
 
-async def run_research_process(job_id: str, company: str, company_url: str = None, industry: str = None, hq_location: str = None, help_description: str = None):
+async def run_research_process(job_id: str, company: str, company_url: str = None, industry: str = None, hq_location: str = None, help_description: str = None, latency_tier: str = None):
     """Background research process that runs the actual LangGraph research system"""
     try:
         logger.info(f"Starting background research process for job {job_id}")
@@ -211,23 +244,13 @@ async def run_research_process(job_id: str, company: str, company_url: str = Non
             message=f"Starting research for {company}"
         )
 
-        # Import and initialize the research graph
+        # The compiled research graph is shared by every job
         try:
-            from backend.graph import Graph
+            from backend.graph import get_graph
         except ImportError as e:
             logger.error(f"Failed to import research graph: {e}")
             raise Exception("Research system not available")
-
-        # Create research graph with WebSocket manager
-        graph = Graph(
-            company=company,
-            url=company_url,
-            hq_location=hq_location,
-            industry=industry,
-            help_description=help_description,
-            websocket_manager=websocket_manager,
-            job_id=job_id
-        )
+        graph = get_graph()
 
         # Send status update
         await websocket_manager.send_status_update(
@@ -237,13 +260,22 @@ async def run_research_process(job_id: str, company: str, company_url: str = Non
         )
 
         # Run the research workflow
-        thread = {"configurable": {"thread_id": job_id}}
         results = []
         
         try:
             logger.info(f"Starting research workflow for job {job_id}")
-            async for state in graph.run(thread):
-                current_node = state.get('current_node', 'unknown')
+            async for state in graph.run(
+                company=company,
+                url=company_url,
+                hq_location=hq_location,
+                industry=industry,
+                help_description=help_description,
+                websocket_manager=websocket_manager,
+                job_id=job_id,
+                latency_tier=latency_tier
+            ):
+                # Each step is a {node: update} mapping
+                current_node = ", ".join(state.keys()) or 'unknown'
                 logger.info(f"Research state update for job {job_id}: {current_node}")
                 results.append(state)
                 
@@ -263,8 +295,12 @@ async def run_research_process(job_id: str, company: str, company_url: str = Non
             logger.error(f"Error during research workflow for job {job_id}: {str(e)}", exc_info=True)
             raise e
 
-        # Get final result
-        final_state = results[-1] if results else {}
+        # Merge every node's update; email and proposal finish in parallel, so the last step alone is not enough
+        final_state = {}
+        for step in results:
+            for update in step.values():
+                if isinstance(update, dict):
+                    final_state.update(update)
         logger.info(f"Final state for job {job_id} contains keys: {list(final_state.keys()) if isinstance(final_state, dict) else 'Not a dict'}")
         
         # Check for report in final state
@@ -283,7 +319,7 @@ async def run_research_process(job_id: str, company: str, company_url: str = Non
             cleaned = {}
             for key, value in state.items():
                 # Skip WebSocketManager and other non-serializable objects
-                if key in ['websocket_manager', 'job_id']:
+                if key in ['websocket_manager', 'job_id', 'reference_index']:
                     continue
                 elif isinstance(value, dict):
                     cleaned[key] = clean_state(value)
@@ -299,6 +335,10 @@ async def run_research_process(job_id: str, company: str, company_url: str = Non
             return cleaned
         
         cleaned_state = clean_state(final_state)
+
+        # Outreach generated eagerly by the graph is served by the on-demand endpoints too
+        for kind in ("email", "proposal"):
+            outreach.remember(job_id, kind, help_description, cleaned_state.get(kind, ""))
         
         # Extract research results
         research_result = {
@@ -306,7 +346,8 @@ async def run_research_process(job_id: str, company: str, company_url: str = Non
             "summary": f"Research completed for {company}",
             "timestamp": datetime.now().isoformat(),
             "state": cleaned_state,
-            "total_steps": len(results)
+            "total_steps": len(results),
+            "telemetry": telemetry.get(job_id)
         }
         
         # Check if we have a report, if not generate a fallback
@@ -387,6 +428,7 @@ async def research(data: ResearchRequest):
         job_status[job_id].update({
             "status": "processing",
             "company": data.company,
+            "inputs": data.model_dump(),
             "last_update": datetime.now().isoformat()
         })
 
@@ -397,7 +439,8 @@ async def research(data: ResearchRequest):
             company_url=data.company_url,
             industry=data.industry,
             hq_location=data.hq_location,
-            help_description=data.help_description
+            help_description=data.help_description,
+            latency_tier=data.latency_tier
         ))
 
         return {
@@ -418,6 +461,70 @@ async def get_research(job_id: str):
         return job_status[job_id]
     raise HTTPException(status_code=404, detail="Research job not found")
 
+@app.get("/research/{job_id}/usage")
+async def get_research_usage(job_id: str):
+    """Get calls, tokens, wall time and estimated cost per node for a research job"""
+    if job_id in job_status:
+        return usage.get(job_id)
+    raise HTTPException(status_code=404, detail="Research job not found")
+
+@app.get("/usage")
+async def get_usage():
+    """Get calls, tokens, wall time and estimated cost across every job since startup"""
+    return usage.aggregate()
+
+@app.get("/clients/stats")
+async def get_client_stats():
+    """Requests, new connections and reused connections per shared provider client"""
+    return clients.stats()
+
+@app.get("/research/{job_id}/telemetry")
+async def get_research_telemetry(job_id: str):
+    """Get telemetry recorded while the research job ran"""
+    if job_id in job_status:
+        return telemetry.get(job_id)
+    raise HTTPException(status_code=404, detail="Research job not found")
+
+def outreach_context(job_id: str, data: OutreachRequest | None) -> dict:
+    """Build the generator context for a completed job, defaulting to its original help description"""
+    if job_id not in job_status:
+        raise HTTPException(status_code=404, detail="Research job not found")
+    job = job_status[job_id]
+    if job.get("status") != "completed":
+        raise HTTPException(status_code=409, detail="Research job has not completed")
+
+    state = job.get("result", {}).get("state", {})
+    report = state.get("report", "")
+    if not report:
+        raise HTTPException(status_code=409, detail="Research job has no report")
+
+    inputs = job.get("inputs", {})
+    help_description = data.help_description if data and data.help_description else inputs.get("help_description")
+    return {**inputs, "report": report, "digest": state.get("digest"), "help_description": help_description}
+
+@app.post("/research/{job_id}/email")
+async def generate_research_email(job_id: str, data: OutreachRequest | None = None):
+    """Stream an outreach email for a completed research job, memoized per help description"""
+    context = outreach_context(job_id, data)
+    return StreamingResponse(outreach.stream("email", job_id, context), media_type="text/markdown")
+
+@app.post("/research/{job_id}/proposal")
+async def generate_research_proposal(job_id: str, data: OutreachRequest | None = None):
+    """Stream a partnership proposal for a completed research job, memoized per help description"""
+    context = outreach_context(job_id, data)
+    return StreamingResponse(outreach.stream("proposal", job_id, context), media_type="text/markdown")
+
+@app.post("/research/{job_id}/outreach/batch")
+async def generate_research_outreach_batch(job_id: str, data: OutreachBatchRequest):
+    """Generate several outreach variants concurrently, streamed as NDJSON lines as each finishes"""
+    context = outreach_context(job_id, None)
+
+    async def results():
+        async for result in outreach.batch(data.kind, job_id, context, [variant.model_dump() for variant in data.variants]):
+            yield json.dumps(result) + "\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
 # Initialize WebSocket manager
 websocket_manager = WebSocketManager()
 
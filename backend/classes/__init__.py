@@ -1,3 +1,4 @@
+from .briefing import BriefingSection, StructuredBriefing
 from .state import InputState, ResearchState
 
-__all__ = ["InputState", "ResearchState"] 
\ No newline at end of file
+__all__ = ["BriefingSection", "InputState", "ResearchState", "StructuredBriefing"]
@@ -0,0 +1,42 @@
+import re
+from typing import List
+
+from pydantic import BaseModel, Field, field_validator
+
+# A leading list marker; bold text such as "**Series B**" is left alone
+BULLET_PREFIX = re.compile(r"^\s*[*\-•·]\s+")
+
+
+class BriefingSection(BaseModel):
+    heading: str = ""
+    bullets: List[str] = Field(default_factory=list)
+
+    @field_validator("heading")
+    @classmethod
+    def strip_heading(cls, value: str) -> str:
+        return value.strip().lstrip("#").strip()
+
+    @field_validator("bullets")
+    @classmethod
+    def strip_bullets(cls, value: List[str]) -> List[str]:
+        bullets = (BULLET_PREFIX.sub("", bullet, count=1).strip() for bullet in value)
+        return [bullet for bullet in bullets if bullet]
+
+
+class StructuredBriefing(BaseModel):
+    """A category briefing as headed bullet lists, so reports can be assembled locally."""
+    summary: str = ""
+    sections: List[BriefingSection] = Field(default_factory=list)
+
+    @field_validator("summary")
+    @classmethod
+    def strip_summary(cls, value: str) -> str:
+        return value.strip()
+
+    @field_validator("sections")
+    @classmethod
+    def drop_empty_sections(cls, value: List[BriefingSection]) -> List[BriefingSection]:
+        return [section for section in value if section.bullets]
+
+    def is_empty(self) -> bool:
+        return not self.summary and not self.sections
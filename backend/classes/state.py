@@ -1,5 +1,5 @@
 from typing import TypedDict, NotRequired, Required, Dict, List, Any
-from backend.services.websocket_manager import WebSocketManager
+from backend.utils.references import ReferenceIndex
 
 #Define the input state
 class InputState(TypedDict, total=False):
@@ -8,8 +8,7 @@ class InputState(TypedDict, total=False):
     hq_location: NotRequired[str]
     industry: NotRequired[str]
     help_description: NotRequired[str]
-    websocket_manager: NotRequired[WebSocketManager]
-    job_id: NotRequired[str]
+    reference_index: NotRequired[ReferenceIndex]
 
 class ResearchState(InputState):
     site_scrape: Dict[str, Any]
@@ -27,5 +26,11 @@ class ResearchState(InputState):
     industry_briefing: str
     company_briefing: str
     references: List[str]
+    reference_info: Dict[str, Dict[str, Any]]
+    reference_titles: Dict[str, str]
     briefings: Dict[str, Any]
-    report: str
\ No newline at end of file
+    structured_briefings: Dict[str, Dict[str, Any]]
+    report: str
+    digest: str
+    email: str
+    proposal: str
@@ -1,12 +1,16 @@
 import logging
-from typing import Any, AsyncIterator, Dict
+import os
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict
 
 from langchain_core.messages import SystemMessage
-from langgraph.graph import StateGraph
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph import END, StateGraph
 
-from .classes.state import InputState
+from .classes.state import InputState, ResearchState
 from .nodes import GroundingNode
 from .nodes.briefing import Briefing
+from .nodes.cleaner import ContentCleaner
 from .nodes.collector import Collector
 from .nodes.curator import Curator
 from .nodes.editor import Editor
@@ -19,32 +23,54 @@ from .nodes.researchers import (
     IndustryAnalyzer,
     NewsScanner,
 )
+from .services.router import latency_tier
+from .services.telemetry import telemetry
+from .services.usage import usage_scope
 
 logger = logging.getLogger(__name__)
 
+# Per-run values passed through RunnableConfig rather than the graph state
+RUN_CONTEXT_KEYS = ("websocket_manager", "job_id", "latency_tier")
+
+
+def with_run_context(name: str, run: Callable[[ResearchState], Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Adapt a node's ``run`` so it sees the job's websocket manager and id in its state.
+
+    Nodes are shared by every job, so these come from the run's config and are
+    stripped from the node's update again. External calls the node makes are
+    charged to the job and node in the usage accounts and routed for the job's
+    latency tier, and the node's wall time is recorded as ``node_timing``.
+    """
+    async def node(state: ResearchState, config: RunnableConfig) -> Any:
+        configurable = config.get("configurable", {})
+        job_id = configurable.get("job_id")
+        start = time.perf_counter()
+        try:
+            with usage_scope(job_id, name), latency_tier(configurable.get("latency_tier")):
+                result = await run({**state, **{key: configurable.get(key) for key in RUN_CONTEXT_KEYS}})
+        finally:
+            telemetry.record(job_id, "node_timing", {"node": name, "seconds": round(time.perf_counter() - start, 4)})
+        if isinstance(result, dict):
+            return {key: value for key, value in result.items() if key not in RUN_CONTEXT_KEYS}
+        return result
+    return node
+
+
 class Graph:
-    def __init__(self, company=None, url=None, hq_location=None, industry=None,
-                 help_description=None, websocket_manager=None, job_id=None):
-        self.websocket_manager = websocket_manager
-        self.job_id = job_id
-        
-        # Initialize InputState
-        self.input_state = InputState(
-            company=company,
-            company_url=url,
-            hq_location=hq_location,
-            industry=industry,
-            help_description=help_description,
-            websocket_manager=websocket_manager,
-            job_id=job_id,
-            messages=[
-                SystemMessage(content="Expert researcher starting investigation")
-            ]
-        )
+    """The research workflow, built and compiled once and shared by every job.
+
+    Nodes hold no per-job state; each run gets its inputs as the initial state and
+    its websocket manager and job id through the run config.
+    """
+
+    def __init__(self):
+        # "lazy" finishes at the editor and leaves email and proposal to the on-demand endpoints,
+        # "eager" generates both at the end of every job
+        self.outreach_mode = os.getenv("OUTREACH_MODE", "lazy")
 
-        # Initialize nodes with WebSocket manager and job ID
         self._init_nodes()
         self._build_workflow()
+        self.compiled = self.workflow.compile()
 
     def _init_nodes(self):
         """Initialize all workflow nodes"""
@@ -56,32 +82,33 @@ class Graph:
         self.collector = Collector()
         self.curator = Curator()
         self.enricher = Enricher()
+        self.cleaner = ContentCleaner()
         self.briefing = Briefing()
         self.editor = Editor()
-        self.email_generator = EmailGenerator()
-        self.proposal_generator = ProposalGenerator()
+        if self.outreach_mode == "eager":
+            self.email_generator = EmailGenerator()
+            self.proposal_generator = ProposalGenerator()
 
     def _build_workflow(self):
         """Configure the state graph workflow"""
-        self.workflow = StateGraph(InputState)
+        # Nodes share the full research state; only the input fields are required to start
+        self.workflow = StateGraph(ResearchState, input=InputState)
         
         # Add nodes with their respective processing functions
-        self.workflow.add_node("grounding", self.ground.run)
-        self.workflow.add_node("financial_analyst", self.financial_analyst.run)
-        self.workflow.add_node("news_scanner", self.news_scanner.run)
-        self.workflow.add_node("industry_analyst", self.industry_analyst.run)
-        self.workflow.add_node("company_analyst", self.company_analyst.run)
-        self.workflow.add_node("collector", self.collector.run)
-        self.workflow.add_node("curator", self.curator.run)
-        self.workflow.add_node("enricher", self.enricher.run)
-        self.workflow.add_node("briefing", self.briefing.run)
-        self.workflow.add_node("editor", self.editor.run)
-        self.workflow.add_node("email_generator", self.email_generator.run)
-        self.workflow.add_node("proposal_generator", self.proposal_generator.run)
+        self.workflow.add_node("grounding", with_run_context("grounding", self.ground.run))
+        self.workflow.add_node("financial_analyst", with_run_context("financial_analyst", self.financial_analyst.run))
+        self.workflow.add_node("news_scanner", with_run_context("news_scanner", self.news_scanner.run))
+        self.workflow.add_node("industry_analyst", with_run_context("industry_analyst", self.industry_analyst.run))
+        self.workflow.add_node("company_analyst", with_run_context("company_analyst", self.company_analyst.run))
+        self.workflow.add_node("collector", with_run_context("collector", self.collector.run))
+        self.workflow.add_node("curator", with_run_context("curator", self.curator.run))
+        self.workflow.add_node("enricher", with_run_context("enricher", self.enricher.run))
+        self.workflow.add_node("cleaner", with_run_context("cleaner", self.cleaner.run))
+        self.workflow.add_node("briefing", with_run_context("briefing", self.briefing.run))
+        self.workflow.add_node("editor", with_run_context("editor", self.editor.run))
 
         # Configure workflow edges
         self.workflow.set_entry_point("grounding")
-        self.workflow.set_finish_point("proposal_generator")
         
         research_nodes = [
             "financial_analyst", 
@@ -98,24 +125,50 @@ class Graph:
         # Connect remaining nodes
         self.workflow.add_edge("collector", "curator")
         self.workflow.add_edge("curator", "enricher")
-        self.workflow.add_edge("enricher", "briefing")
+        self.workflow.add_edge("enricher", "cleaner")
+        self.workflow.add_edge("cleaner", "briefing")
         self.workflow.add_edge("briefing", "editor")
+
+        if self.outreach_mode != "eager":
+            self.workflow.add_edge("editor", END)
+            return
+
+        # Email and proposal only read the report, so they run side by side and join at the end
+        self.workflow.add_node("email_generator", with_run_context("email_generator", self.email_generator.run))
+        self.workflow.add_node("proposal_generator", with_run_context("proposal_generator", self.proposal_generator.run))
         self.workflow.add_edge("editor", "email_generator")
-        self.workflow.add_edge("email_generator", "proposal_generator")
+        self.workflow.add_edge("editor", "proposal_generator")
+        self.workflow.add_edge("email_generator", END)
+        self.workflow.add_edge("proposal_generator", END)
 
-    async def run(self, thread: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
-        """Execute the research workflow"""
-        compiled_graph = self.workflow.compile()
-        
-        async for state in compiled_graph.astream(
-            self.input_state,
-            thread
-        ):
-            if self.websocket_manager and self.job_id:
-                await self._handle_ws_update(state)
+    async def run(self, company, url=None, hq_location=None, industry=None, help_description=None,
+                  websocket_manager=None, job_id=None, latency_tier=None) -> AsyncIterator[Dict[str, Any]]:
+        """Execute the research workflow for one job"""
+        input_state = InputState(
+            company=company,
+            company_url=url,
+            hq_location=hq_location,
+            industry=industry,
+            help_description=help_description,
+            messages=[
+                SystemMessage(content="Expert researcher starting investigation")
+            ]
+        )
+        config: RunnableConfig = {
+            "configurable": {
+                "thread_id": job_id,
+                "websocket_manager": websocket_manager,
+                "job_id": job_id,
+                "latency_tier": latency_tier
+            }
+        }
+
+        async for state in self.compiled.astream(input_state, config):
+            if websocket_manager and job_id:
+                await self._handle_ws_update(websocket_manager, job_id, state)
             yield state
 
-    async def _handle_ws_update(self, state: Dict[str, Any]):
+    async def _handle_ws_update(self, websocket_manager, job_id: str, state: Dict[str, Any]):
         """Handle WebSocket updates based on state changes"""
         update = {
             "type": "state_update",
@@ -125,11 +178,19 @@ class Graph:
                 "keys": list(state.keys())
             }
         }
-        await self.websocket_manager.broadcast_to_job(
-            self.job_id,
+        await websocket_manager.broadcast_to_job(
+            job_id,
             update
         )
-    
-    def compile(self):
-        graph = self.workflow.compile()
-        return graph
\ No newline at end of file
+
+
+_graph: Graph | None = None
+
+
+def get_graph() -> Graph:
+    """Return the process-wide research graph, building and compiling it on first use."""
+    global _graph
+    if _graph is None:
+        _graph = Graph()
+        logger.info("Compiled research graph")
+    return _graph
@@ -1,26 +1,65 @@
 import asyncio
 import logging
 import os
-from typing import Any, Dict, List, Union
+from typing import Any, AsyncIterator, Dict, List, Tuple, Union
 
 import google.generativeai as genai
 
 from ..classes import ResearchState
+from ..utils.report import parse_briefing, render_briefing
+from ..services.cache import cache, content_hash, fingerprint
+from ..services.clients import clients
+from ..services.governor import governor
+from ..services.hedging import hedger
+from ..services.router import ROUTES, router
+from ..services.telemetry import telemetry
+from ..services.usage import usage as usage_tracker
+from ..utils.references import normalize_url
+from ..utils.compression import CATEGORY_FOCUS_TERMS, compress_document
+from ..utils.streaming import ChunkCoalescer, status_streamer
+from ..utils.tokens import pack_documents, token_estimator
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever prompts or briefing assembly change so cached briefings are regenerated
+BRIEFING_PROMPT_VERSION = "1"
+
+# Appended to the final briefing prompt in structured mode
+STRUCTURED_OUTPUT_INSTRUCTIONS = """Return the briefing as JSON matching this schema instead of markdown:
+{"summary": "optional one-sentence opening statement", "sections": [{"heading": "section header, without #", "bullets": ["one complete fact per bullet"]}]}
+Use the headers requested above as section headings, in the same order. Use a single section with an empty heading when no headers are requested."""
+
 class Briefing:
     """Creates briefings for each research category and updates the ResearchState."""
     
     def __init__(self) -> None:
         self.max_doc_length = 8000  # Maximum document content length
+        # Token budget for a whole briefing prompt, instructions included
+        self.max_prompt_tokens = int(os.getenv("BRIEFING_MAX_PROMPT_TOKENS", 30000))
+        # Model family used for token estimates and cache keys; each call's model is picked by the router
+        self.model_name = 'gemini-2.0-flash'
+        # Upper bound on a single Gemini call; the request is cancelled when it expires
+        self.request_timeout = float(os.getenv("BRIEFING_TIMEOUT_SECONDS", 120))
+        # "single" packs one prompt, "map_reduce" always summarizes chunks first,
+        # "auto" switches to map-reduce when documents would not fit one prompt
+        self.mode = os.getenv("BRIEFING_MODE", "auto")
+        self.map_chunk_tokens = int(os.getenv("BRIEFING_MAP_CHUNK_TOKENS", 12000))
+        self.map_max_facts = 40
+        # Briefing text is streamed to clients as briefing_chunk events, coalesced over this window
+        self.stream_window = float(os.getenv("BRIEFING_CHUNK_WINDOW_MS", 250)) / 1000
+        # Briefings for an unchanged document set are served from disk instead of Gemini
+        self.cache_ttl = float(os.getenv("BRIEFING_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+        # "structured" asks Gemini for JSON headed bullet lists so the Editor can assemble the report locally
+        self.output_format = os.getenv("BRIEFING_FORMAT", "markdown")
         self.gemini_key = os.getenv("GEMINI_API_KEY")
         if not self.gemini_key:
             raise ValueError("GEMINI_API_KEY environment variable is not set")
         
         # Configure Gemini
         genai.configure(api_key=self.gemini_key)
-        self.gemini_model = genai.GenerativeModel('gemini-2.0-flash')
+
+    def _gemini_model(self, name: str) -> Any:
+        return clients.gemini(name)
 
     async def generate_category_briefing(
         self, docs: Union[Dict[str, Any], List[Dict[str, Any]]], 
@@ -156,55 +195,317 @@ Key requirements:
             reverse=True
         )
         
-        doc_texts = []
-        total_length = 0
-        for _ , doc in sorted_items:
-            title = doc.get('title', '')
-            content = doc.get('raw_content') or doc.get('content', '')
-            if len(content) > self.max_doc_length:
-                content = content[:self.max_doc_length] + "... [content truncated]"
-            doc_entry = f"Title: {title}\n\nContent: {content}"
-            if total_length + len(doc_entry) < 120000:  # Keep under limit
-                doc_texts.append(doc_entry)
-                total_length += len(doc_entry)
-            else:
-                break
-        
+        cache_key = self._cache_key(sorted_items, category, context)
+        if cached := await cache.aget("briefings", cache_key, self.cache_ttl):
+            logger.info(f"Using cached {category} briefing for {company}")
+            telemetry.record(context.get('job_id'), "briefing_cache", {"category": category, "hit": True})
+            if coalescer := self._chunk_coalescer(category, context):
+                await coalescer.add(cached)
+                await coalescer.flush()
+            await self._send_complete(category, context)
+            return self._result(cached)
+        telemetry.record(context.get('job_id'), "briefing_cache", {"category": category, "hit": False})
+
+        # Long documents keep the sentences most relevant to what the prompt asks for
+        focus = f"{prompts.get(category, '')} {' '.join(CATEGORY_FOCUS_TERMS.get(category, []))}"
+
         separator = "\n" + "-" * 40 + "\n"
-        prompt = f"""{prompts.get(category, 'Create a focused, informative and insightful research briefing on the company: {company} in the {industry} industry based on the provided documents.')}
+        category_prompt = prompts.get(category, f'Create a focused, informative and insightful research briefing on the company: {company} in the {industry} industry based on the provided documents.')
+        instructions = f"""{category_prompt}
 
 Analyze the following documents and extract key information. Provide only the briefing, no explanations or commentary:
+"""
+        # Compression and tokenizing are CPU-bound; a worker thread keeps the event loop responsive meanwhile
+        doc_entries, doc_texts, packing = await asyncio.to_thread(
+            self._prepare_documents, sorted_items, focus, instructions, separator
+        )
+        logger.info(
+            f"Packed {packing['docs_packed']}/{packing['docs_available']} {category} documents "
+            f"into {packing['packed_tokens']}/{packing['budget_tokens']} estimated tokens"
+        )
 
+        # Summarize in parallel chunks rather than drop documents that don't fit one prompt
+        use_map_reduce = self.mode == "map_reduce" or (self.mode == "auto" and packing['docs_dropped'] > 0)
+        usage = {"prompt_tokens": 0, "calls": 0, "fallback_calls": 0, "failed_map_chunks": 0}
+        coalescer = self._chunk_coalescer(category, context)
+        
+        try:
+            if use_map_reduce:
+                content = await self._map_reduce_briefing(doc_entries, category, category_prompt, context, usage, coalescer)
+            else:
+                prompt = f"""{instructions}
 {separator}{separator.join(doc_texts)}{separator}
 
 """
-        
-        try:
-            logger.info("Sending prompt to LLM")
-            response = self.gemini_model.generate_content(prompt)
-            content = response.text.strip()
-            if not content:
+                content = await self._generate(prompt, usage, coalescer, final=True)
+
+            telemetry.record(context.get('job_id'), "briefing_packing", {
+                "category": category,
+                "mode": "map_reduce" if use_map_reduce else "single",
+                **packing,
+                **usage
+            })
+
+            result = self._result(content)
+            if not result['content']:
                 logger.error(f"Empty response from LLM for {category} briefing")
                 return {'content': ''}
 
+            # The key assumes each call ran on the routed model over every document; hedged,
+            # failed-over or partial (a map chunk failed) output isn't cached
+            if not usage["fallback_calls"] and not usage["failed_map_chunks"]:
+                await cache.aset("briefings", cache_key, content)
+
             # Send completion status
-            if websocket_manager := context.get('websocket_manager'):
-                if job_id := context.get('job_id'):
-                    await websocket_manager.send_status_update(
-                        job_id=job_id,
-                        status="briefing_complete",
-                        message=f"Completed {category} briefing",
-                        result={
-                            "step": "Briefing",
-                            "category": category
-                        }
-                    )
+            await self._send_complete(category, context)
 
-            return {'content': content}
+            return result
+        except asyncio.TimeoutError:
+            logger.error(f"Timed out after {self.request_timeout}s generating {category} briefing")
+            return {'content': ''}
         except Exception as e:
             logger.error(f"Error generating {category} briefing: {e}")
             return {'content': ''}
 
+    @property
+    def structured(self) -> bool:
+        return self.output_format == "structured"
+
+    def _result(self, content: str) -> Dict[str, Any]:
+        """Build the briefing result, validating and re-rendering structured output."""
+        if not self.structured:
+            return {'content': content}
+        briefing = parse_briefing(content)
+        if briefing.is_empty():
+            return {'content': ''}
+        return {'content': render_briefing(briefing), 'structured': briefing.model_dump()}
+
+    async def _send_complete(self, category: str, context: Dict[str, Any]) -> None:
+        if websocket_manager := context.get('websocket_manager'):
+            if job_id := context.get('job_id'):
+                await websocket_manager.send_status_update(
+                    job_id=job_id,
+                    status="briefing_complete",
+                    message=f"Completed {category} briefing",
+                    result={
+                        "step": "Briefing",
+                        "category": category
+                    }
+                )
+
+    def _cache_key(self, sorted_items: List[tuple], category: str, context: Dict[str, Any]) -> str:
+        """Fingerprint the inputs that determine a briefing: prompt, target company, document set and models.
+
+        For a given document set the router picks models by the job's latency
+        tier, so the tier and the route's models stand in for the model used.
+        """
+        doc_hashes = []
+        for url, doc in sorted_items:
+            content = doc.get('raw_content') or doc.get('content', '')
+            if isinstance(content, dict):
+                content = content.get('raw_content', '')
+            doc_hashes.append((normalize_url(url), content_hash(f"{doc.get('title', '')}\n{content}")))
+        return fingerprint(
+            category,
+            BRIEFING_PROMPT_VERSION,
+            router.tier(),
+            ROUTES["briefing"].candidates(),
+            context.get('company', 'Unknown'),
+            context.get('industry', 'Unknown'),
+            context.get('hq_location', 'Unknown'),
+            sorted(doc_hashes),
+            self.output_format
+        )
+
+    def _chunk_coalescer(self, category: str, context: Dict[str, Any]) -> ChunkCoalescer | None:
+        """Build a coalescer that forwards briefing text to the job's clients, if anyone is listening."""
+        # Partial JSON is of no use to clients
+        if self.structured:
+            return None
+        return status_streamer(
+            context.get('websocket_manager'),
+            context.get('job_id'),
+            status="briefing_chunk",
+            message=f"Generating {category} briefing",
+            result={"step": "Briefing", "category": category},
+            window=self.stream_window
+        )
+
+    async def _generate(
+        self, prompt: str, usage: Dict[str, int], coalescer: ChunkCoalescer | None = None, final: bool = False
+    ) -> str:
+        """Run one Gemini call under the provider cap and return the stripped response text.
+
+        With a coalescer the response is streamed and forwarded as it arrives. The
+        ``final`` call writes the briefing itself and asks for JSON in structured mode.
+        Slow calls may be hedged onto the route's backup model.
+        """
+        request = {"request_options": {"timeout": self.request_timeout}}
+        if final and self.structured:
+            prompt = f"{prompt}\n{STRUCTURED_OUTPUT_INSTRUCTIONS}"
+            request["generation_config"] = {"response_mime_type": "application/json"}
+
+        prompt_tokens: List[int] = []
+        # Models whose response was used; a hedge or failover shows up as a model other than the routed one
+        served_by: List[str] = []
+
+        async def attempt(name: str) -> AsyncIterator[str]:
+            model = self._gemini_model(name)
+            async with governor.limit("gemini"), usage_tracker.track("gemini", name) as call:
+                logger.info("Sending prompt to LLM")
+                # Use the async API so the event loop keeps serving other jobs while Gemini works
+                if coalescer is None:
+                    response = await model.generate_content_async(prompt, **request)
+                    yield response.text
+                else:
+                    response = await model.generate_content_async(prompt, stream=True, **request)
+                    async for chunk in response:
+                        try:
+                            chunk_text = chunk.text
+                        except ValueError:
+                            # Chunks without text parts (e.g. only a finish reason)
+                            continue
+                        if chunk_text:
+                            yield chunk_text
+                metadata = getattr(response, 'usage_metadata', None)
+                call.add_gemini(metadata)
+                prompt_tokens.append(getattr(metadata, 'prompt_token_count', 0) or 0)
+            served_by.append(name)
+
+        # A full prompt takes milliseconds to tokenize; the count is cached, so the calibration below reuses it
+        input_tokens = await asyncio.to_thread(token_estimator.count, prompt, self.model_name)
+        routed_model = router.choose("briefing", input_tokens)
+
+        async def collect() -> str:
+            parts = []
+            async for chunk_text in hedger.stream("briefing", routed_model, attempt):
+                parts.append(chunk_text)
+                if coalescer:
+                    await coalescer.add(chunk_text)
+            return "".join(parts)
+
+        text = await asyncio.wait_for(collect(), timeout=self.request_timeout)
+        if coalescer:
+            await coalescer.flush()
+
+        # Calibrate the estimator against the provider's count
+        if prompt_tokens and prompt_tokens[-1]:
+            await asyncio.to_thread(token_estimator.observe, prompt, prompt_tokens[-1], self.model_name)
+        usage["prompt_tokens"] += sum(prompt_tokens)
+        usage["calls"] += 1
+        usage["fallback_calls"] += int(served_by != [routed_model])
+        return text.strip()
+
+    def _partition(self, doc_entries: List[tuple], instructions: str, separator: str) -> List[List[str]]:
+        """Split entries, in score order, into consecutive chunks that each fit a map prompt with ``instructions``."""
+        budget = self.map_chunk_tokens - token_estimator.count(instructions, self.model_name)
+        separator_tokens = token_estimator.count(separator, self.model_name)
+        chunks = []
+        current = []
+        used = 0
+        for _, text in doc_entries:
+            tokens = token_estimator.count(text, self.model_name) + separator_tokens
+            if current and used + tokens > budget:
+                chunks.append(current)
+                current = []
+                used = 0
+            current.append(text)
+            used += tokens
+        if current:
+            chunks.append(current)
+        return chunks
+
+    async def _map_reduce_briefing(
+        self, doc_entries: List[tuple], category: str, category_prompt: str,
+        context: Dict[str, Any], usage: Dict[str, int], coalescer: ChunkCoalescer | None = None
+    ) -> str:
+        """Extract bullet facts from document chunks in parallel, then write the briefing from the facts."""
+        company = context.get('company', 'Unknown')
+        separator = "\n" + "-" * 40 + "\n"
+
+        map_instructions = f"""You are extracting facts about {company} for a {category} briefing with these requirements:
+
+{category_prompt}
+
+From the documents below, list every relevant, verifiable fact as a single-line bullet starting with "* ".
+Keep names, dates and numbers exactly as written. At most {self.map_max_facts} bullets. No headers, no commentary.
+"""
+        chunks = await asyncio.to_thread(self._partition, doc_entries, map_instructions, separator)
+        logger.info(f"Map-reduce {category} briefing over {len(doc_entries)} documents in {len(chunks)} chunks")
+        usage["map_chunks"] = len(chunks)
+
+        if websocket_manager := context.get('websocket_manager'):
+            if job_id := context.get('job_id'):
+                await websocket_manager.send_status_update(
+                    job_id=job_id,
+                    status="briefing_map",
+                    message=f"Summarizing {len(doc_entries)} {category} documents in {len(chunks)} parallel chunks",
+                    result={
+                        "step": "Briefing",
+                        "category": category,
+                        "chunks": len(chunks)
+                    }
+                )
+
+        results = await asyncio.gather(*[
+            self._generate(f"{map_instructions}\n{separator}{separator.join(chunk)}{separator}", usage)
+            for chunk in chunks
+        ], return_exceptions=True)
+
+        facts = []
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.warning(f"Map step failed for {category} briefing: {result}")
+                usage["failed_map_chunks"] += 1
+            elif result:
+                facts.append(result)
+        if not facts:
+            return ""
+
+        reduce_instructions = f"""{category_prompt}
+
+The following facts were extracted from {len(doc_entries)} documents. Write the briefing from them, merging duplicates. Provide only the briefing, no explanations or commentary:
+"""
+        fact_texts, fact_packing = await asyncio.to_thread(
+            self._pack, [(1.0, fact) for fact in facts], reduce_instructions, separator, self.max_prompt_tokens
+        )
+        if fact_packing['docs_dropped']:
+            logger.warning(f"Dropped {fact_packing['docs_dropped']} fact chunks that exceed the {category} reduce budget")
+
+        # Only the reduce step produces briefing text worth streaming
+        return await self._generate(f"{reduce_instructions}\n{separator}{separator.join(fact_texts)}{separator}\n", usage, coalescer, final=True)
+
+    def _prepare_documents(
+        self, sorted_items: List[tuple], focus: str, instructions: str, separator: str
+    ) -> Tuple[List[tuple], List[str], Dict[str, Any]]:
+        """Build (score, entry text) pairs, compressing documents over the per-doc length, and pack them into one prompt.
+
+        Returns every entry, the texts that fit alongside ``instructions`` and the packing statistics.
+        """
+        doc_entries = []
+        for _ , doc in sorted_items:
+            title = doc.get('title', '')
+            content = doc.get('raw_content') or doc.get('content', '')
+            if isinstance(content, dict):
+                # Site scrape documents nest the scrape under raw_content
+                content = content.get('raw_content', '')
+            if len(content) > self.max_doc_length:
+                content = compress_document(content, focus, self.max_doc_length)
+            score = float(doc.get('evaluation', {}).get('overall_score', '0'))
+            doc_entries.append((score, f"Title: {title}\n\nContent: {content}"))
+
+        if self.structured:
+            instructions = f"{instructions}\n{STRUCTURED_OUTPUT_INSTRUCTIONS}"
+        doc_texts, packing = self._pack(doc_entries, instructions, separator, self.max_prompt_tokens)
+        return doc_entries, doc_texts, packing
+
+    def _pack(
+        self, entries: List[tuple], instructions: str, separator: str, budget: int
+    ) -> Tuple[List[str], Dict[str, Any]]:
+        """Fill whatever ``instructions`` leave of the token budget, best score per token first."""
+        budget -= token_estimator.count(instructions, self.model_name)
+        return pack_documents(entries, budget, separator, self.model_name)
+
     async def create_briefings(self, state: ResearchState) -> ResearchState:
         """Create briefings for all categories in parallel."""
         company = state.get('company', 'Unknown Company')
@@ -238,6 +539,7 @@ Analyze the following documents and extract key information. Provide only the br
         }
         
         briefings = {}
+        structured_briefings = {}
 
         # Create tasks for parallel processing
         briefing_tasks = []
@@ -276,6 +578,8 @@ Analyze the following documents and extract key information. Provide only the br
                     if result['content']:
                         briefings[task['category']] = result['content']
                         state[task['briefing_key']] = result['content']
+                        if structured := result.get('structured'):
+                            structured_briefings[task['category']] = structured
                         logger.info(f"Completed {task['data_field']} briefing ({len(result['content'])} characters)")
                     else:
                         logger.error(f"Failed to generate briefing for {task['data_field']}")
@@ -299,6 +603,8 @@ Analyze the following documents and extract key information. Provide only the br
             logger.info(f"Generated {successful_briefings}/{len(briefing_tasks)} briefings with total length {total_length}")
 
         state['briefings'] = briefings
+        if structured_briefings:
+            state['structured_briefings'] = structured_briefings
         return state
 
     async def run(self, state: ResearchState) -> ResearchState:
@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from langchain_core.messages import AIMessage
+
+from ..classes import ResearchState
+from ..utils.content_cleaner import clean_document, remove_repeated_lines, site_of
+
+logger = logging.getLogger(__name__)
+
+# Shared by all jobs in the process; created on first use
+_process_pool: ProcessPoolExecutor | None = None
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        max_workers = int(os.getenv("CONTENT_CLEANER_WORKERS", min(4, os.cpu_count() or 1)))
+        # Forking a process that runs threads (uvicorn, asyncio.to_thread workers) can copy held locks
+        _process_pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+    return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    """Stop the worker processes; the next heavy document starts a new pool."""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(cancel_futures=True)
+        _process_pool = None
+        logger.info("Content cleaner process pool shut down")
+
+
+class ContentCleaner:
+    """Strips boilerplate, navigation and cross-document repeated lines from enriched raw content."""
+
+    def __init__(self) -> None:
+        # Documents at least this many characters long are cleaned in the process pool
+        self.pool_threshold = int(os.getenv("CONTENT_CLEANER_POOL_THRESHOLD", 20000))
+        # Short lines found in this many pages of one site are treated as site-wide boilerplate
+        self.repeated_line_min_docs = 3
+
+    def _collect_containers(self, state: ResearchState) -> Tuple[Dict[int, Dict[str, Any]], Dict[int, str]]:
+        """Find every dict holding a raw_content string, once per object, and the site each came from."""
+        containers = {}
+        sites = {}
+        candidates: List[Tuple[str, Any]] = [(state.get('company_url', ''), state.get('site_scrape'))]
+        for data_field in ['financial_data', 'news_data', 'industry_data', 'company_data']:
+            for url, doc in state.get(f'curated_{data_field}', {}).items():
+                # Site scrape documents nest the scrape dict under raw_content
+                raw_content = doc.get('raw_content')
+                candidates.append((doc.get('url') or url, raw_content if isinstance(raw_content, dict) else doc))
+
+        for url, container in candidates:
+            if isinstance(container, dict) and isinstance(container.get('raw_content'), str) and container['raw_content']:
+                containers[id(container)] = container
+                if site := site_of(url or ''):
+                    sites[id(container)] = site
+        return containers, sites
+
+    @staticmethod
+    def _clean_inline(texts: Dict[int, str]) -> Dict[int, str]:
+        return {key: clean_document(text) for key, text in texts.items()}
+
+    async def _clean_heavy(self, texts: Dict[int, str]) -> Dict[int, str]:
+        if not texts:
+            return {}
+        loop = asyncio.get_running_loop()
+        try:
+            pool = _get_process_pool()
+            results = await asyncio.gather(*[
+                loop.run_in_executor(pool, clean_document, text)
+                for text in texts.values()
+            ])
+            return dict(zip(texts.keys(), results))
+        except Exception as e:
+            logger.warning(f"Process pool unavailable, cleaning {len(texts)} heavy documents in a thread: {e}")
+            return await asyncio.to_thread(self._clean_inline, texts)
+
+    async def clean_texts(self, texts: Dict[int, str], sites: Dict[int, str]) -> Dict[int, str]:
+        """Clean documents off the event loop: light ones in a thread, heavy ones in the process pool."""
+        heavy = {key: text for key, text in texts.items() if len(text) >= self.pool_threshold}
+        light = {key: text for key, text in texts.items() if key not in heavy}
+        cleaned, cleaned_heavy = await asyncio.gather(
+            asyncio.to_thread(self._clean_inline, light),
+            self._clean_heavy(heavy)
+        )
+        cleaned.update(cleaned_heavy)
+        return await asyncio.to_thread(remove_repeated_lines, cleaned, sites, self.repeated_line_min_docs)
+
+    async def clean_content(self, state: ResearchState) -> ResearchState:
+        """Clean the raw content of all curated documents in place."""
+        company = state.get('company', 'Unknown Company')
+        websocket_manager = state.get('websocket_manager')
+        job_id = state.get('job_id')
+
+        containers, sites = self._collect_containers(state)
+        if not containers:
+            logger.info("No raw content to clean")
+            return state
+
+        if websocket_manager and job_id:
+            await websocket_manager.send_status_update(
+                job_id=job_id,
+                status="processing",
+                message=f"Cleaning extracted content for {company}",
+                result={
+                    "step": "Cleaning",
+                    "total_documents": len(containers)
+                }
+            )
+
+        texts = {key: container['raw_content'] for key, container in containers.items()}
+        chars_before = sum(len(text) for text in texts.values())
+        cleaned = await self.clean_texts(texts, sites)
+        for key, container in containers.items():
+            container['raw_content'] = cleaned[key]
+        chars_after = sum(len(text) for text in cleaned.values())
+
+        removed_pct = 100 * (chars_before - chars_after) / chars_before if chars_before else 0
+        logger.info(f"Cleaned {len(containers)} documents: {chars_before} -> {chars_after} characters ({removed_pct:.0f}% removed)")
+
+        messages = state.get('messages', [])
+        messages.append(AIMessage(content=f"🧹 Cleaned {len(containers)} documents for {company}, removed {removed_pct:.0f}% boilerplate"))
+        state['messages'] = messages
+
+        if websocket_manager and job_id:
+            await websocket_manager.send_status_update(
+                job_id=job_id,
+                status="cleaning_complete",
+                message=f"Removed {removed_pct:.0f}% boilerplate from {len(containers)} documents",
+                result={
+                    "step": "Cleaning",
+                    "total_documents": len(containers),
+                    "chars_before": chars_before,
+                    "chars_after": chars_after
+                }
+            )
+
+        return state
+
+    async def run(self, state: ResearchState) -> ResearchState:
+        try:
+            return await self.clean_content(state)
+        except Exception as e:
+            # Cleaning is an optimization; briefing can still use the uncleaned content
+            logger.error(f"Error cleaning content: {e}")
+            return state
@@ -199,8 +199,16 @@ class Curator:
             # Store curated documents in state
             state[f'curated_{data_field}'] = relevant_docs
             
-        # Process references using the references module
-        top_reference_urls, reference_titles, reference_info = process_references_from_search_results(state)
+        # Read the top references from the index built while searching, restricted to curated documents
+        if reference_index := state.get('reference_index'):
+            curated_urls = [
+                url
+                for data_field in data_types
+                for url in state.get(f'curated_{data_field}', {})
+            ]
+            top_reference_urls, reference_titles, reference_info = reference_index.select_references(curated_urls)
+        else:
+            top_reference_urls, reference_titles, reference_info = process_references_from_search_results(state)
         logger.info(f"Selected top {len(top_reference_urls)} references for the report")
         
         # Update state with references and their titles
@@ -1,16 +1,26 @@
+import asyncio
 import logging
 import os
 from typing import Any, Dict
 
 from langchain_core.messages import AIMessage
-from openai import AsyncOpenAI
 
-from ..classes import ResearchState
+from ..classes import ResearchState, StructuredBriefing
+from ..services.clients import clients
+from ..services.llm_cache import llm_cache
+from ..services.router import router
+from ..services.telemetry import telemetry
+from ..utils.digest import build_fact_sheet
+from ..utils.markdown import DEFAULT_CHECKS, normalize_report, validate_report
 from ..utils.references import format_references_section
+from ..utils.report import FLAT_SECTIONS, REPORT_SECTIONS, render_report
+from ..utils.streaming import ChunkCoalescer, collect_stream, status_streamer
+from ..utils.tokens import token_estimator
 
 logger = logging.getLogger(__name__)
 
-
+# Bump when the compile, section or sweep prompts change, so cached LLM responses are not reused
+EDITOR_PROMPT_VERSION = "1"
 
 
 class Editor:
@@ -21,26 +31,38 @@ class Editor:
         if not self.openai_key:
             raise ValueError("OPENAI_API_KEY environment variable is not set")
         
-        # Configure OpenAI
-        self.openai_client = AsyncOpenAI(api_key=self.openai_key)
-        
-        # Initialize context dictionary for use across methods
-        self.context = {
-            "company": "Unknown Company",
-            "industry": "Unknown",
-            "hq_location": "Unknown"
+        # Shared, pooled OpenAI client
+        self.openai_client = clients.openai()
+
+        # Reports assembled locally from structured briefings only get the LLM sweep for
+        # cross-section deduplication, which can be turned off
+        self.llm_dedup = os.getenv("EDITOR_LLM_DEDUP", "true").lower() not in ("0", "false", "no")
+        # Formatting is enforced locally; "auto" only runs the LLM sweep when a check fails,
+        # "always" runs it on every report and "never" skips it
+        self.sweep_mode = os.getenv("EDITOR_SWEEP_MODE", "auto")
+        # "sectioned" edits each section concurrently with a smaller model and stitches them locally,
+        # "single" compiles the whole report in one call; models are picked by the router
+        self.mode = os.getenv("EDITOR_MODE", "single")
+        # Compiled report text is streamed as report_chunk events, coalesced over this window
+        self.stream_window = float(os.getenv("EDITOR_CHUNK_WINDOW_MS", 250)) / 1000
+        self.sweep_checks = [
+            check.strip() for check in os.getenv("EDITOR_SWEEP_CHECKS", ",".join(DEFAULT_CHECKS)).split(",")
+            if check.strip()
+        ]
+
+    @staticmethod
+    def _context(state: ResearchState) -> Dict[str, str]:
+        """Per-job report context; kept off the instance since one Editor serves concurrent jobs."""
+        return {
+            "company": state.get('company', 'Unknown Company'),
+            "industry": state.get('industry', 'Unknown'),
+            "hq_location": state.get('hq_location', 'Unknown')
         }
 
     async def compile_briefings(self, state: ResearchState) -> ResearchState:
         """Compile individual briefing categories from state into a final report."""
-        company = state.get('company', 'Unknown Company')
-        
-        # Update context with values from state
-        self.context = {
-            "company": company,
-            "industry": state.get('industry', 'Unknown'),
-            "hq_location": state.get('hq_location', 'Unknown')
-        }
+        context = self._context(state)
+        company = context["company"]
         
         # Send initial compilation status
         if websocket_manager := state.get('websocket_manager'):
@@ -55,12 +77,6 @@ class Editor:
                     }
                 )
 
-        context = {
-            "company": company,
-            "industry": state.get('industry', 'Unknown'),
-            "hq_location": state.get('hq_location', 'Unknown')
-        }
-        
         msg = [f"📑 Compiling final report for {company}..."]
         
         # Pull individual briefings from dedicated state keys
@@ -111,7 +127,7 @@ class Editor:
     async def edit_report(self, state: ResearchState, briefings: Dict[str, str], context: Dict[str, Any]) -> str:
         """Compile section briefings into a final report and update the state."""
         try:
-            company = self.context["company"]
+            company = context["company"]
             
             # Step 1: Initial Compilation
             if websocket_manager := state.get('websocket_manager'):
@@ -126,7 +142,18 @@ class Editor:
                         }
                     )
 
-            edited_report = await self.compile_content(state, briefings, company)
+            streamer = self._report_streamer(state, "Compiling report")
+            if structured := self._structured_briefings(state, briefings):
+                # Every section is structured, so the skeleton is assembled without an LLM call
+                edited_report = render_report(company, structured, self._reference_text(state))
+                logger.info(f"Assembled report locally from {len(structured)} structured briefings")
+                if streamer:
+                    await streamer.add(edited_report)
+                    await streamer.flush()
+            elif self.mode == "sectioned":
+                edited_report = await self.compile_sections(state, briefings, company, streamer)
+            else:
+                edited_report = await self.compile_content(state, briefings, company, streamer)
             if not edited_report:
                 logger.error("Initial compilation failed")
                 return ""
@@ -156,7 +183,15 @@ class Editor:
                             "substep": "format"
                         }
                     )
-            final_report = await self.content_sweep(state, edited_report, company)
+            edited_report = normalize_report(edited_report, company)
+            if self._needs_sweep(state, edited_report, bool(structured)):
+                # Clients replace the streamed compile output with the sweep's
+                await self._send_report_reset(state, "Revising report")
+                streamer = self._report_streamer(state, "Formatting final report")
+                final_report = await self.content_sweep(state, edited_report, company, streamer)
+                final_report = normalize_report(final_report, company) if final_report else edited_report
+            else:
+                final_report = edited_report
             
             final_report = final_report or ""
             
@@ -164,6 +199,13 @@ class Editor:
             if not final_report.strip():
                 logger.error("Final report is empty!")
                 return ""
+
+            # Normalization, or a fallback after a failed stream, changes the text clients were shown
+            if streamer and streamer.sent.strip() != final_report.strip():
+                await self._send_report_reset(state, "Finalizing report")
+                if final_streamer := self._report_streamer(state, "Finalizing report"):
+                    await final_streamer.add(final_report)
+                    await final_streamer.flush()
             
             logger.info("Final report preview:")
             logger.info(final_report[:500])
@@ -196,30 +238,83 @@ class Editor:
             logger.error(f"Error in edit_report: {e}")
             return ""
     
-    async def compile_content(self, state: ResearchState, briefings: Dict[str, str], company: str) -> str:
-        """Initial compilation of research sections."""
-        combined_content = "\n\n".join(content for content in briefings.values())
-        
+    def _needs_sweep(self, state: ResearchState, report: str, structured: bool) -> bool:
+        """Decide whether the normalized report still needs the LLM content sweep."""
+        if self.sweep_mode == "never" or (structured and not self.llm_dedup):
+            return False
+        if self.sweep_mode == "always":
+            return True
+
+        issues = validate_report(report, self.sweep_checks)
+        telemetry.record(state.get('job_id'), "editor_sweep", {"run": bool(issues), "issues": issues})
+        if issues:
+            logger.info(f"Running content sweep for {len(issues)} report issues: {issues[:5]}")
+        else:
+            logger.info("Report passed local checks, skipping content sweep")
+        return bool(issues)
+
+    async def _send_report_reset(self, state: ResearchState, message: str) -> None:
+        """Tell clients to discard the report text streamed so far."""
+        if websocket_manager := state.get('websocket_manager'):
+            if job_id := state.get('job_id'):
+                await websocket_manager.send_status_update(
+                    job_id=job_id,
+                    status="report_reset",
+                    message=message,
+                    result={"step": "Editor"}
+                )
+
+    def _report_streamer(self, state: ResearchState, message: str) -> ChunkCoalescer | None:
+        """Build a coalescer that forwards report text as report_chunk events, if anyone is listening."""
+        return status_streamer(
+            state.get('websocket_manager'),
+            state.get('job_id'),
+            status="report_chunk",
+            message=message,
+            result={"step": "Editor"},
+            window=self.stream_window
+        )
+
+    def _structured_briefings(self, state: ResearchState, briefings: Dict[str, str]) -> Dict[str, StructuredBriefing]:
+        """Return validated structured briefings when every available section has one, else an empty dict."""
+        structured = state.get('structured_briefings') or {}
+        if not briefings or any(category not in structured for category in briefings):
+            return {}
+        try:
+            return {category: StructuredBriefing.model_validate(structured[category]) for category in briefings}
+        except ValueError as e:
+            logger.warning(f"Invalid structured briefings, compiling with the LLM instead: {e}")
+            return {}
+
+    def _reference_text(self, state: ResearchState) -> str:
+        """Render the references section for the report."""
         references = state.get('references', [])
         reference_text = ""
         if references:
             logger.info(f"Found {len(references)} references to add during compilation")
             
-            # Get pre-processed reference info from curator
-            reference_info = state.get('reference_info', {})
-            reference_titles = state.get('reference_titles', {})
-            
-            logger.info(f"Reference info from state: {reference_info}")
-            logger.info(f"Reference titles from state: {reference_titles}")
-            
-            # Use the references module to format the references section
-            reference_text = format_references_section(references, reference_info, reference_titles)
+            if reference_index := state.get('reference_index'):
+                # Render straight from the job's reference index
+                reference_text = reference_index.references_section(references)
+            else:
+                # Fall back to the pre-processed reference info from curator
+                reference_info = state.get('reference_info', {})
+                reference_titles = state.get('reference_titles', {})
+                reference_text = format_references_section(references, reference_info, reference_titles)
             logger.info(f"Added {len(references)} references during compilation")
+        return reference_text
+
+    async def compile_content(
+        self, state: ResearchState, briefings: Dict[str, str], company: str, streamer: ChunkCoalescer | None = None
+    ) -> str:
+        """Initial compilation of research sections, forwarded to ``streamer`` as it is written."""
+        combined_content = "\n\n".join(content for content in briefings.values())
+        reference_text = self._reference_text(state)
         
-        # Use values from centralized context
-        company = self.context["company"]
-        industry = self.context["industry"]
-        hq_location = self.context["hq_location"]
+        context = self._context(state)
+        company = context["company"]
+        industry = context["industry"]
+        hq_location = context["hq_location"]
         
         prompt = f"""You are compiling a comprehensive research report about {company}.
 
@@ -252,8 +347,13 @@ Strictly enforce this EXACT document structure:
 Return the report in clean markdown format. No explanations or commentary."""
         
         try:
-            response = await self.openai_client.chat.completions.create(
-                model="gpt-4.1",
+            # The compiled report is about as long as its input
+            prompt_tokens = token_estimator.count(prompt)
+            chunks = llm_cache.chat_stream(
+                self.openai_client,
+                prompt_version=EDITOR_PROMPT_VERSION,
+                route="editor_compile",
+                model=router.choose("editor_compile", prompt_tokens, prompt_tokens),
                 messages=[
                     {
                         "role": "system",
@@ -264,26 +364,115 @@ Return the report in clean markdown format. No explanations or commentary."""
                         "content": prompt
                     }
                 ],
-                temperature=0,
-                stream=False
+                temperature=0
             )
-            initial_report = response.choices[0].message.content.strip()
+            
+            # Forward tokens as they arrive so the report starts rendering during the first call
+            initial_report = (await collect_stream(chunks, streamer)).strip()
             
             # Append the references section after LLM processing
             if reference_text:
                 initial_report = f"{initial_report}\n\n{reference_text}"
+                if streamer:
+                    await streamer.add(f"\n\n{reference_text}")
+                    await streamer.flush()
             
             return initial_report
         except Exception as e:
             logger.error(f"Error in initial compilation: {e}")
             return (combined_content or "").strip()
         
-    async def content_sweep(self, state: ResearchState, content: str, company: str) -> str:
-        """Sweep the content for any redundant information."""
-        # Use values from centralized context
-        company = self.context["company"]
-        industry = self.context["industry"]
-        hq_location = self.context["hq_location"]
+    async def compile_sections(
+        self, state: ResearchState, briefings: Dict[str, str], company: str, streamer: ChunkCoalescer | None = None
+    ) -> str:
+        """Edit each section concurrently and stitch the report locally.
+
+        Sections are streamed to ``streamer`` in report order as soon as they and
+        every section before them are done, so latency tracks the slowest section
+        rather than the whole report.
+        """
+        tasks = {
+            category: asyncio.create_task(self.edit_section(state, category, briefings[category]))
+            for category in REPORT_SECTIONS if category in briefings
+        }
+
+        blocks = [f"# {company} Research Report"]
+        if streamer:
+            await streamer.add(blocks[0])
+        for category, task in tasks.items():
+            try:
+                body = await task
+            except Exception as e:
+                logger.error(f"Error editing {category} section, using the briefing as is: {e}")
+                body = briefings[category].strip()
+            if not body:
+                continue
+            block = f"## {REPORT_SECTIONS[category]}\n\n{body}"
+            blocks.append(block)
+            if streamer:
+                await streamer.add(f"\n\n{block}")
+                await streamer.flush()
+
+        if reference_text := self._reference_text(state).strip():
+            blocks.append(reference_text)
+            if streamer:
+                await streamer.add(f"\n\n{reference_text}")
+                await streamer.flush()
+
+        logger.info(f"Stitched report from {len(tasks)} concurrently edited sections")
+        return "\n\n".join(blocks)
+
+    async def edit_section(self, state: ResearchState, category: str, content: str) -> str:
+        """Edit a single section briefing into report-ready markdown."""
+        context = self._context(state)
+        company = context["company"]
+        industry = context["industry"]
+        hq_location = context["hq_location"]
+        title = REPORT_SECTIONS[category]
+        structure = (
+            "Use only * bullet points, never headers" if category in FLAT_SECTIONS
+            else "Organize the content under ### subsections with * bullet points"
+        )
+
+        prompt = f"""You are editing the {title} section of a research report on {company}, a {industry} company headquartered in {hq_location}.
+
+Section briefing:
+{content}
+
+1. Keep every important, specific fact; remove repetition and transitional commentary
+2. Remove information that is not relevant to {company}
+3. {structure}
+4. Do not include the ## section header, code blocks or explanations
+
+Return only the section content in clean markdown."""
+
+        content = await llm_cache.chat(
+            self.openai_client,
+            prompt_version=EDITOR_PROMPT_VERSION,
+            route="editor_section",
+            model=router.choose("editor_section", token_estimator.count(prompt)),
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are an expert report editor that turns research briefings into polished report sections."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            temperature=0
+        )
+        return content.strip()
+
+    async def content_sweep(
+        self, state: ResearchState, content: str, company: str, streamer: ChunkCoalescer | None = None
+    ) -> str:
+        """Sweep the content for any redundant information, forwarding the revision to ``streamer``."""
+        context = self._context(state)
+        company = context["company"]
+        industry = context["industry"]
+        hq_location = context["hq_location"]
         
         prompt = f"""You are an expert briefing editor. You are given a report on {company}.
 
@@ -334,8 +523,12 @@ Return the polished report in flawless markdown format. No explanation.
 Return the cleaned report in flawless markdown format. No explanations or commentary."""
         
         try:
-            response = await self.openai_client.chat.completions.create(
-                model="gpt-4.1-mini", 
+            prompt_tokens = token_estimator.count(prompt)
+            chunks = llm_cache.chat_stream(
+                self.openai_client,
+                prompt_version=EDITOR_PROMPT_VERSION,
+                route="editor_sweep",
+                model=router.choose("editor_sweep", prompt_tokens, prompt_tokens),
                 messages=[
                     {
                         "role": "system",
@@ -346,50 +539,10 @@ Return the cleaned report in flawless markdown format. No explanations or commen
                         "content": prompt
                     }
                 ],
-                temperature=0,
-                stream=True
+                temperature=0
             )
             
-            accumulated_text = ""
-            buffer = ""
-            
-            async for chunk in response:
-                if chunk.choices[0].finish_reason == "stop":
-                    websocket_manager = state.get('websocket_manager')
-                    if websocket_manager and buffer:
-                        job_id = state.get('job_id')
-                        if job_id:
-                            await websocket_manager.send_status_update(
-                                job_id=job_id,
-                                status="report_chunk",
-                                message="Formatting final report",
-                                result={
-                                    "chunk": buffer,
-                                    "step": "Editor"
-                                }
-                            )
-                    break
-                    
-                chunk_text = chunk.choices[0].delta.content
-                if chunk_text:
-                    accumulated_text += chunk_text
-                    buffer += chunk_text
-                    
-                    if any(char in buffer for char in ['.', '!', '?', '\n']) and len(buffer) > 10:
-                        if websocket_manager := state.get('websocket_manager'):
-                            if job_id := state.get('job_id'):
-                                await websocket_manager.send_status_update(
-                                    job_id=job_id,
-                                    status="report_chunk",
-                                    message="Formatting final report",
-                                    result={
-                                        "chunk": buffer,
-                                        "step": "Editor"
-                                    }
-                                )
-                        buffer = ""
-            
-            return (accumulated_text or "").strip()
+            return (await collect_stream(chunks, streamer)).strip()
         except Exception as e:
             logger.error(f"Error in formatting: {e}")
             return (content or "").strip()
@@ -401,4 +554,10 @@ Return the cleaned report in flawless markdown format. No explanations or commen
             if 'editor' not in state or not isinstance(state['editor'], dict):
                 state['editor'] = {}
             state['editor']['report'] = state['report']
+            # Compact fact sheet that email and proposal generation read instead of the full report
+            state['digest'] = build_fact_sheet(state['report'], state.get('company', ''))
+            telemetry.record(state.get('job_id'), "outreach_digest", {
+                "report_chars": len(state['report']),
+                "digest_chars": len(state['digest'])
+            })
         return state
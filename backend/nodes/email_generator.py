@@ -1,11 +1,17 @@
 import logging
 import os
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict
 
 from langchain_core.messages import AIMessage
-from openai import AsyncOpenAI
 
 from ..classes import ResearchState
+from ..services.clients import clients
+from ..services.governor import governor
+from ..services.hedging import hedger
+from ..services.router import router
+from ..services.usage import usage
+from ..utils.streaming import chat_stream_text, collect_stream, status_streamer
+from ..utils.tokens import token_estimator
 
 logger = logging.getLogger(__name__)
 
@@ -18,17 +24,21 @@ class EmailGenerator:
         if not self.openai_key:
             raise ValueError("OPENAI_API_KEY environment variable is not set")
 
-        self.openai_client = AsyncOpenAI(api_key=self.openai_key)
+        self.openai_client = clients.openai()
 
-    async def generate_email(self, state: ResearchState) -> str:
-        company = state.get("company", "Unknown Company")
-        industry = state.get("industry", "Unknown Industry")
-        report = state.get("report", "")
-        help_description = state.get("help_description", "")
-        hq_location = state.get("hq_location", "Unknown")
+    async def stream_email(self, context: Dict[str, Any]) -> AsyncIterator[str]:
+        """Yield email text as the model writes it, from a state-like context with the report."""
+        company = context.get("company", "Unknown Company")
+        industry = context.get("industry") or "Unknown Industry"
+        # The job's fact sheet when available; the full report otherwise
+        research = context.get("digest") or context.get("report", "")
+        help_description = context.get("help_description", "")
+        hq_location = context.get("hq_location") or "Unknown"
+        persona = context.get("persona")
+        recipient = f"{persona} at {company}" if persona else f"the team at {company}"
 
         prompt = f"""
-You are a professional outreach strategist. Write a personalized, high-conversion cold email to the team at {company}, a {industry} company headquartered in {hq_location}.
+You are a professional outreach strategist. Write a personalized, high-conversion cold email to {recipient}, a {industry} company headquartered in {hq_location}.
 
 VALUE PROPOSITION FROM USER:
 {help_description if help_description else "No specific value proposition provided - use general business value"}
@@ -48,23 +58,42 @@ Strict requirements:
 - Focus on THEIR needs, not YOUR capabilities
 
 Company research context:
-{report}
+{research}
 
 Generate the email body only - clean, crisp, and highly relevant to {company}.
         """
 
+        async def attempt(model: str) -> AsyncIterator[str]:
+            async with governor.limit("openai"), usage.track("openai", model) as call:
+                response = await self.openai_client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": "You are an expert B2B outreach writer."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.7,
+                    stream=True,
+                    stream_options={"include_usage": True}
+                )
+                async for text in chat_stream_text(response, call.add_openai):
+                    yield text
+
+        model = router.choose("email", token_estimator.count(prompt))
+        async for text in hedger.stream("email", model, attempt):
+            yield text
+
+    async def generate_email(self, state: ResearchState) -> str:
+        company = state.get("company", "Unknown Company")
+        streamer = status_streamer(
+            state.get("websocket_manager"),
+            state.get("job_id"),
+            status="email_chunk",
+            message=f"Generating outreach email for {company}",
+            result={"step": "EmailGenerator"}
+        )
+
         try:
-            response = await self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are an expert B2B outreach writer."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                stream=False
-            )
-
-            email = response.choices[0].message.content.strip()
+            email = (await collect_stream(self.stream_email(state), streamer)).strip()
             return email
 
         except Exception as e:
@@ -111,5 +140,7 @@ Generate the email body only - clean, crisp, and highly relevant to {company}.
 
         return state
 
-    async def run(self, state: ResearchState) -> ResearchState:
-        return await self.compile_email(state)
+    async def run(self, state: ResearchState) -> Dict[str, Any]:
+        # Runs alongside the proposal generator, so only return this node's own keys
+        state = await self.compile_email(state)
+        return {"email": state["email"]} if state.get("email") else {}
@@ -3,9 +3,9 @@ import os
 from typing import Dict, List
 
 from langchain_core.messages import AIMessage
-from tavily import AsyncTavilyClient
 
 from ..classes import ResearchState
+from ..services.clients import clients
 
 
 class Enricher:
@@ -15,7 +15,7 @@ class Enricher:
         tavily_key = os.getenv("TAVILY_API_KEY")
         if not tavily_key:
             raise ValueError("TAVILY_API_KEY environment variable is not set")
-        self.tavily_client = AsyncTavilyClient(api_key=tavily_key)
+        self.tavily_client = clients.tavily()
         self.batch_size = 20
 
     async def fetch_single_content(self, url: str, websocket_manager=None, job_id=None, category=None) -> Dict[str, str]:
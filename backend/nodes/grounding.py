@@ -1,10 +1,10 @@
 import logging
-import os
 
 from langchain_core.messages import AIMessage
-from tavily import AsyncTavilyClient
 
 from ..classes import InputState, ResearchState
+from ..services.clients import clients
+from ..utils.references import ReferenceIndex
 
 logger = logging.getLogger(__name__)
 
@@ -12,7 +12,7 @@ class GroundingNode:
     """Gathers initial grounding data about the company."""
     
     def __init__(self) -> None:
-        self.tavily_client = AsyncTavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+        self.tavily_client = clients.tavily()
 
     async def initial_search(self, state: InputState) -> ResearchState:
         # Add debug logging at the start to check websocket manager
@@ -122,6 +122,10 @@ class GroundingNode:
             msg += f"\n🏭 Industry: {industry}"
             context_data["industry"] = industry
         
+        reference_index = state.get('reference_index')
+        if reference_index is None:
+            reference_index = ReferenceIndex()
+
         # Initialize ResearchState with input information
         research_state = {
             # Copy input fields
@@ -134,7 +138,9 @@ class GroundingNode:
             "site_scrape": site_scrape,
             # Pass through websocket info
             "websocket_manager": state.get('websocket_manager'),
-            "job_id": state.get('job_id')
+            "job_id": state.get('job_id'),
+            # Shared by the researchers, which index references as results arrive
+            "reference_index": reference_index
         }
 
         # If there was an error in the initial extraction, store it in the state
@@ -1,12 +1,20 @@
 import os
 import logging
-from typing import Dict
-from openai import AsyncOpenAI
+from typing import Any, AsyncIterator, Dict
 
 from ..classes import ResearchState
+from ..services.clients import clients
+from ..services.governor import governor
+from ..services.hedging import hedger
+from ..services.router import router
+from ..services.usage import usage
+from ..utils.streaming import chat_stream_text, collect_stream, status_streamer
+from ..utils.tokens import token_estimator
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_HELP_DESCRIPTION = "We provide innovative solutions to help companies achieve their business goals."
+
 
 class ProposalGenerator:
     """Generates a tailored 1–2 page partnership proposal in Markdown format."""
@@ -15,7 +23,7 @@ class ProposalGenerator:
         self.openai_key = os.getenv("OPENAI_API_KEY")
         if not self.openai_key:
             raise ValueError("OPENAI_API_KEY environment variable not set")
-        self.client = AsyncOpenAI(api_key=self.openai_key)
+        self.client = clients.openai()
 
     async def generate_proposal(self, state: ResearchState) -> ResearchState:
         company = state.get("company")
@@ -25,10 +33,6 @@ class ProposalGenerator:
         if not company or not company_research:
             logger.error("Missing required input (company or report)")
             return state
-        
-        if not help_description:
-            logger.warning("No help description provided - using generic proposal template")
-            help_description = "We provide innovative solutions to help companies achieve their business goals."
 
         # Real-time feedback
         if websocket_manager := state.get("websocket_manager"):
@@ -40,26 +44,20 @@ class ProposalGenerator:
                     result={"step": "ProposalGenerator", "substep": "start"}
                 )
 
-        prompt = self._build_prompt(company, company_research, help_description)
-
         try:
             logger.info(f"Generating proposal for: {company}")
-            response = await self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert B2B proposal writer. You write concise, persuasive, markdown-formatted partnership proposals tailored to each company's goals."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.7
+            streamer = status_streamer(
+                state.get("websocket_manager"),
+                state.get("job_id"),
+                status="proposal_chunk",
+                message=f"Generating partnership proposal for {company}",
+                result={"step": "ProposalGenerator"}
             )
-
-            content = response.choices[0].message.content.strip()
+            # Prefer the job's compact fact sheet over the full report
+            research = state.get("digest") or company_research
+            content = (await collect_stream(
+                self.stream_proposal(company, research, help_description), streamer
+            )).strip()
             logger.info("Proposal successfully generated")
 
             state["proposal"] = content
@@ -88,13 +86,51 @@ class ProposalGenerator:
             logger.error(f"Proposal generation failed: {e}")
             return state
 
-    async def run(self, state: ResearchState) -> ResearchState:
-        return await self.generate_proposal(state)
+    async def stream_proposal(
+        self, company: str, research: str, help_description: str | None, persona: str | None = None
+    ) -> AsyncIterator[str]:
+        """Yield proposal text as the model writes it."""
+        if not help_description:
+            logger.warning("No help description provided - using generic proposal template")
+            help_description = DEFAULT_HELP_DESCRIPTION
+
+        prompt = self._build_prompt(company, research, help_description, persona)
+
+        async def attempt(model: str) -> AsyncIterator[str]:
+            async with governor.limit("openai"), usage.track("openai", model) as call:
+                response = await self.client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "You are an expert B2B proposal writer. You write concise, persuasive, markdown-formatted partnership proposals tailored to each company's goals."
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    temperature=0.7,
+                    stream=True,
+                    stream_options={"include_usage": True}
+                )
+                async for text in chat_stream_text(response, call.add_openai):
+                    yield text
+
+        model = router.choose("proposal", token_estimator.count(prompt))
+        async for text in hedger.stream("proposal", model, attempt):
+            yield text
+
+    async def run(self, state: ResearchState) -> Dict[str, Any]:
+        # Runs alongside the email generator, so only return this node's own keys
+        state = await self.generate_proposal(state)
+        return {"proposal": state["proposal"]} if state.get("proposal") else {}
 
-    def _build_prompt(self, company: str, research: str, help_description: str) -> str:
+    def _build_prompt(self, company: str, research: str, help_description: str, persona: str | None = None) -> str:
+        audience = f"Audience: {persona}\n" if persona else ""
         return f"""
 Company: {company}
-Research Summary:
+{audience}Research Summary:
 {research}
 
 How We Can Help (Value Proposition):
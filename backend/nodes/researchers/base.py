@@ -4,14 +4,18 @@ import os
 from datetime import datetime
 from typing import Any, Dict, List
 
-from openai import AsyncOpenAI
-from tavily import AsyncTavilyClient
-
 from ...classes import ResearchState
+from ...services.clients import clients
+from ...services.llm_cache import llm_cache
+from ...services.router import router
 from ...utils.references import clean_title
+from ...utils.tokens import token_estimator
 
 logger = logging.getLogger(__name__)
 
+# Bump when the query generation prompt changes, so cached queries are not reused
+QUERY_PROMPT_VERSION = "1"
+
 class BaseResearcher:
     def __init__(self):
         tavily_key = os.getenv("TAVILY_API_KEY")
@@ -20,8 +24,8 @@ class BaseResearcher:
         if not tavily_key or not openai_key:
             raise ValueError("Missing API keys")
             
-        self.tavily_client = AsyncTavilyClient(api_key=tavily_key)
-        self.openai_client = AsyncOpenAI(api_key=openai_key)
+        self.tavily_client = clients.tavily()
+        self.openai_client = clients.openai()
         self.analyst_type = "base_researcher"  # Default type
 
     @property
@@ -45,72 +49,73 @@ class BaseResearcher:
         try:
             logger.info(f"Generating queries for {company} as {self.analyst_type}")
             
-            response = await self.openai_client.chat.completions.create(
-                model="gpt-4.1-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": f"You are researching {company}, a company in the {industry} industry."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"""Researching {company} on {datetime.now().strftime("%B %d, %Y")}.
+            messages = [
+                {
+                    "role": "system",
+                    "content": f"You are researching {company}, a company in the {industry} industry."
+                },
+                {
+                    "role": "user",
+                    "content": f"""Researching {company} on {datetime.now().strftime("%B %d, %Y")}.
 {self._format_query_prompt(prompt, company, hq, current_year)}"""
-                    }
-                ],
+                }
+            ]
+            input_tokens = sum(token_estimator.count(message["content"]) for message in messages)
+
+            # Same company on the same day gives the same prompt, so queries come from the cache
+            chunks = llm_cache.chat_stream(
+                self.openai_client,
+                prompt_version=QUERY_PROMPT_VERSION,
+                route="query_generation",
+                model=router.choose("query_generation", input_tokens),
+                messages=messages,
                 temperature=0,
-                max_tokens=4096,
-                stream=True
+                max_tokens=4096
             )
             
             queries = []
             current_query = ""
             current_query_number = 1
 
-            async for chunk in response:
-                if chunk.choices[0].finish_reason == "stop":
-                    break
-                    
-                content = chunk.choices[0].delta.content
-                if content:
-                    current_query += content
-                    
-                    # Stream the current state to the UI.
-                    if websocket_manager and job_id:
-                        await websocket_manager.send_status_update(
-                            job_id=job_id,
-                            status="query_generating",
-                            message="Generating research query",
-                            result={
-                                "query": current_query,
-                                "query_number": current_query_number,
-                                "category": self.analyst_type,
-                                "is_complete": False
-                            }
-                        )
+            async for content in chunks:
+                current_query += content
+                
+                # Stream the current state to the UI.
+                if websocket_manager and job_id:
+                    await websocket_manager.send_status_update(
+                        job_id=job_id,
+                        status="query_generating",
+                        message="Generating research query",
+                        result={
+                            "query": current_query,
+                            "query_number": current_query_number,
+                            "category": self.analyst_type,
+                            "is_complete": False
+                        }
+                    )
+                
+                # If a newline is detected, treat it as a complete query.
+                if '\n' in current_query:
+                    parts = current_query.split('\n')
+                    current_query = parts[-1]  # The last part is the start of the next query.
                     
-                    # If a newline is detected, treat it as a complete query.
-                    if '\n' in current_query:
-                        parts = current_query.split('\n')
-                        current_query = parts[-1]  # The last part is the start of the next query.
-                        
-                        for query in parts[:-1]:
-                            query = query.strip()
-                            if query:
-                                queries.append(query)
-                                if websocket_manager and job_id:
-                                    await websocket_manager.send_status_update(
-                                        job_id=job_id,
-                                        status="query_generated",
-                                        message="Generated new research query",
-                                        result={
-                                            "query": query,
-                                            "query_number": len(queries),
-                                            "category": self.analyst_type,
-                                            "is_complete": True
-                                        }
-                                    )
-                                current_query_number += 1
+                    for query in parts[:-1]:
+                        query = query.strip()
+                        if query:
+                            queries.append(query)
+                            if websocket_manager and job_id:
+                                await websocket_manager.send_status_update(
+                                    job_id=job_id,
+                                    status="query_generated",
+                                    message="Generated new research query",
+                                    result={
+                                        "query": query,
+                                        "query_number": len(queries),
+                                        "category": self.analyst_type,
+                                        "is_complete": True
+                                    }
+                                )
+                            current_query_number += 1
 
             # Add any remaining query (even if not newline terminated)
             if current_query.strip():
@@ -320,6 +325,7 @@ class BaseResearcher:
 
         # Process results
         merged_docs = {}
+        reference_index = state.get('reference_index')
         for query, result in zip(queries, results):
             for item in result.get("results", []):
                 if not item.get("content") or not item.get("url"):
@@ -341,6 +347,8 @@ class BaseResearcher:
                     "source": "web_search",
                     "score": item.get("score", 0.0)
                 }
+                if reference_index is not None:
+                    reference_index.add_document(merged_docs[url])
 
         # Send completion status
         if websocket_manager and job_id:
@@ -0,0 +1,136 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable
+
+logger = logging.getLogger(__name__)
+
+# Share of max_entries a namespace is trimmed to when it goes over the cap
+EVICT_TO = 0.9
+# Next to the backend package rather than the working directory, so every entry point shares one cache
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent.parent / ".cache"
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable sha256 key over JSON-serializable parts."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def _mtime(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except OSError:  # Removed by a concurrent eviction
+        return 0.0
+
+
+class DiskCache:
+    """Content-addressed JSON cache on disk with a TTL and LRU eviction.
+
+    Entries live in ``<root>/<namespace>/<key[:2]>/<key>.json``. Reads touch the
+    file's mtime, so the least recently used entries are evicted first once a
+    namespace grows past ``max_entries``. Entry counts are kept in memory, so
+    the directory is only scanned on the first write to a namespace and when
+    an eviction runs; each eviction trims the namespace to ``EVICT_TO`` of the
+    cap so the next one is many writes away.
+    """
+
+    def __init__(self, root: str | None = None, max_entries: int | None = None) -> None:
+        self.root = Path(root or os.getenv("CACHE_DIR") or DEFAULT_CACHE_DIR)
+        self.max_entries = max_entries or int(os.getenv("CACHE_MAX_ENTRIES", 1000))
+        self.enabled = os.getenv("CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+        # Entries per namespace as of the last scan, plus writes and removals since
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, namespace: str, key: str) -> Path:
+        return self.root / namespace / key[:2] / f"{key}.json"
+
+    def get(self, namespace: str, key: str, ttl: float) -> Any | None:
+        """Return the cached value, or None when missing, expired or unreadable."""
+        if not self.enabled:
+            return None
+        path = self._path(namespace, key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable cache entry {path}: {e}")
+            self._remove(namespace, path)
+            return None
+
+        if time.time() - entry.get("created", 0) > ttl:
+            self._remove(namespace, path)
+            return None
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        return entry.get("value")
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        if not self.enabled:
+            return
+        path = self._path(namespace, key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            is_new = not path.exists()
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"created": time.time(), "value": value}, f, ensure_ascii=False)
+            # Atomic so concurrent readers never see a partial entry
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write cache entry {path}: {e}")
+            return
+
+        with self._lock:
+            if namespace not in self._counts:
+                self._counts[namespace] = sum(1 for _ in self._entries(namespace))
+            elif is_new:
+                self._counts[namespace] += 1
+            if self._counts[namespace] > self.max_entries:
+                self._evict(namespace)
+
+    def _remove(self, namespace: str, path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            return
+        with self._lock:
+            if namespace in self._counts:
+                self._counts[namespace] -= 1
+
+    def _entries(self, namespace: str) -> Iterable[Path]:
+        return (self.root / namespace).glob("*/*.json")
+
+    def _evict(self, namespace: str) -> None:
+        """Drop the least recently used entries down to ``EVICT_TO`` of the cap; call with the lock held."""
+        entries = sorted(self._entries(namespace), key=_mtime)
+        keep = int(self.max_entries * EVICT_TO)
+        for path in entries[:max(len(entries) - keep, 0)]:
+            path.unlink(missing_ok=True)
+        self._counts[namespace] = min(len(entries), keep)
+        if len(entries) > keep:
+            logger.info(f"Evicted {len(entries) - keep} entries from {namespace} cache")
+
+    async def aget(self, namespace: str, key: str, ttl: float) -> Any | None:
+        return await asyncio.to_thread(self.get, namespace, key, ttl)
+
+    async def aset(self, namespace: str, key: str, value: Any) -> None:
+        await asyncio.to_thread(self.set, namespace, key, value)
+
+
+# Shared by every node
+cache = DiskCache()
@@ -0,0 +1,187 @@
+import json
+import logging
+import math
+import os
+import time
+from typing import Any, Dict
+
+import google.generativeai as genai
+import httpx
+from openai import AsyncOpenAI
+
+from .gemini_rest import GeminiRestModel
+from .tavily_client import TavilyClient
+from .usage import Call, usage
+
+logger = logging.getLogger(__name__)
+
+# Each provider's endpoint can be overridden with OPENAI_BASE_URL, TAVILY_BASE_URL or GEMINI_BASE_URL,
+# e.g. to point every job at local fake providers; they are read when each client is first built.
+# When GEMINI_BASE_URL is set, Gemini is called over REST instead of through the SDK's gRPC client
+DEFAULT_TAVILY_BASE_URL = "https://api.tavily.com"
+# Matches the Tavily SDK's own request timeout
+TAVILY_TIMEOUT = 180
+# Extract is billed per this many URLs
+TAVILY_EXTRACT_URLS_PER_CREDIT = 5
+
+
+def tavily_credits(path: str, payload: Dict[str, Any]) -> int:
+    """API credits a Tavily request uses; advanced depth costs double."""
+    multiplier = 2 if payload.get("search_depth") == "advanced" or payload.get("extract_depth") == "advanced" else 1
+    if path == "/extract":
+        urls = payload.get("urls") or []
+        urls = [urls] if isinstance(urls, str) else urls
+        return multiplier * max(math.ceil(len(urls) / TAVILY_EXTRACT_URLS_PER_CREDIT), 1)
+    return multiplier
+
+
+class ClientRegistry:
+    """Process-wide OpenAI, Tavily and Gemini clients that every job's nodes borrow.
+
+    Each provider gets one pooled ``httpx.AsyncClient``, so connections and TLS
+    sessions are reused across nodes and jobs instead of every node opening its
+    own pool. The API creates the pools in its lifespan and closes them on
+    shutdown; anything that asks before then (scripts, benchmarks) gets them
+    created on first use.
+    """
+
+    def __init__(self) -> None:
+        self._http: Dict[str, httpx.AsyncClient] = {}
+        self._openai: AsyncOpenAI | None = None
+        self._tavily: TavilyClient | None = None
+        self._gemini: Dict[str, Any] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=int(os.getenv("CLIENT_MAX_CONNECTIONS", 100)),
+            max_keepalive_connections=int(os.getenv("CLIENT_MAX_KEEPALIVE", 20)),
+            keepalive_expiry=float(os.getenv("CLIENT_KEEPALIVE_EXPIRY", 30)),
+        )
+
+    def _http2(self) -> bool:
+        if os.getenv("CLIENT_HTTP2", "false").lower() != "true":
+            return False
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("CLIENT_HTTP2 is set but the h2 package is not installed; using HTTP/1.1")
+            return False
+        return True
+
+    def _pool(self, provider: str, record_usage: bool = False, **kwargs: Any) -> httpx.AsyncClient:
+        """Return the provider's shared HTTP client, creating it on first use.
+
+        With ``record_usage`` every request is recorded as a call; providers whose
+        SDK responses carry token counts record usage at the call site instead.
+        """
+        if provider not in self._http:
+            stats = self._stats.setdefault(provider, {"requests": 0, "new_connections": 0})
+
+            async def trace(event: str, info: Dict[str, Any]) -> None:
+                if event == "connection.connect_tcp.complete":
+                    stats["new_connections"] += 1
+
+            async def on_request(request: httpx.Request) -> None:
+                stats["requests"] += 1
+                request.extensions["trace"] = trace
+                request.extensions["started"] = time.perf_counter()
+
+            async def on_response(response: httpx.Response) -> None:
+                request = response.request
+                call = Call(provider, request.url.path.lstrip("/"))
+                try:
+                    call.credits = tavily_credits(request.url.path, json.loads(request.content or b"{}"))
+                except ValueError:
+                    call.credits = 1
+                call.error = response.status_code >= 400
+                usage.record(call, time.perf_counter() - request.extensions.get("started", time.perf_counter()))
+
+            self._http[provider] = httpx.AsyncClient(
+                http2=self._http2(),
+                limits=self._limits(),
+                event_hooks={"request": [on_request], "response": [on_response] if record_usage else []},
+                **kwargs
+            )
+            logger.info(f"Created shared {provider} HTTP client")
+        return self._http[provider]
+
+    def start(self) -> None:
+        """Create the clients for every configured provider up front."""
+        if os.getenv("OPENAI_API_KEY"):
+            self.openai()
+        if os.getenv("TAVILY_API_KEY"):
+            self.tavily()
+
+    def openai(self) -> AsyncOpenAI:
+        """Return the shared OpenAI client."""
+        if self._openai is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise ValueError("OPENAI_API_KEY environment variable not set")
+            # Same timeout as the SDK's default client
+            self._openai = AsyncOpenAI(
+                api_key=api_key,
+                base_url=os.getenv("OPENAI_BASE_URL") or None,
+                http_client=self._pool("openai", timeout=httpx.Timeout(600, connect=5))
+            )
+        return self._openai
+
+    def tavily(self) -> TavilyClient:
+        """Return the shared Tavily client."""
+        if self._tavily is None:
+            api_key = os.getenv("TAVILY_API_KEY")
+            if not api_key:
+                raise ValueError("TAVILY_API_KEY environment variable is not set")
+            self._tavily = TavilyClient(self._pool(
+                "tavily",
+                record_usage=True,
+                base_url=os.getenv("TAVILY_BASE_URL") or DEFAULT_TAVILY_BASE_URL,
+                timeout=TAVILY_TIMEOUT,
+                headers={"Content-Type": "application/json", "Authorization": f"Bearer {api_key}"},
+            ))
+        return self._tavily
+
+    def gemini(self, model: str) -> Any:
+        """Return the shared client for one Gemini model.
+
+        This is the SDK's ``GenerativeModel`` unless ``GEMINI_BASE_URL`` is set,
+        in which case calls go over REST through a pooled HTTP client.
+        """
+        if model not in self._gemini:
+            base_url = os.getenv("GEMINI_BASE_URL")
+            if base_url:
+                api_key = os.getenv("GEMINI_API_KEY")
+                if not api_key:
+                    raise ValueError("GEMINI_API_KEY environment variable is not set")
+                pool = self._pool(
+                    "gemini",
+                    base_url=base_url,
+                    timeout=httpx.Timeout(600, connect=5),
+                    headers={"x-goog-api-key": api_key},
+                )
+                self._gemini[model] = GeminiRestModel(model, pool)
+            else:
+                self._gemini[model] = genai.GenerativeModel(model)
+        return self._gemini[model]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Requests sent and connections opened per provider; the rest reused a pooled connection."""
+        return {
+            provider: {**counts, "reused_connections": max(counts["requests"] - counts["new_connections"], 0)}
+            for provider, counts in self._stats.items()
+        }
+
+    async def close(self) -> None:
+        """Close every pooled connection."""
+        for provider, client in self._http.items():
+            await client.aclose()
+            logger.info(f"Closed shared {provider} HTTP client")
+        self._http.clear()
+        self._openai = None
+        self._tavily = None
+        self._gemini.clear()
+
+
+# Shared by every node
+clients = ClientRegistry()
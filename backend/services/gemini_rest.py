@@ -0,0 +1,132 @@
+import json
+import logging
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, List
+
+import httpx
+from google.api_core import exceptions as google_exceptions
+
+logger = logging.getLogger(__name__)
+
+# Gemini REST API version the model paths are served under
+API_VERSION = "v1beta"
+
+
+def _usage_metadata(payload: Dict[str, Any]) -> SimpleNamespace:
+    metadata = payload.get("usageMetadata") or {}
+    return SimpleNamespace(
+        prompt_token_count=metadata.get("promptTokenCount", 0),
+        candidates_token_count=metadata.get("candidatesTokenCount", 0),
+        cached_content_token_count=metadata.get("cachedContentTokenCount", 0),
+        total_token_count=metadata.get("totalTokenCount", 0),
+    )
+
+
+def _text(payload: Dict[str, Any]) -> str:
+    parts: List[str] = []
+    for candidate in payload.get("candidates", [])[:1]:
+        for part in (candidate.get("content") or {}).get("parts", []):
+            parts.append(part.get("text", ""))
+    return "".join(parts)
+
+
+def _generation_config(config: Dict[str, Any] | None) -> Dict[str, Any]:
+    """Convert SDK-style snake_case generation options to the REST API's camelCase."""
+    converted = {}
+    for key, value in (config or {}).items():
+        head, *rest = key.split("_")
+        converted[head + "".join(word.title() for word in rest)] = value
+    return converted
+
+
+class GeminiRestResponse:
+    """The parts of ``GenerateContentResponse`` the nodes read: ``text`` and ``usage_metadata``."""
+
+    def __init__(self, payload: Dict[str, Any]) -> None:
+        self.text = _text(payload)
+        self.usage_metadata = _usage_metadata(payload)
+
+
+class GeminiRestStream:
+    """Async iterator over streamed chunks; ``usage_metadata`` holds the latest counts seen."""
+
+    def __init__(self, chunks: AsyncIterator[Dict[str, Any]]) -> None:
+        self._chunks = chunks
+        self.usage_metadata = SimpleNamespace(prompt_token_count=0, candidates_token_count=0,
+                                              cached_content_token_count=0, total_token_count=0)
+
+    def __aiter__(self) -> "GeminiRestStream":
+        return self
+
+    async def __anext__(self) -> GeminiRestResponse:
+        payload = await self._chunks.__anext__()
+        chunk = GeminiRestResponse(payload)
+        if payload.get("usageMetadata"):
+            self.usage_metadata = chunk.usage_metadata
+        return chunk
+
+
+class GeminiRestModel:
+    """Stand-in for ``genai.GenerativeModel`` that calls the REST API over a shared HTTP client.
+
+    The SDK's async client only speaks gRPC, so this is how Gemini calls are
+    pointed at another endpoint, such as the local fake providers. Errors are
+    raised as the same ``google.api_core`` exceptions the SDK raises.
+    """
+
+    def __init__(self, model_name: str, http: httpx.AsyncClient) -> None:
+        self.model_name = model_name
+        self._http = http
+
+    def _request(self, prompt: str, generation_config: Dict[str, Any] | None) -> Dict[str, Any]:
+        body: Dict[str, Any] = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+        if generation_config:
+            body["generationConfig"] = _generation_config(generation_config)
+        return body
+
+    @staticmethod
+    async def _raise_for_status(response: httpx.Response) -> None:
+        if response.status_code < 400:
+            return
+        await response.aread()
+        try:
+            message = response.json().get("error", {}).get("message", response.text)
+        except ValueError:
+            message = response.text
+        raise google_exceptions.from_http_status(response.status_code, message)
+
+    async def generate_content_async(
+        self,
+        prompt: str,
+        stream: bool = False,
+        generation_config: Dict[str, Any] | None = None,
+        request_options: Dict[str, Any] | None = None,
+    ) -> GeminiRestResponse | GeminiRestStream:
+        path = f"/{API_VERSION}/models/{self.model_name}"
+        body = self._request(prompt, generation_config)
+        timeout = (request_options or {}).get("timeout", httpx.USE_CLIENT_DEFAULT)
+
+        if not stream:
+            response = await self._http.post(f"{path}:generateContent", json=body, timeout=timeout)
+            await self._raise_for_status(response)
+            return GeminiRestResponse(response.json())
+
+        request = self._http.build_request(
+            "POST", f"{path}:streamGenerateContent", params={"alt": "sse"}, json=body, timeout=timeout
+        )
+        response = await self._http.send(request, stream=True)
+        try:
+            await self._raise_for_status(response)
+        except Exception:
+            await response.aclose()
+            raise
+
+        async def chunks() -> AsyncIterator[Dict[str, Any]]:
+            try:
+                async for line in response.aiter_lines():
+                    if line.startswith("data:"):
+                        yield json.loads(line[len("data:"):])
+            finally:
+                await response.aclose()
+
+        return GeminiRestStream(chunks())
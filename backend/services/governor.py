@@ -0,0 +1,33 @@
+import asyncio
+import logging
+import os
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+# Default process-wide concurrent request caps, overridable with <PROVIDER>_MAX_CONCURRENCY
+DEFAULT_LIMITS = {
+    "gemini": 16,
+    "openai": 16,
+    "tavily": 20,
+}
+
+
+class ProviderGovernor:
+    """Caps concurrent calls to each external provider across all jobs in the process."""
+
+    def __init__(self) -> None:
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def max_concurrency(self, provider: str) -> int:
+        return int(os.getenv(f"{provider.upper()}_MAX_CONCURRENCY", DEFAULT_LIMITS.get(provider, 8)))
+
+    def limit(self, provider: str) -> asyncio.Semaphore:
+        """Return the provider's semaphore; use as ``async with governor.limit("gemini"):``."""
+        if provider not in self._semaphores:
+            self._semaphores[provider] = asyncio.Semaphore(self.max_concurrency(provider))
+        return self._semaphores[provider]
+
+
+# Shared by every node
+governor = ProviderGovernor()
@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import AsyncIterator, Callable, Deque, Dict
+
+from .router import router
+from .telemetry import telemetry
+from .usage import current_scope
+
+logger = logging.getLogger(__name__)
+
+# Time-to-first-token samples kept per model
+SAMPLE_WINDOW = 200
+
+
+class Hedger:
+    """Hedges slow LLM calls with a second request on a backup model.
+
+    When a call hasn't produced its first token within the model's recent
+    ``HEDGE_PERCENTILE`` time to first token, the same request starts on the
+    route's backup model; whichever streams first is used and the other is
+    cancelled. Off unless ``HEDGE_ENABLED`` is set, and at most
+    ``HEDGE_MAX_INFLIGHT`` backup requests run at once so hedging can't
+    amplify load when a provider is slow across the board.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = os.getenv("HEDGE_ENABLED", "false").lower() in ("1", "true", "yes")
+        self.percentile = float(os.getenv("HEDGE_PERCENTILE", 95))
+        # Until a model has this many samples its threshold is the default delay
+        self.min_samples = int(os.getenv("HEDGE_MIN_SAMPLES", 20))
+        self.default_delay = float(os.getenv("HEDGE_DEFAULT_DELAY_SECONDS", 10))
+        self.min_delay = float(os.getenv("HEDGE_MIN_DELAY_SECONDS", 1))
+        self.max_inflight = int(os.getenv("HEDGE_MAX_INFLIGHT", 4))
+        self._inflight = 0
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def observe(self, model: str, seconds: float) -> None:
+        self._samples.setdefault(model, deque(maxlen=SAMPLE_WINDOW)).append(seconds)
+
+    def delay(self, model: str) -> float:
+        """Seconds to wait for a first token before hedging a call to ``model``."""
+        samples = sorted(self._samples.get(model, ()))
+        if len(samples) < self.min_samples:
+            return self.default_delay
+        index = min(int(len(samples) * self.percentile / 100), len(samples) - 1)
+        return max(samples[index], self.min_delay)
+
+    async def stream(
+        self, route: str, model: str, attempt: Callable[[str], AsyncIterator[str]]
+    ) -> AsyncIterator[str]:
+        """Yield the text of ``attempt(model)``, hedged with ``attempt(backup)`` when it is slow to start.
+
+        With hedging enabled, a primary that fails before its first token also
+        fails over to the backup.
+        """
+        start = time.perf_counter()
+        streams: Dict[str, AsyncIterator[str]] = {}
+        started: Dict[str, float] = {}
+        # Each stream's first chunk, raced against the others
+        firsts: Dict[asyncio.Future, str] = {}
+        backup = None
+        hedged = False
+
+        def launch(name: str) -> None:
+            streams[name] = attempt(name)
+            started[name] = time.perf_counter()
+            firsts[asyncio.ensure_future(anext(streams[name]))] = name
+
+        launch(model)
+        try:
+            done, _ = await asyncio.wait(firsts, timeout=self.delay(model) if self.enabled else None)
+            if not done and self._inflight < self.max_inflight and (backup := router.backup(route, model)):
+                hedged = True
+                self._inflight += 1
+                logger.info(f"Hedging {route}: no first token from {model} after {time.perf_counter() - start:.1f}s, trying {backup}")
+                launch(backup)
+
+            winner, first = None, None
+            while winner is None:
+                done, _ = await asyncio.wait(firsts, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    name = firsts.pop(future)
+                    error = future.exception()
+                    if error is None or isinstance(error, StopAsyncIteration):
+                        winner, first = name, None if error else future.result()
+                        break
+                    logger.warning(f"{route} call on {name} failed before its first token: {error}")
+                    if firsts:
+                        continue
+                    if self.enabled and backup is None and (backup := router.backup(route, model)):
+                        logger.info(f"Failing {route} over from {model} to {backup}")
+                        launch(backup)
+                    else:
+                        raise error
+
+            self.observe(winner, time.perf_counter() - started[winner])
+            for name in firsts.values():
+                # The loser took at least this long, which still informs its threshold
+                self.observe(name, time.perf_counter() - started[name])
+            if backup:
+                job_id, node = current_scope()
+                telemetry.record(job_id, "hedge", {
+                    "route": route,
+                    "node": node,
+                    "primary": model,
+                    "backup": backup,
+                    "winner": winner,
+                    "seconds": round(time.perf_counter() - start, 3)
+                })
+            await self._cancel(firsts, streams, keep=winner)
+
+            if first is not None:
+                yield first
+                async for text in streams[winner]:
+                    yield text
+        finally:
+            await self._cancel(firsts, streams)
+            if hedged:
+                self._inflight -= 1
+
+    @staticmethod
+    async def _cancel(
+        firsts: Dict[asyncio.Future, str], streams: Dict[str, AsyncIterator[str]], keep: str | None = None
+    ) -> None:
+        """Cancel pending first-chunk reads and close every stream except ``keep``."""
+        for future in firsts:
+            future.cancel()
+        # A generator can only be closed once its pending read has unwound
+        await asyncio.gather(*firsts, return_exceptions=True)
+        firsts.clear()
+        for name in [name for name in streams if name != keep]:
+            await streams.pop(name).aclose()
+
+
+# Shared by every node
+hedger = Hedger()
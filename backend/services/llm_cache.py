@@ -0,0 +1,124 @@
+import logging
+import os
+from typing import Any, AsyncIterator, Callable, Dict, List
+
+from ..utils.streaming import chat_stream_text
+from .cache import DiskCache, fingerprint
+from .governor import governor
+from .hedging import hedger
+from .usage import usage
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = "llm"
+# Request fields that don't change what the model returns
+UNKEYED_PARAMS = {"stream", "messages", "model"}
+
+
+class LLMCache:
+    """Exact-match cache for deterministic (temperature 0) LLM calls.
+
+    Keys hash the provider, model, messages, remaining request parameters and
+    the caller's prompt version, so editing a prompt template only needs a
+    version bump. Entries persist in the disk cache under their own size bound.
+    Cached streams are replayed line by line, so callers that emit chunk events
+    behave the same on a hit. Calls that reach the provider hold an OpenAI
+    slot from the governor; hits don't.
+    """
+
+    def __init__(self) -> None:
+        self.store = DiskCache(max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", 5000)))
+        self.ttl = float(os.getenv("LLM_CACHE_TTL_SECONDS", 24 * 3600))
+        self.enabled = os.getenv("LLM_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, provider: str, model: str, messages: List[Dict[str, Any]], params: Dict[str, Any],
+            prompt_version: str = "1") -> str | None:
+        """Return the cache key, or None when the call isn't deterministic enough to cache."""
+        if not self.enabled or params.get("temperature") != 0:
+            return None
+        keyed = {name: value for name, value in params.items() if name not in UNKEYED_PARAMS}
+        return fingerprint(provider, model, messages, keyed, prompt_version)
+
+    async def stream(
+        self, key: str | None, produce: Callable[[], AsyncIterator[str]], provider: str = "", model: str | None = None,
+        served_by: List[str] | None = None
+    ) -> AsyncIterator[str]:
+        """Yield text from the cache when present, otherwise from ``produce()`` and store it.
+
+        Only complete responses are stored; a stream that fails or is abandoned
+        part way leaves the cache untouched. ``served_by`` collects the models
+        whose output ``produce()`` used; when given, the response is stored only
+        if that was ``model`` alone, so a hedge won by the backup isn't cached
+        under the primary's key.
+        """
+        if key and (cached := await self.store.aget(NAMESPACE, key, self.ttl)) is not None:
+            self.hits += 1
+            usage.cache_hit(provider, model)
+            logger.info(f"LLM cache hit ({len(cached)} characters)")
+            for line in cached.splitlines(keepends=True):
+                yield line
+            return
+
+        if key:
+            self.misses += 1
+        parts = []
+        async for text in produce():
+            parts.append(text)
+            yield text
+        if key and (served_by is None or served_by == [model]):
+            await self.store.aset(NAMESPACE, key, "".join(parts))
+
+    async def chat_stream(
+        self, client: Any, prompt_version: str = "1", route: str | None = None, **request: Any
+    ) -> AsyncIterator[str]:
+        """Stream an OpenAI chat completion's text through the cache.
+
+        Misses on a router ``route`` are hedged onto the route's backup model.
+        """
+        key = self.key("openai", request.get("model"), request.get("messages"), request, prompt_version)
+        served_by: List[str] = []
+
+        async def attempt(model: str) -> AsyncIterator[str]:
+            async with governor.limit("openai"), usage.track("openai", model) as call:
+                response = await client.chat.completions.create(
+                    **{**request, "model": model, "stream": True, "stream_options": {"include_usage": True}}
+                )
+                async for text in chat_stream_text(response, call.add_openai):
+                    yield text
+            served_by.append(model)
+
+        def produce() -> AsyncIterator[str]:
+            if route:
+                return hedger.stream(route, request.get("model"), attempt)
+            return attempt(request.get("model"))
+
+        async for text in self.stream(key, produce, "openai", request.get("model"), served_by):
+            yield text
+
+    async def chat(self, client: Any, prompt_version: str = "1", route: str | None = None, **request: Any) -> str:
+        """Return an OpenAI chat completion's full text through the cache, hedged like ``chat_stream``."""
+        key = self.key("openai", request.get("model"), request.get("messages"), request, prompt_version)
+        served_by: List[str] = []
+
+        async def attempt(model: str) -> AsyncIterator[str]:
+            async with governor.limit("openai"), usage.track("openai", model) as call:
+                response = await client.chat.completions.create(**{**request, "model": model, "stream": False})
+                call.add_openai(response.usage)
+            served_by.append(model)
+            yield response.choices[0].message.content or ""
+
+        def produce() -> AsyncIterator[str]:
+            if route:
+                return hedger.stream(route, request.get("model"), attempt)
+            return attempt(request.get("model"))
+
+        return "".join([text async for text in self.stream(key, produce, "openai", request.get("model"), served_by)])
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+# Shared by every node
+llm_cache = LLMCache()
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from ..utils.digest import build_fact_sheet
+from .router import latency_tier
+from .usage import usage_scope
+
+logger = logging.getLogger(__name__)
+
+class OutreachService:
+    """Generates outreach emails and proposals on demand from a finished job's report.
+
+    Results are memoized per (job, kind, help description, persona), and
+    concurrent requests for the same key share a single generation.
+    """
+
+    def __init__(self, max_entries: int = 1000) -> None:
+        self.max_entries = max_entries
+        self._results: "OrderedDict[Tuple[str, ...], str]" = OrderedDict()
+        self._pending: Dict[Tuple[str, ...], asyncio.Future] = {}
+        self._digests: "OrderedDict[str, str]" = OrderedDict()
+        self._generators: Dict[str, Any] = {}
+
+    def _key(self, job_id: str, kind: str, help_description: str | None, persona: str | None = None) -> Tuple[str, ...]:
+        return (job_id, kind, (help_description or "").strip(), (persona or "").strip())
+
+    def remember(self, job_id: str, kind: str, help_description: str | None, text: str, persona: str | None = None) -> None:
+        """Memoize a result, e.g. one generated eagerly by the research graph."""
+        if not text:
+            return
+        self._results[self._key(job_id, kind, help_description, persona)] = text
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    def digest(self, job_id: str, report: str, company: str = "") -> str:
+        """Return the job's compact fact sheet, built once per job."""
+        if job_id not in self._digests:
+            self._digests[job_id] = build_fact_sheet(report, company)
+            while len(self._digests) > self.max_entries:
+                self._digests.popitem(last=False)
+        return self._digests[job_id]
+
+    def _chunks(self, kind: str, context: Dict[str, Any]) -> AsyncIterator[str]:
+        # Imported lazily so the API starts without the graph's dependencies loaded
+        if kind not in self._generators:
+            if kind == "email":
+                from ..nodes.email_generator import EmailGenerator
+                self._generators[kind] = EmailGenerator()
+            else:
+                from ..nodes.proposal_generator import ProposalGenerator
+                self._generators[kind] = ProposalGenerator()
+
+        generator = self._generators[kind]
+        if kind == "email":
+            return generator.stream_email(context)
+        return generator.stream_proposal(
+            context.get("company"), context.get("digest") or context.get("report", ""),
+            context.get("help_description"), context.get("persona")
+        )
+
+    async def stream(self, kind: str, job_id: str, context: Dict[str, Any]) -> AsyncIterator[str]:
+        """Yield the requested text for a job, generating it only when not already memoized."""
+        key = self._key(job_id, kind, context.get("help_description"), context.get("persona"))
+        # Generators read the job's fact sheet rather than the full report
+        if not context.get("digest"):
+            context = {**context, "digest": self.digest(job_id, context.get("report", ""), context.get("company", ""))}
+
+        if (cached := self._results.get(key)) is not None:
+            self._results.move_to_end(key)
+            yield cached
+            return
+
+        if pending := self._pending.get(key):
+            # Someone else is generating it; wait for the whole text
+            if text := await asyncio.shield(pending):
+                yield text
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        parts = []
+        completed = False
+        try:
+            with usage_scope(job_id, f"{kind}_generator"), latency_tier(context.get("latency_tier")):
+                async for text in self._chunks(kind, context):
+                    parts.append(text)
+                    yield text
+            completed = True
+        except Exception as e:
+            logger.error(f"Error generating {kind} for job {job_id}: {e}")
+        finally:
+            # Partial output from a failed or abandoned stream is not memoized
+            result = "".join(parts).strip() if completed else ""
+            self.remember(job_id, kind, key[2], result, key[3])
+            self._pending.pop(key, None)
+            if not future.done():
+                future.set_result(result)
+
+    async def generate(self, kind: str, job_id: str, context: Dict[str, Any]) -> str:
+        """Return the full text for a job, memoized like ``stream``."""
+        return "".join([text async for text in self.stream(kind, job_id, context)])
+
+    async def batch(
+        self, kind: str, job_id: str, context: Dict[str, Any], variants: List[Dict[str, Any]]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Generate many (persona, help description) variants concurrently from the job's fact sheet.
+
+        Yields a result per variant as soon as it is ready; identical variants
+        are generated once and reported together.
+        """
+        shared = {**context, "digest": context.get("digest") or self.digest(job_id, context.get("report", ""), context.get("company", ""))}
+
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for index, variant in enumerate(variants):
+            persona = (variant.get("persona") or "").strip()
+            help_description = (variant.get("help_description") or context.get("help_description") or "").strip()
+            groups.setdefault((persona, help_description), []).append(index)
+        logger.info(f"Generating {len(groups)} unique {kind} variants for {len(variants)} requested in job {job_id}")
+
+        async def run(persona: str, help_description: str, indexes: List[int]) -> Tuple[List[int], str, str, str]:
+            text = await self.generate(kind, job_id, {**shared, "persona": persona, "help_description": help_description})
+            return indexes, persona, help_description, text
+
+        for next_done in asyncio.as_completed([run(*key, indexes) for key, indexes in groups.items()]):
+            indexes, persona, help_description, text = await next_done
+            for index in indexes:
+                result = {"index": index, "kind": kind, "persona": persona, "help_description": help_description, "text": text}
+                if not text:
+                    result["error"] = f"Failed to generate {kind}"
+                yield result
+
+
+# Shared by the API endpoints
+outreach = OutreachService()
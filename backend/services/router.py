@@ -0,0 +1,152 @@
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Iterator, List
+
+from .telemetry import telemetry
+from .usage import Call, current_scope, usage
+
+logger = logging.getLogger(__name__)
+
+# Context window of each routable model, in tokens
+CONTEXT_WINDOWS = {
+    "gpt-4.1": 1_047_576,
+    "gpt-4.1-mini": 1_047_576,
+    "gpt-4.1-nano": 1_047_576,
+    "gpt-4o": 128_000,
+    "gemini-2.0-flash": 1_048_576,
+    "gemini-2.0-flash-lite": 1_048_576,
+}
+LATENCY_TIERS = ("fast", "standard", "quality")
+
+
+@dataclass(frozen=True)
+class Route:
+    """Models one call site may use, all from the same provider.
+
+    ``fast`` serves small inputs (and every input in the fast tier), ``default``
+    everything else, and ``large`` takes over when the input doesn't fit the
+    others' context windows.
+    """
+    provider: str
+    fast: str
+    default: str
+    large: str
+    small_input_tokens: int
+    output_tokens: int
+
+    def candidates(self) -> List[str]:
+        return list(dict.fromkeys([self.fast, self.default, self.large]))
+
+
+# Every routed call site, configured in one place
+ROUTES: Dict[str, Route] = {
+    "query_generation": Route("openai", "gpt-4.1-nano", "gpt-4.1-mini", "gpt-4.1-mini", 1_500, 512),
+    "editor_compile": Route("openai", "gpt-4.1-mini", "gpt-4.1", "gpt-4.1", 4_000, 8_000),
+    "editor_section": Route(
+        "openai", "gpt-4.1-nano", os.getenv("EDITOR_SECTION_MODEL", "gpt-4.1-mini"), "gpt-4.1", 1_500, 2_000
+    ),
+    "editor_sweep": Route("openai", "gpt-4.1-nano", "gpt-4.1-mini", "gpt-4.1", 3_000, 8_000),
+    "email": Route("openai", "gpt-4.1-mini", "gpt-4o", "gpt-4.1", 2_000, 600),
+    "proposal": Route("openai", "gpt-4.1-mini", "gpt-4o", "gpt-4.1", 2_000, 2_000),
+    "briefing": Route("gemini", "gemini-2.0-flash-lite", "gemini-2.0-flash", "gemini-2.0-flash", 8_000, 4_000),
+}
+
+_tier: ContextVar[str | None] = ContextVar("latency_tier", default=None)
+
+
+@contextmanager
+def latency_tier(tier: str | None) -> Iterator[None]:
+    """Route calls made inside the block, and tasks it starts, for ``tier``."""
+    token = _tier.set(tier)
+    try:
+        yield
+    finally:
+        try:
+            _tier.reset(token)
+        except ValueError:  # An abandoned async generator finalized in another context
+            pass
+
+
+class ModelRouter:
+    """Picks the model for each call from its input size, the job's latency tier and provider health.
+
+    A model is skipped for ``ROUTER_COOLDOWN_SECONDS`` after
+    ``ROUTER_FAILURE_THRESHOLD`` consecutive failed calls.
+    """
+
+    def __init__(self) -> None:
+        self.default_tier = os.getenv("ROUTER_DEFAULT_TIER", "standard")
+        self.failure_threshold = int(os.getenv("ROUTER_FAILURE_THRESHOLD", 3))
+        self.cooldown = float(os.getenv("ROUTER_COOLDOWN_SECONDS", 60))
+        self._failures: Dict[str, int] = {}
+        self._last_failure: Dict[str, float] = {}
+
+    def observe(self, call: Call) -> None:
+        """Track consecutive failures per model from recorded calls."""
+        if call.cache_hit or not call.model:
+            return
+        if call.error:
+            self._failures[call.model] = self._failures.get(call.model, 0) + 1
+            self._last_failure[call.model] = time.monotonic()
+        else:
+            self._failures.pop(call.model, None)
+
+    def healthy(self, model: str) -> bool:
+        if self._failures.get(model, 0) < self.failure_threshold:
+            return True
+        return time.monotonic() - self._last_failure.get(model, 0) > self.cooldown
+
+    def tier(self) -> str:
+        tier = _tier.get() or self.default_tier
+        return tier if tier in LATENCY_TIERS else "standard"
+
+    def choose(self, name: str, input_tokens: int, output_tokens: int | None = None) -> str:
+        """Return the model for one call at ``name`` and record the decision in the job's telemetry."""
+        route = ROUTES[name]
+        tier = self.tier()
+        needed = input_tokens + (output_tokens or route.output_tokens)
+
+        if tier == "fast" or (tier == "standard" and input_tokens <= route.small_input_tokens):
+            preferred, reason = route.fast, f"{tier} tier, {input_tokens} input tokens"
+        else:
+            preferred, reason = route.default, f"{tier} tier, {input_tokens} input tokens"
+
+        # Escalate to larger models when the preferred one's context can't hold the call
+        candidates = route.candidates()
+        ordered = candidates[candidates.index(preferred):] + candidates[:candidates.index(preferred)]
+        fitting = [model for model in ordered if CONTEXT_WINDOWS.get(model, 0) >= needed] or [route.large]
+        if fitting[0] != preferred:
+            reason += f", {preferred} context too small"
+
+        model = next((model for model in fitting if self.healthy(model)), fitting[0])
+        if model != fitting[0]:
+            reason += f", {fitting[0]} unhealthy"
+
+        job_id, node = current_scope()
+        telemetry.record(job_id, "model_route", {
+            "route": name,
+            "node": node,
+            "model": model,
+            "tier": tier,
+            "input_tokens": input_tokens,
+            "reason": reason
+        })
+        logger.info(f"Routed {name} to {model} ({reason})")
+        return model
+
+    def backup(self, name: str, model: str) -> str | None:
+        """Another healthy model on the route, fastest first, whose context is at least as large as ``model``'s."""
+        window = CONTEXT_WINDOWS.get(model, 0)
+        for candidate in ROUTES[name].candidates():
+            if candidate != model and CONTEXT_WINDOWS.get(candidate, 0) >= window and self.healthy(candidate):
+                return candidate
+        return None
+
+
+# Shared by every node
+router = ModelRouter()
+usage.observers.append(router.observe)
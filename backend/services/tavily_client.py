@@ -0,0 +1,80 @@
+import json
+from typing import Any, Dict, List, Sequence, Union
+
+import httpx
+from tavily.errors import BadRequestError, InvalidAPIKeyError, UsageLimitExceededError
+
+from .governor import governor
+
+
+def _detail(response: httpx.Response, default: str) -> str:
+    try:
+        return response.json()["detail"]["error"]
+    except (ValueError, KeyError, TypeError):
+        return default
+
+
+class TavilyClient:
+    """Tavily search and extract over a shared HTTP client.
+
+    Mirrors ``tavily.AsyncTavilyClient.search``/``extract`` (tavily-python
+    0.5.1): the same request bodies, response dicts and exceptions. The SDK
+    opens a new HTTP client per request and has no way to pass one in, so
+    the requests are sent here instead. Each request holds a Tavily slot
+    from the governor.
+    """
+
+    def __init__(self, http: httpx.AsyncClient) -> None:
+        self._http = http
+
+    async def _post(self, path: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        async with governor.limit("tavily"):
+            response = await self._http.post(path, content=json.dumps(data))
+
+        if response.status_code == 200:
+            return response.json()
+        if response.status_code == 400:
+            raise BadRequestError(_detail(response, "Bad request. The request was invalid or cannot be served."))
+        if response.status_code == 401:
+            raise InvalidAPIKeyError()
+        if response.status_code == 429:
+            raise UsageLimitExceededError(_detail(response, "Too many requests."))
+        response.raise_for_status()
+        return response.json()
+
+    async def search(
+        self,
+        query: str,
+        search_depth: str = "basic",
+        topic: str = "general",
+        days: int = 3,
+        max_results: int = 5,
+        include_domains: Sequence[str] | None = None,
+        exclude_domains: Sequence[str] | None = None,
+        include_answer: bool = False,
+        include_raw_content: bool = False,
+        include_images: bool = False,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        data = {
+            "query": query,
+            "search_depth": search_depth,
+            "topic": topic,
+            "days": days,
+            "include_answer": include_answer,
+            "include_raw_content": include_raw_content,
+            "max_results": max_results,
+            "include_domains": include_domains,
+            "exclude_domains": exclude_domains,
+            "include_images": include_images,
+            **kwargs,
+        }
+        response = await self._post("/search", data)
+        response["results"] = response.get("results", [])
+        return response
+
+    async def extract(self, urls: Union[List[str], str], **kwargs: Any) -> Dict[str, Any]:
+        response = await self._post("/extract", {"urls": urls, **kwargs})
+        response["results"] = response.get("results", [])
+        response["failed_results"] = response.get("failed_results", [])
+        return response
@@ -0,0 +1,33 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class JobTelemetry:
+    """In-memory per-job telemetry, keyed by job ID and event name."""
+
+    def __init__(self, max_jobs: int = 1000) -> None:
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, Dict[str, List[Dict[str, Any]]]]" = OrderedDict()
+
+    def record(self, job_id: str | None, event: str, data: Dict[str, Any]) -> None:
+        """Append an event record for a job; a no-op without a job ID."""
+        if not job_id:
+            return
+        events = self._jobs.get(job_id)
+        if events is None:
+            events = self._jobs[job_id] = {}
+            # Forget the oldest jobs first
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+        events.setdefault(event, []).append({**data, "timestamp": time.time()})
+
+    def get(self, job_id: str) -> Dict[str, List[Dict[str, Any]]]:
+        return self._jobs.get(job_id, {})
+
+
+# Shared by every node and the API
+telemetry = JobTelemetry()
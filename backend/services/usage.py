@@ -0,0 +1,180 @@
+import logging
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# USD per million tokens: (input, cached input, output)
+MODEL_PRICES = {
+    "gpt-4.1": (2.00, 0.50, 8.00),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-4.1-nano": (0.10, 0.025, 0.40),
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gemini-2.0-flash": (0.10, 0.025, 0.40),
+    "gemini-2.0-flash-lite": (0.075, 0.01875, 0.30),
+}
+COUNTERS = ("calls", "errors", "cache_hits", "input_tokens", "cached_tokens", "output_tokens", "credits")
+
+# (job ID, node) that external calls made in the current task are charged to
+_scope: ContextVar[Tuple[str | None, str | None]] = ContextVar("usage_scope", default=(None, None))
+
+
+@contextmanager
+def usage_scope(job_id: str | None, node: str | None) -> Iterator[None]:
+    """Charge external calls made inside the block, and tasks it starts, to ``node`` of ``job_id``."""
+    token = _scope.set((job_id, node))
+    try:
+        yield
+    finally:
+        try:
+            _scope.reset(token)
+        except ValueError:  # An abandoned async generator finalized in another context
+            pass
+
+
+def current_scope() -> Tuple[str | None, str | None]:
+    """The (job ID, node) external calls are currently charged to."""
+    return _scope.get()
+
+
+class Call:
+    """Usage reported by a single external call."""
+
+    def __init__(self, provider: str, model: str | None) -> None:
+        self.provider = provider
+        self.model = model or ""
+        self.input_tokens = 0
+        self.cached_tokens = 0
+        self.output_tokens = 0
+        self.credits = 0
+        self.cache_hit = False
+        self.error = False
+
+    def add_openai(self, usage: Any) -> None:
+        """Take token counts from an OpenAI ``usage`` object."""
+        if usage is None:
+            return
+        self.input_tokens += getattr(usage, "prompt_tokens", 0) or 0
+        self.output_tokens += getattr(usage, "completion_tokens", 0) or 0
+        details = getattr(usage, "prompt_tokens_details", None)
+        self.cached_tokens += getattr(details, "cached_tokens", 0) or 0
+
+    def add_gemini(self, metadata: Any) -> None:
+        """Take token counts from a Gemini ``usage_metadata`` object."""
+        if metadata is None:
+            return
+        self.input_tokens += getattr(metadata, "prompt_token_count", 0) or 0
+        self.output_tokens += getattr(metadata, "candidates_token_count", 0) or 0
+        self.cached_tokens += getattr(metadata, "cached_content_token_count", 0) or 0
+
+
+class UsageTracker:
+    """Per-job and process-wide call counts, tokens, wall time and estimated cost.
+
+    Usage is bucketed by (node, provider, model); the job and node come from
+    the surrounding ``usage_scope``.
+    """
+
+    def __init__(self, max_jobs: int = 1000) -> None:
+        self.max_jobs = max_jobs
+        self.tavily_credit_price = float(os.getenv("TAVILY_CREDIT_PRICE", 0.008))
+        self._jobs: "OrderedDict[str, Dict[Tuple[str, str, str], Dict[str, float]]]" = OrderedDict()
+        self._totals: Dict[Tuple[str, str, str], Dict[str, float]] = {}
+        self._job_count = 0
+        # Called with every recorded call, e.g. to track provider health
+        self.observers: List[Callable[[Call], None]] = []
+
+    def cost(self, provider: str, model: str, input_tokens: float, cached_tokens: float,
+             output_tokens: float, credits: float) -> float:
+        """Estimated USD cost; unknown models are priced at zero."""
+        if provider == "tavily":
+            return credits * self.tavily_credit_price
+        input_price, cached_price, output_price = MODEL_PRICES.get(model, (0.0, 0.0, 0.0))
+        uncached = max(input_tokens - cached_tokens, 0)
+        return (uncached * input_price + cached_tokens * cached_price + output_tokens * output_price) / 1_000_000
+
+    @asynccontextmanager
+    async def track(self, provider: str, model: str | None = None) -> AsyncIterator[Call]:
+        """Time an external call and record the usage reported on the yielded ``Call``."""
+        call = Call(provider, model)
+        start = time.perf_counter()
+        try:
+            yield call
+        except Exception:
+            call.error = True
+            raise
+        finally:
+            self.record(call, time.perf_counter() - start)
+
+    def record(self, call: Call, seconds: float = 0.0) -> None:
+        for observer in self.observers:
+            observer(call)
+        job_id, node = _scope.get()
+        key = (node or "unscoped", call.provider, call.model)
+        values = {
+            "calls": 0 if call.cache_hit else 1,
+            "errors": 1 if call.error else 0,
+            "cache_hits": 1 if call.cache_hit else 0,
+            "input_tokens": call.input_tokens,
+            "cached_tokens": call.cached_tokens,
+            "output_tokens": call.output_tokens,
+            "credits": call.credits,
+            "seconds": seconds,
+            "cost_usd": self.cost(call.provider, call.model, call.input_tokens, call.cached_tokens,
+                                  call.output_tokens, call.credits),
+        }
+
+        buckets = [self._totals]
+        if job_id:
+            if job_id not in self._jobs:
+                self._jobs[job_id] = {}
+                self._job_count += 1
+                # Forget the oldest jobs first; the process-wide totals keep their usage
+                while len(self._jobs) > self.max_jobs:
+                    self._jobs.popitem(last=False)
+            buckets.append(self._jobs[job_id])
+        for bucket in buckets:
+            totals = bucket.setdefault(key, dict.fromkeys((*COUNTERS, "seconds", "cost_usd"), 0))
+            for name, value in values.items():
+                totals[name] += value
+
+    def cache_hit(self, provider: str, model: str | None = None) -> None:
+        """Record a call answered from the LLM cache instead of the provider."""
+        call = Call(provider, model)
+        call.cache_hit = True
+        self.record(call)
+
+    def _summary(self, buckets: Dict[Tuple[str, str, str], Dict[str, float]]) -> Dict[str, Any]:
+        rows: List[Dict[str, Any]] = []
+        total = dict.fromkeys((*COUNTERS, "seconds", "cost_usd"), 0)
+        by_provider: Dict[str, Dict[str, float]] = {}
+        for (node, provider, model), values in sorted(buckets.items()):
+            rows.append({"node": node, "provider": provider, "model": model, **self._rounded(values)})
+            provider_totals = by_provider.setdefault(provider, dict.fromkeys(total, 0))
+            for name, value in values.items():
+                total[name] += value
+                provider_totals[name] += value
+        return {
+            "total": self._rounded(total),
+            "by_provider": {provider: self._rounded(values) for provider, values in by_provider.items()},
+            "by_node": rows,
+        }
+
+    @staticmethod
+    def _rounded(values: Dict[str, float]) -> Dict[str, float]:
+        return {**values, "seconds": round(values["seconds"], 3), "cost_usd": round(values["cost_usd"], 6)}
+
+    def get(self, job_id: str) -> Dict[str, Any]:
+        return self._summary(self._jobs.get(job_id, {}))
+
+    def aggregate(self) -> Dict[str, Any]:
+        """Usage across every job since the process started."""
+        return {"jobs": self._job_count, **self._summary(self._totals)}
+
+
+# Shared by every node and the API
+usage = UsageTracker()
@@ -8,5 +8,6 @@ from .references import (
     process_references_from_search_results,
     format_reference_for_markdown,
     extract_link_info,
-    format_references_section
+    format_references_section,
+    ReferenceIndex
 ) 
\ No newline at end of file
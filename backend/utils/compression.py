@@ -0,0 +1,120 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+# Terms the briefing prompts ask for, per category, on top of the prompt text itself
+CATEGORY_FOCUS_TERMS = {
+    'company': [
+        "product", "products", "service", "services", "platform", "features", "technology",
+        "leadership", "ceo", "cto", "founder", "founded", "executive", "team",
+        "customers", "clients", "partners", "market", "use", "cases",
+        "differentiator", "unique", "pricing", "subscription", "business", "model", "distribution"
+    ],
+    'industry': [
+        "market", "segment", "size", "growth", "cagr", "billion", "million", "forecast",
+        "competitor", "competitors", "competition", "rival", "alternative", "share", "position",
+        "advantage", "trend", "trends", "challenge", "challenges", "regulation", "demand"
+    ],
+    'financial': [
+        "funding", "raised", "raises", "round", "series", "seed", "investors", "investment", "led",
+        "valuation", "valued", "revenue", "arr", "profit", "million", "billion", "ipo",
+        "pricing", "acquisition", "acquired"
+    ],
+    'news': [
+        "announced", "announces", "launch", "launched", "launches", "release", "introduces",
+        "partnership", "partners", "integration", "collaboration", "award", "recognized",
+        "named", "acquires", "acquisition", "expands", "appoints", "today"
+    ],
+}
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have in into is it its of on or that the their them
+there these this to was were will with you your each every only never no not do does list
+include including provide using use such when which who whom what where how any all more most
+one single same multiple other than then they should must can may based create focused key
+""".split())
+
+TOKEN = re.compile(r"[a-z0-9][a-z0-9$%&'.-]*[a-z0-9%]|[a-z0-9]")
+# Break after sentence punctuation followed by an uppercase letter, digit or quote, and at line breaks
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+(?=[\"'“(\[A-Z0-9])|\n+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords."""
+    return [token for token in TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences and standalone lines."""
+    return [sentence.strip() for sentence in SENTENCE_BOUNDARY.split(text) if sentence and sentence.strip()]
+
+
+def _tfidf_vectors(token_lists: List[List[str]]) -> Tuple[List[Dict[str, float]], Dict[str, float]]:
+    """Build sparse, L2-normalized TF-IDF vectors for a list of tokenized sentences."""
+    document_frequency = Counter()
+    for tokens in token_lists:
+        document_frequency.update(set(tokens))
+
+    total = len(token_lists)
+    idf = {term: math.log((total + 1) / (df + 1)) + 1 for term, df in document_frequency.items()}
+
+    vectors = []
+    for tokens in token_lists:
+        vector = {term: (1 + math.log(count)) * idf[term] for term, count in Counter(tokens).items()}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+        vectors.append({term: weight / norm for term, weight in vector.items()})
+    return vectors, idf
+
+
+def score_sentences(sentences: List[str], focus: str) -> List[float]:
+    """Score each sentence by TF-IDF cosine similarity to the focus text."""
+    token_lists = [tokenize(sentence) for sentence in sentences]
+    vectors, idf = _tfidf_vectors(token_lists)
+
+    focus_terms = set(tokenize(focus))
+    query = {term: idf[term] for term in focus_terms if term in idf}
+    query_norm = math.sqrt(sum(weight * weight for weight in query.values())) or 1.0
+
+    scores = []
+    for tokens, vector in zip(token_lists, vectors):
+        similarity = sum(weight * query[term] for term, weight in vector.items() if term in query) / query_norm
+        # Fragments of a few words carry little information even when they hit a focus term
+        scores.append(similarity * min(1.0, len(tokens) / 8))
+    return scores
+
+
+def compress_document(text: str, focus: str, budget: int) -> str:
+    """Keep the sentences most relevant to ``focus``, in original order, within ``budget`` characters."""
+    if len(text) <= budget:
+        return text
+
+    sentences = split_sentences(text)
+    if len(sentences) < 2:
+        return text[:budget] + "... [content truncated]"
+
+    scores = score_sentences(sentences, focus)
+    # The opening sentence usually says what the page is about; keep it competitive
+    scores[0] = max(scores[0], max(scores) * 0.5)
+    ranked = sorted(range(len(sentences)), key=lambda i: scores[i], reverse=True)
+
+    selected = []
+    seen = set()
+    used = 0
+    for index in ranked:
+        # Sentences sharing no term with the focus, and repeats, are filler
+        if scores[index] <= 0:
+            break
+        normalized = sentences[index].lower()
+        cost = len(sentences[index]) + 1
+        if normalized in seen or used + cost > budget:
+            continue
+        seen.add(normalized)
+        selected.append(index)
+        used += cost
+
+    if not selected:
+        return text[:budget] + "... [content truncated]"
+
+    selected.sort()
+    return "\n".join(sentences[index] for index in selected)
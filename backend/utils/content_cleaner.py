@@ -0,0 +1,156 @@
+import logging
+import re
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Set
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Cookie banners, consent prompts, share bars and footers; a line is only dropped when it
+# consists of these phrases alone, so prose that mentions one ("users can sign up for...") is kept
+BOILERPLATE_PHRASES = (
+    r"accept (?:all )?cookies|accept all|reject all|manage (?:preferences|consent)|cookie (?:policy|settings|preferences)|"
+    r"privacy policy|terms of (?:use|service)|all rights reserved|subscribe to (?:our|the) newsletter|subscribe|"
+    r"sign up(?: for (?:our|the) newsletter)?|sign in|log in|create (?:an )?account|skip to (?:main )?content|"
+    r"share(?: (?:this|on \w+))?|follow us(?: on \w+)?|back to top|read more|advertisement|"
+    r"javascript is disabled|enable javascript"
+)
+BOILERPLATE_LINE = re.compile(
+    rf"(?:{BOILERPLATE_PHRASES})(?:\s*[|·•/,&-]?\s*(?:{BOILERPLATE_PHRASES}))*\W*",
+    re.IGNORECASE
+)
+# Lines that open like a cookie banner or a copyright footer are boilerplate whatever follows
+BOILERPLATE_PREFIX = re.compile(
+    r"(?:we|this (?:web)?site) uses? cookies\b|(?:©|\(c\)|copyright ©?)\s*\d{4}\b|©",
+    re.IGNORECASE
+)
+MARKDOWN_LINK = re.compile(r"!?\[([^\]]*)\]\(([^)]*)\)")
+BARE_URL = re.compile(r"https?://\S+")
+SENTENCE_END = re.compile(r"[.!?:;\"')\]]$")
+
+MAX_BOILERPLATE_LINE = 200  # Longer lines are treated as real content
+NAV_LINE_MAX_WORDS = 4  # Lines this short without punctuation look like menu entries
+NAV_RUN_MIN_LINES = 4  # Consecutive menu-like lines needed to call it a navigation block
+MAX_LINK_DENSITY = 0.5  # Share of a line's characters that may sit inside links
+
+
+def _normalize_line(line: str) -> str:
+    """Normalize a line for repetition checks."""
+    return re.sub(r"\s+", " ", line).strip().lower()
+
+
+def link_density(line: str) -> float:
+    """Return the share of a line's characters that belong to links or URLs."""
+    if not line:
+        return 0.0
+    linked = sum(len(match.group(0)) for match in MARKDOWN_LINK.finditer(line))
+    without_links = MARKDOWN_LINK.sub("", line)
+    linked += sum(len(match.group(0)) for match in BARE_URL.finditer(without_links))
+    return linked / len(line)
+
+
+def _is_nav_like(line: str) -> bool:
+    """Whether a line looks like a menu item: a few words, no digits, no sentence punctuation."""
+    visible = MARKDOWN_LINK.sub(r"\1", line).strip("*#-•|> \t")
+    return (
+        bool(visible)
+        and len(visible.split()) <= NAV_LINE_MAX_WORDS
+        and not any(char.isdigit() for char in visible)
+        and not SENTENCE_END.search(visible)
+    )
+
+
+def is_boilerplate(line: str) -> bool:
+    """Whether a stripped line is a cookie banner, consent prompt, share bar or footer."""
+    visible = MARKDOWN_LINK.sub(r"\1", line).strip("*#-•|>[] \t")
+    return bool(BOILERPLATE_LINE.fullmatch(visible) or BOILERPLATE_PREFIX.match(visible))
+
+
+def clean_document(text: str) -> str:
+    """Strip boilerplate, navigation and repeated lines from one extracted document."""
+    if not text:
+        return ""
+
+    lines = [line.rstrip() for line in text.splitlines()]
+    kept: List[str] = []
+    nav_run: List[str] = []
+    seen: Set[str] = set()
+
+    def flush_nav_run() -> None:
+        # Isolated short lines are usually headings; only runs of them are menus
+        if len(nav_run) < NAV_RUN_MIN_LINES:
+            kept.extend(nav_run)
+        nav_run.clear()
+
+    for line in lines:
+        stripped = line.strip()
+        if not stripped:
+            flush_nav_run()
+            if kept and kept[-1] != "":
+                kept.append("")
+            continue
+
+        short = len(stripped) <= MAX_BOILERPLATE_LINE
+        if short and is_boilerplate(stripped):
+            continue
+        if link_density(stripped) > MAX_LINK_DENSITY:
+            continue
+
+        normalized = _normalize_line(stripped)
+        if normalized in seen:
+            continue
+        seen.add(normalized)
+
+        if short and _is_nav_like(stripped):
+            nav_run.append(stripped)
+            continue
+
+        flush_nav_run()
+        kept.append(stripped)
+
+    flush_nav_run()
+    return "\n".join(kept).strip()
+
+
+def find_repeated_lines(texts: Iterable[str], min_docs: int = 3) -> Set[str]:
+    """Return normalized short lines that occur in at least ``min_docs`` different documents."""
+    counts: Counter = Counter()
+    for text in texts:
+        counts.update({
+            normalized
+            for line in text.splitlines()
+            if (normalized := _normalize_line(line)) and len(normalized) <= MAX_BOILERPLATE_LINE
+        })
+    return {line for line, count in counts.items() if count >= min_docs}
+
+
+def site_of(url: str) -> str:
+    """Host of a document URL without ``www.``; pages with the same host share a site template."""
+    host = urlparse(url if "://" in url else f"//{url}").netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def remove_repeated_lines(texts: Dict[Any, str], sites: Dict[Any, str], min_docs: int = 3) -> Dict[Any, str]:
+    """Drop lines repeated across pages of one site (site-wide headers, footers, share bars).
+
+    Lines are only compared between documents with the same ``sites`` entry, so a
+    fact quoted by several outlets (a syndicated press release, a funding amount)
+    is kept. Documents without a site are left alone.
+    """
+    groups: Dict[str, List[Any]] = defaultdict(list)
+    for key in texts:
+        if site := sites.get(key):
+            groups[site].append(key)
+
+    cleaned = dict(texts)
+    for site, keys in groups.items():
+        if len(keys) < min_docs:
+            continue
+        repeated = find_repeated_lines((texts[key] for key in keys), min_docs)
+        if not repeated:
+            continue
+        logger.debug(f"Removing {len(repeated)} lines repeated across {min_docs}+ {site} pages")
+        for key in keys:
+            lines = [line for line in texts[key].splitlines() if _normalize_line(line) not in repeated]
+            cleaned[key] = re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+    return cleaned
@@ -0,0 +1,126 @@
+import logging
+import re
+from typing import List, Tuple
+
+from .compression import compress_document
+from .markdown import BULLET, HEADER, split_sections
+
+logger = logging.getLogger(__name__)
+
+# What outreach copy draws on: what they sell, who runs it, and what changed recently
+OUTREACH_FOCUS = (
+    "product products service platform customers market leadership ceo founder "
+    "funding raised investors revenue growth launch launched partnership announced expansion challenges"
+)
+REFERENCES_HEADER = re.compile(r"^##\s+references\s*$", re.IGNORECASE | re.MULTILINE)
+
+# (label, report section, ### heading pattern, bullet pattern, max facts). Bullets are taken
+# from subsections whose heading matches, plus any bullet in the section matching the bullet
+# pattern; with neither pattern the whole section is used. A group with only a heading
+# pattern takes the section's top remaining bullets when no heading in the section matches.
+FACT_GROUPS = [
+    ("Products & services", "company overview", r"product|service|offering|feature|differentiator", None, 6),
+    ("Leadership", "company overview", r"leader|team|management|executive|founder",
+     r"\b(?:ceo|cto|cfo|coo|founder|co-founder|president|chief)\b", 5),
+    ("Customers & market", "company overview", r"market|customer|audience|use case|business model", None, 4),
+    ("Competition", "industry overview", r"competit", None, 4),
+    ("Funding & financials", "financial overview", r"fund|invest|revenue|financ|valuation",
+     r"\$|\braised\b|\bfunding\b|\bseries [a-z]\b|\bvaluation\b|\brevenue\b", 5),
+    ("Recent news", "news", None, None, 6),
+]
+MAX_FACT_CHARS = 240
+# Reports that don't follow the usual structure yield too few facts; compress those instead
+MIN_FACTS = 3
+
+
+def strip_references(report: str) -> str:
+    """Drop the references section, which outreach prompts never need."""
+    if match := REFERENCES_HEADER.search(report or ""):
+        return report[:match.start()].rstrip()
+    return (report or "").strip()
+
+
+def report_digest(report: str, budget: int = 4000) -> str:
+    """Compress a report to the sentences most useful for outreach, within ``budget`` characters."""
+    body = strip_references(report)
+    digest = compress_document(body, OUTREACH_FOCUS, budget)
+    logger.info(f"Built outreach digest of {len(digest)} characters from a {len(report or '')} character report")
+    return digest
+
+
+def _subsections(lines: List[str]) -> Tuple[List[str], List[Tuple[str, List[str]]]]:
+    """Split a section body into its lead text and (### heading, bullets) pairs."""
+    lead: List[str] = []
+    subsections: List[Tuple[str, List[str]]] = [("", [])]
+    for line in lines:
+        if match := HEADER.match(line):
+            subsections.append((match.group(2).lower(), []))
+        elif match := BULLET.match(line):
+            subsections[-1][1].append(match.group(2).strip())
+        elif line.strip() and not subsections[-1][1] and len(subsections) == 1:
+            lead.append(line.strip())
+    return lead, subsections
+
+
+def _truncate(fact: str) -> str:
+    return fact if len(fact) <= MAX_FACT_CHARS else fact[:MAX_FACT_CHARS].rsplit(" ", 1)[0] + "…"
+
+
+def build_fact_sheet(report: str, company: str = "") -> str:
+    """Build a compact outreach fact sheet from a compiled report, without an LLM.
+
+    Picks products, leadership, market, funding and recent news bullets from
+    their report sections and drops the references. Reports too unstructured to
+    yield a few facts fall back to an extractive digest.
+    """
+    _, sections = split_sections(strip_references(report).splitlines())
+    parsed = {title.lower(): _subsections(lines) for title, lines in sections}
+
+    blocks = [f"Company: {company}"] if company else []
+    lead, _ = parsed.get("company overview", ([], []))
+    if lead:
+        blocks.append(f"Summary: {_truncate(' '.join(lead))}")
+
+    seen = set()
+    facts_by_group = {}
+    # Groups whose section has no matching ### heading, e.g. a flat Company Overview
+    unmatched = []
+    for label, section, heading_pattern, bullet_pattern, limit in FACT_GROUPS:
+        if section not in parsed:
+            continue
+        _, subsections = parsed[section]
+        facts = facts_by_group[label] = []
+        for heading, bullets in subsections:
+            heading_match = heading_pattern is None and bullet_pattern is None
+            heading_match = heading_match or bool(heading_pattern and heading and re.search(heading_pattern, heading))
+            for bullet in bullets:
+                if len(facts) >= limit or bullet.lower() in seen:
+                    continue
+                if heading_match or (bullet_pattern and re.search(bullet_pattern, bullet, re.IGNORECASE)):
+                    seen.add(bullet.lower())
+                    facts.append(_truncate(bullet))
+        if not facts and heading_pattern and not bullet_pattern and not any(heading and re.search(heading_pattern, heading) for heading, _ in subsections):
+            unmatched.append((label, section, limit))
+
+    # Once every group has taken its matching bullets, unmatched groups take the section's top remaining ones
+    for label, section, limit in unmatched:
+        facts = facts_by_group[label]
+        for _, bullets in parsed[section][1]:
+            for bullet in bullets:
+                if len(facts) < limit and bullet.lower() not in seen:
+                    seen.add(bullet.lower())
+                    facts.append(_truncate(bullet))
+
+    fact_count = 0
+    for label, facts in facts_by_group.items():
+        if facts:
+            fact_count += len(facts)
+            blocks.append(f"{label}:\n" + "\n".join(f"* {fact}" for fact in facts))
+
+    if fact_count < MIN_FACTS:
+        logger.info(f"Report yielded only {fact_count} structured facts, using an extractive digest")
+        return report_digest(report)
+
+    fact_sheet = "\n\n".join(blocks)
+    logger.info(f"Built fact sheet with {fact_count} facts ({len(fact_sheet)} characters) from a {len(report or '')} character report")
+    return fact_sheet
@@ -0,0 +1,170 @@
+import logging
+import re
+from typing import Dict, Iterable, List, Tuple
+
+from .report import CODE_FENCE, FLAT_SECTIONS, REPORT_SECTIONS
+
+logger = logging.getLogger(__name__)
+
+# The only ## headers a report may use, in this order
+REPORT_HEADERS = [*REPORT_SECTIONS.values(), "References"]
+# Headers of the sections whose content must be a flat bullet list
+FLAT_HEADERS = {REPORT_SECTIONS[category] for category in FLAT_SECTIONS}
+
+HEADER = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+BULLET = re.compile(r"^(\s*)(?:[*\-+•·]|\d+[.)])\s+(.*)$")
+META_COMMENTARY = re.compile(
+    r"^(?:here\s+is|here's|below\s+is|the\s+following\s+is|this\s+report\s+(?:provides|presents)|"
+    r"i\s+have|i've|note:|as\s+an\s+ai)\b",
+    re.IGNORECASE
+)
+WORD = re.compile(r"\w+")
+
+# Near-duplicate bullets have at least this word-set Jaccard similarity
+NEAR_DUPLICATE_THRESHOLD = 0.8
+# Shorter bullets are too terse to compare meaningfully
+NEAR_DUPLICATE_MIN_WORDS = 3
+DEFAULT_CHECKS = ("duplicate_bullets", "unknown_headers", "meta_commentary", "preamble")
+
+
+def _bullet_words(text: str) -> frozenset:
+    return frozenset(WORD.findall(text.lower()))
+
+
+def split_sections(lines: List[str]) -> Tuple[List[str], List[Tuple[str, List[str]]]]:
+    """Split report lines into the preamble and (## header, body lines) pairs."""
+    preamble: List[str] = []
+    sections: List[Tuple[str, List[str]]] = []
+    for line in lines:
+        match = HEADER.match(line)
+        if match and len(match.group(1)) == 2:
+            sections.append((match.group(2), []))
+        elif sections:
+            sections[-1][1].append(line)
+        else:
+            preamble.append(line)
+    return preamble, sections
+
+
+def _normalize_body(lines: Iterable[str], flat: bool, seen: set) -> List[str]:
+    """Normalize a section body into blocks separated by single blank lines."""
+    out: List[str] = []
+    previous = None  # "bullet", "header" or "text"
+    for raw in lines:
+        line = raw.rstrip()
+        if not line.strip() or CODE_FENCE.match(line):
+            continue
+
+        if match := HEADER.match(line):
+            if flat:
+                continue
+            kind, line = "header", f"### {match.group(2)}"
+        elif match := BULLET.match(line):
+            text = match.group(2).strip()
+            key = " ".join(WORD.findall(text.lower()))
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            kind, line = "bullet", f"{'  ' if match.group(1) else ''}* {text}"
+        else:
+            kind, line = "text", line.strip()
+
+        # One blank line around headers and lists; bullets in a list stay together
+        if out and not (kind == "bullet" and previous == "bullet"):
+            out.append("")
+        out.append(line)
+        previous = kind
+
+    # A trailing ### header with nothing under it
+    while out and out[-1].startswith("### "):
+        out.pop()
+        while out and not out[-1]:
+            out.pop()
+    return out
+
+
+def normalize_report(report: str, company: str) -> str:
+    """Enforce the report's formatting rules without an LLM.
+
+    Starts the report with the ``# {company} Research Report`` title, puts the
+    known ``##`` sections in their fixed order, uses ``*`` bullets, drops code
+    fences, exact duplicate bullets and empty sections, keeps single blank lines
+    and leaves the references entries exactly as provided. Unknown ``##``
+    sections are kept, before the references, for the validator to report.
+    """
+    preamble, sections = split_sections((report or "").splitlines())
+    seen: set = set()
+
+    blocks = [f"# {company} Research Report"]
+    intro = [line for line in preamble if not HEADER.match(line)]
+    if body := _normalize_body(intro, flat=False, seen=seen):
+        blocks.append("\n".join(body))
+
+    order = {header.lower(): index for index, header in enumerate(REPORT_HEADERS)}
+    # Known headers get their canonical spelling; repeated sections are merged
+    titles: Dict[str, str] = {header.lower(): header for header in REPORT_HEADERS}
+    merged: Dict[str, List[str]] = {}
+    for title, lines in sections:
+        key = title.lower()
+        titles.setdefault(key, title)
+        merged.setdefault(key, []).extend(lines)
+
+    # Unknown sections go just before the references
+    for key in sorted(merged, key=lambda k: order.get(k, order["references"] - 0.5)):
+        title = titles[key]
+        if key == "references":
+            # Preserve references exactly, minus blank lines and code fences
+            body = [line.rstrip() for line in merged[key] if line.strip() and not CODE_FENCE.match(line)]
+        else:
+            body = _normalize_body(merged[key], flat=title in FLAT_HEADERS, seen=seen)
+        if body:
+            blocks.append(f"## {title}\n\n" + "\n".join(body))
+
+    return "\n\n".join(blocks) + "\n"
+
+
+def validate_report(report: str, checks: Iterable[str] = DEFAULT_CHECKS) -> List[str]:
+    """Run the named checks on a normalized report and return a description of each failure.
+
+    Text between the title and the first section is reported by ``preamble``
+    (and by ``meta_commentary`` when it reads like commentary), since
+    ``normalize_report`` keeps it.
+    """
+    checks = set(checks)
+    issues: List[str] = []
+    preamble, sections = split_sections(report.splitlines())
+    intro = [line for line in preamble if line.strip() and not HEADER.match(line)]
+
+    if "preamble" in checks and intro:
+        issues.append(f"preamble: {intro[0].strip()[:80]}")
+
+    if "unknown_headers" in checks:
+        known = {header.lower() for header in REPORT_HEADERS}
+        for title, _ in sections:
+            if title.lower() not in known:
+                issues.append(f"unknown_headers: ## {title}")
+
+    content = [(title, lines) for title, lines in sections if title.lower() != "references"]
+
+    if "meta_commentary" in checks:
+        for lines in [intro, *(lines for _, lines in content)]:
+            for line in lines:
+                if META_COMMENTARY.match(BULLET.sub(r"\2", line).strip()):
+                    issues.append(f"meta_commentary: {line.strip()[:80]}")
+
+    if "duplicate_bullets" in checks:
+        bullets = []
+        for _, lines in content:
+            for line in lines:
+                if match := BULLET.match(line):
+                    words = _bullet_words(match.group(2))
+                    if len(words) >= NEAR_DUPLICATE_MIN_WORDS:
+                        bullets.append((match.group(2), words))
+        for i, (text, words) in enumerate(bullets):
+            for other, other_words in bullets[i + 1:]:
+                similarity = len(words & other_words) / len(words | other_words)
+                if similarity >= NEAR_DUPLICATE_THRESHOLD:
+                    issues.append(f"duplicate_bullets: {text[:60]!r} ~ {other[:60]!r}")
+                    break
+
+    return issues
@@ -1,6 +1,7 @@
+import heapq
 import logging
 import re
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, List, Tuple
 from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
@@ -84,7 +85,7 @@ def clean_title(title: str) -> str:
     
     # Log if we made changes to the title
     if title != original_title:
-        logger.info(f"Cleaned title from '{original_title}' to '{title}'")
+        logger.debug(f"Cleaned title from '{original_title}' to '{title}'")
     
     return title
 
@@ -123,121 +124,194 @@ def extract_website_name_from_domain(domain: str) -> str:
     
     return website_name
 
-def process_references_from_search_results(state: Dict[str, Any]) -> Tuple[List[str], Dict[str, str], Dict[str, Dict[str, Any]]]:
-    """Process references from search results and return top references, titles, and info."""
-    all_top_references = []
-    
-    # Collect references with scores from all data types
+def _reference_score(doc: Dict[str, Any]) -> float:
+    """Return the curation score of a document, falling back to the raw search score."""
+    evaluation = doc.get('evaluation') or {}
+    if 'overall_score' in evaluation:
+        return float(evaluation['overall_score'])
+    return float(doc.get('score', 0))
+
+def process_references_from_search_results(state: Dict[str, Any], max_references: int = 10) -> Tuple[List[str], Dict[str, str], Dict[str, Dict[str, Any]]]:
+    """Process references from search results and return top references, titles, and info.
+
+    Curated documents are walked once: each URL is normalized and only its best
+    score is kept, and the first title seen for each document URL is indexed
+    along the way. The top ``max_references`` are then picked with a
+    heap, so the cost grows linearly with the number of curated documents.
+    """
     data_types = ['curated_company_data', 'curated_industry_data', 'curated_financial_data', 'curated_news_data']
-    
-    # Log the start of reference processing
-    logger.info("Starting to process references from search results")
-    
+
+    # normalized URL -> (score, insertion order, original URL)
+    best_references: Dict[str, Tuple[float, int, str]] = {}
+    titles_by_url: Dict[str, str] = {}
+    total_references = 0
+
     for data_type in data_types:
-        if curated_data := state.get(data_type, {}):
-            for url, doc in curated_data.items():
-                try:
-                    # Ensure we have a valid score
-                    if 'evaluation' in doc and 'overall_score' in doc['evaluation']:
-                        score = float(doc['evaluation']['overall_score'])
-                    else:
-                        # Fallback to raw score if available
-                        score = float(doc.get('score', 0))
-                    
-                    logger.info(f"Found reference in {data_type}: URL={url}, Score={score:.4f}")
-                    all_top_references.append((url, score))
-                except (KeyError, ValueError, TypeError) as e:
-                    logger.warning(f"Error processing score for {url} in {data_type}: {e}")
-                    continue
-    
-    logger.info(f"Collected a total of {len(all_top_references)} references before deduplication")
-    
-    # Sort references by score in descending order
-    all_top_references.sort(key=lambda x: float(x[1]), reverse=True)
-    
-    # Log top 20 references before deduplication to verify sorting
-    logger.info("Top 20 references by score before deduplication:")
-    for i, (url, score) in enumerate(all_top_references[:20]):
-        logger.info(f"{i+1}. Score: {score:.4f} - URL: {url}")
-    
-    # Use a set to store unique URLs, keeping only the highest scored version of each URL
-    seen_urls = set()
-    unique_references = []
+        if not (curated_data := state.get(data_type, {})):
+            continue
+        for url, doc in curated_data.items():
+            total_references += 1
+
+            # Index the first title seen for the document's own URL
+            doc_url = doc.get('url')
+            if doc_url and doc_url not in titles_by_url and (raw_title := doc.get('title')):
+                titles_by_url[doc_url] = raw_title
+
+            # Skip if URL is not valid
+            if not url or not url.startswith(('http://', 'https://')):
+                logger.debug(f"Skipping invalid URL: {url}")
+                continue
+
+            try:
+                score = _reference_score(doc)
+            except (KeyError, ValueError, TypeError) as e:
+                logger.warning(f"Error processing score for {url} in {data_type}: {e}")
+                continue
+
+            # Keep only the highest scored version of each URL
+            normalized_url = normalize_url(url)
+            current = best_references.get(normalized_url)
+            if current is None or score > current[0]:
+                best_references[normalized_url] = (score, total_references, url)
+
+    # Highest score first; ties keep the order the references were found in
+    top_references = heapq.nlargest(
+        max_references,
+        best_references.items(),
+        key=lambda item: (item[1][0], -item[1][1])
+    )
+
+    top_reference_urls = []
     reference_titles = {}  # Store titles for references
     reference_info = {}  # Store additional information for MLA-style references
-    
-    for url, score in all_top_references:
-        # Skip if URL is not valid
+    for normalized_url, (score, _, url) in top_references:
+        # Titles are only cleaned for the selected references
+        title = clean_title(titles_by_url.get(url) or titles_by_url.get(normalized_url, ''))
+        if title == url:
+            title = ''
+        if title:
+            reference_titles[normalized_url] = title
+
+        # Extract domain name for website citation
+        domain = urlparse(url).netloc
+        reference_info[normalized_url] = {
+            'title': title,
+            'domain': domain,
+            'website': extract_website_name_from_domain(domain),
+            'url': normalized_url,
+            'score': score
+        }
+        top_reference_urls.append(normalized_url)
+
+    logger.info(
+        f"Selected {len(top_reference_urls)} references from {len(best_references)} unique "
+        f"URLs ({total_references} curated documents)"
+    )
+    if logger.isEnabledFor(logging.DEBUG):
+        for i, url in enumerate(top_reference_urls):
+            logger.debug(f"{i+1}. Score: {reference_info[url]['score']:.4f} - URL: {url}")
+
+    return top_reference_urls, reference_titles, reference_info
+
+class ReferenceIndex:
+    """Per-job index of references, updated as search results are ingested.
+
+    Each canonical URL keeps its cleaned title, domain, website name and best
+    score, so curation can read a top-k view and the editor can render the
+    references section without re-deriving any of it.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, url: str) -> bool:
+        return normalize_url(url) in self._entries
+
+    def add(self, url: str, title: str = "", score: float = 0.0) -> str:
+        """Record a reference and return its canonical URL ('' if the URL is not indexable)."""
         if not url or not url.startswith(('http://', 'https://')):
-            logger.info(f"Skipping invalid URL: {url}")
-            continue
+            return ""
 
-        # Normalize URL
-        normalized_url = normalize_url(url)
-        
-        if normalized_url not in seen_urls:
-            seen_urls.add(normalized_url)
-            unique_references.append((normalized_url, score))
-            
-            # Extract domain name for website citation
-            parsed = urlparse(url)
-            domain = parsed.netloc
-            
-            # Find and store the title and other info for this URL
-            title = None
-            website_name = None
-            
-            # Look for the document info in all data types
-            for data_type in data_types:
-                if not title and (curated_data := state.get(data_type, {})):
-                    for doc in curated_data.values():
-                        if doc.get('url') == url:
-                            title = doc.get('title', '')
-                            if title:
-                                # Clean up the title
-                                title = clean_title(title)
-                                if title and title.strip() and title != url:
-                                    reference_titles[normalized_url] = title
-                                    logger.info(f"Found title for URL {url}: '{title}'")
-                                    break
-            
-            # If no title was found, log it
-            if not title:
-                logger.info(f"No valid title found for URL {url}")
-            
-            # Extract a better website name from the domain
-            website_name = extract_website_name_from_domain(domain)
-            
-            # Store additional information for MLA citation
-            reference_info[normalized_url] = {
-                'title': title or '',
+        canonical_url = normalize_url(url)
+        try:
+            score = float(score or 0)
+        except (ValueError, TypeError):
+            score = 0.0
+
+        entry = self._entries.get(canonical_url)
+        if entry is None:
+            domain = urlparse(url).netloc
+            entry = {
+                'url': canonical_url,
+                'title': '',
                 'domain': domain,
-                'website': website_name,
-                'url': normalized_url,
-                'score': score
+                'website': extract_website_name_from_domain(domain) or extract_domain_name(canonical_url),
+                'score': score,
+                # Insertion order breaks score ties, matching the order results were found in
+                'order': len(self._entries),
+                'has_title': False
             }
-            logger.info(f"Stored reference info for {normalized_url} with score {score:.4f}")
-    
-    # Sort unique references by score again to ensure proper ordering
-    unique_references.sort(key=lambda x: float(x[1]), reverse=True)
-    
-    # Log unique references by score to verify sorting
-    logger.info(f"Found {len(unique_references)} unique references after deduplication")
-    logger.info("Unique references by score (sorted):")
-    for i, (url, score) in enumerate(unique_references):
-        logger.info(f"{i+1}. Score: {score:.4f} - URL: {url}")
-    
-    # Take exactly 10 unique references (or all if less than 10)
-    top_references = unique_references[:10]
-    top_reference_urls = [url for url, _ in top_references]
-    
-    # Log final top 10 references
-    logger.info(f"Final top {len(top_reference_urls)} references selected:")
-    for i, url in enumerate(top_reference_urls):
-        score = next((s for u, s in unique_references if u == url), 0)
-        logger.info(f"{i+1}. Score: {score:.4f} - URL: {url}")
-    
-    return top_reference_urls, reference_titles, reference_info
+            self._entries[canonical_url] = entry
+        elif score > entry['score']:
+            entry['score'] = score
+
+        if not entry['has_title']:
+            if title and title.strip() and title.lower() != url.lower():
+                entry['title'] = title
+                entry['has_title'] = True
+            elif not entry['title']:
+                entry['title'] = extract_title_from_url_path(canonical_url) or f"Information from {entry['website']}"
+
+        return canonical_url
+
+    def add_document(self, doc: Dict[str, Any]) -> str:
+        """Record a search result document that carries already cleaned 'url', 'title' and 'score' fields."""
+        return self.add(doc.get('url', ''), doc.get('title', ''), doc.get('score', 0.0))
+
+    def get(self, url: str) -> Dict[str, Any] | None:
+        return self._entries.get(normalize_url(url))
+
+    def top_k(self, k: int = 10, urls: Iterable[str] | None = None) -> List[Dict[str, Any]]:
+        """Return the k best scored entries, optionally restricted to the given URLs."""
+        if urls is None:
+            candidates = self._entries.values()
+        else:
+            candidates = {
+                entry['url']: entry
+                for url in urls
+                if url and (entry := self._entries.get(normalize_url(url)))
+            }.values()
+        return heapq.nlargest(k, candidates, key=lambda entry: (entry['score'], -entry['order']))
+
+    def select_references(self, urls: Iterable[str] | None = None, k: int = 10) -> Tuple[List[str], Dict[str, str], Dict[str, Dict[str, Any]]]:
+        """Return the top references in the same shape as process_references_from_search_results."""
+        top_entries = self.top_k(k, urls)
+        top_reference_urls = [entry['url'] for entry in top_entries]
+        reference_titles = {entry['url']: entry['title'] for entry in top_entries if entry['has_title']}
+        reference_info = {
+            entry['url']: {
+                'title': entry['title'] if entry['has_title'] else '',
+                'domain': entry['domain'],
+                'website': entry['website'],
+                'url': entry['url'],
+                'score': entry['score']
+            }
+            for entry in top_entries
+        }
+        return top_reference_urls, reference_titles, reference_info
+
+    def references_section(self, urls: List[str]) -> str:
+        """Render the references section for the given URLs from the indexed entries."""
+        reference_lines = ["\n## References"]
+        for url in urls:
+            entry = self.get(url) or {'url': url}
+            reference_lines.append(format_reference_for_markdown(entry))
+        if len(reference_lines) == 1:
+            return ""
+        return "\n".join(reference_lines)
 
 def format_reference_for_markdown(reference_entry: Dict[str, Any]) -> str:
     """Format a reference entry for markdown output."""
@@ -0,0 +1,103 @@
+import json
+import logging
+import re
+from typing import Dict, List
+
+from pydantic import ValidationError
+
+from ..classes.briefing import BULLET_PREFIX, BriefingSection, StructuredBriefing
+
+logger = logging.getLogger(__name__)
+
+# Report sections in their fixed order
+REPORT_SECTIONS = {
+    'company': "Company Overview",
+    'industry': "Industry Overview",
+    'financial': "Financial Overview",
+    'news': "News",
+}
+# Sections rendered as a flat bullet list, without ### subsections
+FLAT_SECTIONS = {'news'}
+
+# A markdown code fence line, with or without a language tag
+CODE_FENCE = re.compile(r"^\s*```.*$", re.MULTILINE)
+
+
+def parse_briefing(text: str) -> StructuredBriefing:
+    """Validate a JSON briefing, falling back to parsing markdown headers and bullets."""
+    text = CODE_FENCE.sub("", text or "").strip()
+    try:
+        return StructuredBriefing.model_validate(json.loads(text))
+    except (ValueError, ValidationError) as e:
+        logger.warning(f"Structured briefing failed validation, parsing as markdown: {e}")
+    return parse_markdown_briefing(text)
+
+
+def parse_markdown_briefing(text: str) -> StructuredBriefing:
+    summary: List[str] = []
+    sections: List[BriefingSection] = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("#"):
+            sections.append(BriefingSection(heading=line))
+        elif BULLET_PREFIX.match(line) or sections:
+            if not sections:
+                sections.append(BriefingSection())
+            sections[-1].bullets.append(BULLET_PREFIX.sub("", line, count=1))
+        else:
+            summary.append(line)
+    return StructuredBriefing(summary=" ".join(summary), sections=sections)
+
+
+def render_briefing(briefing: StructuredBriefing, flat: bool = False) -> str:
+    """Render a structured briefing back to the markdown the rest of the pipeline expects."""
+    blocks = [briefing.summary] if briefing.summary else []
+    for section in briefing.sections:
+        bullets = "\n".join(f"* {bullet}" for bullet in section.bullets)
+        if section.heading and not flat:
+            blocks.append(f"### {section.heading}\n\n{bullets}")
+        else:
+            blocks.append(bullets)
+    return "\n\n".join(blocks)
+
+
+def _bullet_key(bullet: str) -> str:
+    return re.sub(r"\W+", " ", bullet.lower()).strip()
+
+
+def render_report(company: str, briefings: Dict[str, StructuredBriefing], reference_text: str = "") -> str:
+    """Assemble the fixed report skeleton from structured briefings.
+
+    Bullets repeated verbatim (ignoring case and punctuation) in a later
+    section are dropped, keeping the first occurrence.
+    """
+    seen = set()
+    blocks = [f"# {company} Research Report"]
+    for category, title in REPORT_SECTIONS.items():
+        briefing = briefings.get(category)
+        if not briefing:
+            continue
+
+        sections = []
+        for section in briefing.sections:
+            bullets = []
+            for bullet in section.bullets:
+                key = _bullet_key(bullet)
+                if key and key not in seen:
+                    seen.add(key)
+                    bullets.append(bullet)
+            if bullets:
+                sections.append(BriefingSection(heading=section.heading, bullets=bullets))
+
+        body = render_briefing(
+            StructuredBriefing(summary=briefing.summary, sections=sections),
+            flat=category in FLAT_SECTIONS
+        )
+        if body:
+            blocks.append(f"## {title}\n\n{body}")
+
+    if reference_text:
+        blocks.append(reference_text.strip())
+    return "\n\n".join(blocks) + "\n"
@@ -0,0 +1,79 @@
+import time
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict
+
+
+class ChunkCoalescer:
+    """Buffers streamed text and hands it on at most once per time window.
+
+    Token-sized chunks would mean one WebSocket message per token; coalescing
+    keeps the stream smooth for clients without flooding them.
+    """
+
+    def __init__(self, flush: Callable[[str], Awaitable[None]], window: float = 0.25) -> None:
+        self._flush = flush
+        self.window = window
+        self._buffer = ""
+        self._last_flush = time.monotonic()
+        # Everything handed on so far, i.e. what clients have been shown
+        self.sent = ""
+
+    async def add(self, text: str) -> None:
+        if not text:
+            return
+        self._buffer += text
+        if time.monotonic() - self._last_flush >= self.window:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Send whatever is buffered now."""
+        if self._buffer:
+            buffer, self._buffer = self._buffer, ""
+            await self._flush(buffer)
+            self.sent += buffer
+        self._last_flush = time.monotonic()
+
+
+def status_streamer(
+    websocket_manager: Any, job_id: str | None, status: str, message: str,
+    result: Dict[str, Any], window: float = 0.25
+) -> ChunkCoalescer | None:
+    """Build a coalescer that sends text as ``status`` updates with a ``chunk`` result field.
+
+    Returns None when no client can be listening.
+    """
+    if not websocket_manager or not job_id:
+        return None
+
+    async def send_chunk(chunk: str) -> None:
+        await websocket_manager.send_status_update(
+            job_id=job_id,
+            status=status,
+            message=message,
+            result={**result, "chunk": chunk}
+        )
+
+    return ChunkCoalescer(send_chunk, window)
+
+
+async def chat_stream_text(response: Any, on_usage: Callable[[Any], None] | None = None) -> AsyncIterator[str]:
+    """Yield the text of a streamed chat completion, passing its token usage to ``on_usage``."""
+    async for chunk in response:
+        if on_usage and getattr(chunk, "usage", None):
+            on_usage(chunk.usage)
+        # The usage-only chunk at the end of a stream carries no choices
+        if not chunk.choices:
+            continue
+        if chunk_text := chunk.choices[0].delta.content:
+            yield chunk_text
+
+
+async def collect_stream(chunks: AsyncIterable[str], streamer: ChunkCoalescer | None = None) -> str:
+    """Accumulate streamed text, forwarding it to ``streamer`` as it arrives."""
+    parts = []
+    async for chunk in chunks:
+        parts.append(chunk)
+        if streamer:
+            await streamer.add(chunk)
+    if streamer:
+        await streamer.flush()
+    return "".join(parts)
@@ -0,0 +1,145 @@
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # In requirements; without it counts fall back to the calibrated estimator
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Words, numbers and individual punctuation marks; roughly what BPE tokenizers split on
+TOKEN_PIECE = re.compile(r"\w+|[^\w\s]")
+# Subword tokenizers emit ~1.3 tokens per whitespace/punctuation piece on English web text
+DEFAULT_TOKENS_PER_PIECE = 1.3
+# Piece counts remembered, keyed by a digest of the text so documents aren't kept alive
+PIECE_CACHE_SIZE = 8192
+# Texts shorter than this are cheaper to count again than to hash and look up
+PIECE_CACHE_MIN_CHARS = 256
+
+_piece_counts: "OrderedDict[bytes, int]" = OrderedDict()
+# Briefings count tokens in worker threads
+_piece_counts_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken encoding unavailable, using estimator: {e}")
+        return None
+
+
+def load_tokenizer() -> bool:
+    """Load the tokenizer now, downloading its BPE file on first use; returns whether tiktoken is available."""
+    return _encoding() is not None
+
+
+def _count(text: str) -> int:
+    if encoding := _encoding():
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(TOKEN_PIECE.findall(text))
+
+
+def count_pieces(text: str) -> int:
+    """Count base tokens for a text, cached by content digest so repeated documents are only scanned once."""
+    if len(text) < PIECE_CACHE_MIN_CHARS:
+        return _count(text)
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    with _piece_counts_lock:
+        if (count := _piece_counts.get(digest)) is not None:
+            _piece_counts.move_to_end(digest)
+            return count
+    count = _count(text)
+    with _piece_counts_lock:
+        _piece_counts[digest] = count
+        if len(_piece_counts) > PIECE_CACHE_SIZE:
+            _piece_counts.popitem(last=False)
+    return count
+
+
+class TokenEstimator:
+    """Estimates model tokens from local counts, calibrated against usage reported by the provider."""
+
+    def __init__(self, smoothing: float = 0.2) -> None:
+        self.smoothing = smoothing
+        self._ratios: Dict[str, float] = {}
+
+    def ratio(self, model: str) -> float:
+        default = 1.0 if _encoding() else DEFAULT_TOKENS_PER_PIECE
+        return self._ratios.get(model, default)
+
+    def count(self, text: str, model: str = "") -> int:
+        return int(count_pieces(text) * self.ratio(model)) + 1
+
+    def observe(self, text: str, actual_tokens: int, model: str = "") -> None:
+        """Fold a provider-reported prompt token count into the model's ratio."""
+        pieces = count_pieces(text)
+        if not pieces or not actual_tokens:
+            return
+        observed = actual_tokens / pieces
+        current = self._ratios.get(model)
+        self._ratios[model] = observed if current is None else current + self.smoothing * (observed - current)
+
+
+# Process-wide estimator so calibration carries across jobs
+token_estimator = TokenEstimator()
+
+
+def pack_by_value(items: Sequence[Tuple[float, int]], budget: int) -> List[int]:
+    """Pick item indexes maximizing total value within a token budget.
+
+    Items are ``(value, tokens)`` pairs. Greedy fill by value per token, then
+    the best single item is taken instead if it alone is worth more, which keeps
+    the result within a factor of two of the optimal knapsack.
+    """
+    order = sorted(range(len(items)), key=lambda i: items[i][0] / max(items[i][1], 1), reverse=True)
+
+    chosen = []
+    used = 0
+    for index in order:
+        value, tokens = items[index]
+        if used + tokens <= budget:
+            chosen.append(index)
+            used += tokens
+
+    fitting = [i for i in range(len(items)) if items[i][1] <= budget]
+    if fitting:
+        best_single = max(fitting, key=lambda i: items[i][0])
+        if items[best_single][0] > sum(items[i][0] for i in chosen):
+            chosen = [best_single]
+
+    return sorted(chosen)
+
+
+def pack_documents(entries: Sequence[Tuple[float, str]], budget: int, separator: str = "", model: str = "") -> Tuple[List[str], Dict[str, Any]]:
+    """Pack scored text entries into a token budget, preserving their original order.
+
+    Returns the selected texts and packing statistics for telemetry.
+    """
+    separator_tokens = token_estimator.count(separator, model) if separator else 0
+    token_counts = [token_estimator.count(text, model) + separator_tokens for _, text in entries]
+    # A zero score would never be picked over nothing; keep a small floor so spare budget is used
+    items = [(max(float(score), 0.01), tokens) for (score, _), tokens in zip(entries, token_counts)]
+
+    chosen = pack_by_value(items, budget)
+    used = sum(token_counts[i] for i in chosen)
+    stats = {
+        "budget_tokens": budget,
+        "packed_tokens": used,
+        "available_tokens": sum(token_counts),
+        "utilization": round(used / budget, 3) if budget else 0,
+        "docs_available": len(entries),
+        "docs_packed": len(chosen),
+        "docs_dropped": len(entries) - len(chosen),
+        "tokenizer": "tiktoken" if _encoding() else "estimator",
+    }
+    return [entries[i][1] for i in chosen], stats
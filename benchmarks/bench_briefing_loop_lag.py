@@ -0,0 +1,91 @@
+"""Regression check: briefing generation must not block the event loop.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_briefing_loop_lag
+
+Runs Briefing.create_briefings for four categories against a stand-in Gemini
+model that takes ``--latency`` seconds per call, while sampling event loop lag.
+Exits non-zero if the worst lag exceeds ``--max-lag-ms``; a synchronous Gemini
+call would stall the loop for the full model latency. The test suite runs the
+same check on a single category in tests/test_briefing.py.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-key")
+
+from backend.nodes.briefing import Briefing
+from benchmarks.loop_lag import LoopLagMonitor
+
+
+class SlowGeminiModel:
+    """Stand-in for genai.GenerativeModel with a fixed response latency."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    def generate_content(self, prompt, **kwargs):
+        raise AssertionError("Briefing called the blocking Gemini API")
+
+    async def generate_content_async(self, prompt, **kwargs):
+        await asyncio.sleep(self.latency)
+        return SimpleNamespace(
+            text="### Summary\n* A verified fact",
+            usage_metadata=SimpleNamespace(prompt_token_count=len(prompt) // 4)
+        )
+
+
+def build_state(docs_per_category: int) -> dict:
+    state = {"company": "Acme", "industry": "Logistics", "hq_location": "Berlin"}
+    paragraph = "Acme raised $20 million in a Series B round led by Sequoia to expand its platform. " * 150
+    for field in ['financial_data', 'news_data', 'industry_data', 'company_data']:
+        state[f'curated_{field}'] = {
+            f"https://example{i}.com/{field}": {
+                'title': f"Document {i}",
+                'raw_content': paragraph,
+                'evaluation': {'overall_score': 1 - i / docs_per_category}
+            }
+            for i in range(docs_per_category)
+        }
+    return state
+
+
+async def run(latency: float, docs_per_category: int) -> dict:
+    briefing = Briefing()
+    model = SlowGeminiModel(latency)
+    # Every routed model name gets the same simulated model
+    briefing._gemini_model = lambda name: model
+    state = build_state(docs_per_category)
+
+    async with LoopLagMonitor() as monitor:
+        await briefing.create_briefings(state)
+
+    return {
+        "benchmark": "briefing_loop_lag",
+        "model_latency_s": latency,
+        "docs_per_category": docs_per_category,
+        "briefings": len(state['briefings']),
+        "loop_lag": monitor.stats()
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--latency', type=float, default=1.0)
+    parser.add_argument('--docs', type=int, default=10)
+    parser.add_argument('--max-lag-ms', type=float, default=100.0)
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.latency, args.docs))
+    print(json.dumps(result, indent=2))
+    return 0 if result["loop_lag"]["max_ms"] <= args.max_lag_ms else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
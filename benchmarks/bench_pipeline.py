@@ -0,0 +1,323 @@
+"""End-to-end benchmark of the research pipeline against deterministic fake providers.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_pipeline --output results.json
+    python -m benchmarks.bench_pipeline --scenario concurrent_50 --baseline results.json
+
+Each scenario starts a batch of jobs at once through ``Graph.run`` (or
+``application.run_research_process`` with ``--entry application``) while
+OpenAI, Gemini and Tavily are served by ``benchmarks.fake_providers`` with a
+fixed seed. It reports end-to-end latency percentiles, per-node wall time,
+event loop lag, peak RSS and external call counts as JSON, so runs on
+different commits can be compared with ``--baseline``.
+
+Several scenarios run one after another, each in its own process so peak RSS,
+warmed caches and provider health don't carry over. The LLM and briefing disk
+caches are disabled so every job reaches the fakes. The fake providers share
+the event loop with the jobs unless ``--providers-url`` points at a
+standalone ``python -m benchmarks.fake_providers``.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List
+
+import httpx
+
+from benchmarks.fake_providers import FakeConfig, ProviderProfile, configure, create_app, provider_env, serve
+from benchmarks.loop_lag import LoopLagMonitor
+
+# Every job should reach the fake providers rather than a cache
+BENCHMARK_ENV = {
+    "OPENAI_API_KEY": "benchmark-key",
+    "TAVILY_API_KEY": "benchmark-key",
+    "GEMINI_API_KEY": "benchmark-key",
+    "LLM_CACHE_ENABLED": "false",
+    "CACHE_ENABLED": "false",
+}
+# Metrics shown when comparing against a baseline, as paths into a scenario result
+COMPARED_METRICS = (
+    ("latency_s", "p50"), ("latency_s", "p95"), ("latency_s", "p99"),
+    ("throughput_jobs_per_s",), ("loop_lag", "p99_ms"), ("peak_rss_mb",),
+)
+LARGE_DOCUMENT = ("Acme raised $20 million in a Series B round led by Sequoia to expand its platform "
+                  "across Europe and serves more than 400 shippers. ") * 400
+
+
+@dataclass
+class Scenario:
+    description: str
+    jobs: int
+    profiles: Dict[str, ProviderProfile] = field(default_factory=dict)
+    content: Dict[str, str] = field(default_factory=dict)
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "single": Scenario("One job with default provider latencies", jobs=1),
+    "concurrent_10": Scenario("10 jobs started together", jobs=10),
+    "concurrent_50": Scenario("50 jobs started together", jobs=50),
+    "concurrent_200": Scenario("200 jobs started together", jobs=200),
+    "large_docs": Scenario(
+        "10 jobs whose searches and extractions return ~50KB documents",
+        jobs=10,
+        content={"tavily": LARGE_DOCUMENT},
+    ),
+    "slow_providers": Scenario(
+        "10 jobs against slow, rate-limited providers",
+        jobs=10,
+        profiles={
+            "openai": ProviderProfile(latency_p50_ms=2000, latency_p99_ms=8000, tokens_per_second=30, rate_limit_rate=0.05),
+            "gemini": ProviderProfile(latency_p50_ms=3000, latency_p99_ms=10000, tokens_per_second=50, rate_limit_rate=0.05),
+            "tavily": ProviderProfile(latency_p50_ms=1500, latency_p99_ms=6000),
+        },
+    ),
+}
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0, "mean": 0.0}
+    ordered = sorted(values)
+
+    def at(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))], 3)
+
+    return {"p50": round(statistics.median(ordered), 3), "p95": at(0.95), "p99": at(0.99),
+            "max": round(ordered[-1], 3), "mean": round(statistics.fmean(ordered), 3)}
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def git_revision() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain"], capture_output=True, text=True).stdout.strip())
+        return {"commit": commit, "dirty": dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+
+@asynccontextmanager
+async def providers(scenario: Scenario, seed: int, providers_url: str | None) -> AsyncIterator[Any]:
+    """Serve the scenario's fake providers and yield a function returning their request counts."""
+    config = FakeConfig(profiles=dict(scenario.profiles), content=dict(scenario.content), seed=seed)
+    if providers_url:
+        async with httpx.AsyncClient(base_url=providers_url) as client:
+            payload = {"profiles": {name: asdict(profile) for name, profile in config.profiles.items()},
+                       "content": config.content, "seed": seed}
+            (await client.put("/fake/config", json=payload)).raise_for_status()
+
+            async def remote_stats() -> Dict[str, Any]:
+                return (await client.get("/fake/stats")).json()
+
+            os.environ.update(provider_env(providers_url))
+            yield remote_stats
+        return
+
+    app = create_app()
+    configure(app, config)
+    async with serve(app) as base_url:
+        async def local_stats() -> Dict[str, Any]:
+            return app.state.stats
+
+        os.environ.update(provider_env(base_url))
+        yield local_stats
+
+
+async def run_job(entry: str, index: int, websocket_manager: Any) -> Dict[str, Any]:
+    """Run one job to completion and return its status and timings."""
+    from backend.services.telemetry import telemetry
+    from backend.services.usage import usage
+
+    job_id = str(uuid.uuid4())
+    company = f"Company{index:03d}"
+    inputs = {
+        "company": company,
+        "hq_location": "Berlin",
+        "industry": "Logistics",
+        "help_description": "We help logistics teams cut routing costs.",
+    }
+    start = time.perf_counter()
+    error = None
+    if entry == "application":
+        import application
+
+        await application.run_research_process(job_id, company_url=f"https://{company.lower()}.example.com", **inputs)
+        status = application.job_status[job_id]
+        error = status.get("error") if status.get("status") != "completed" else None
+    else:
+        from backend.graph import get_graph
+
+        try:
+            async for _ in get_graph().run(url=f"https://{company.lower()}.example.com",
+                                           websocket_manager=websocket_manager, job_id=job_id, **inputs):
+                pass
+        except Exception as e:
+            error = str(e)
+    seconds = time.perf_counter() - start
+
+    node_seconds: Dict[str, float] = {}
+    for timing in telemetry.get(job_id).get("node_timing", []):
+        node_seconds[timing["node"]] = node_seconds.get(timing["node"], 0.0) + timing["seconds"]
+    return {"seconds": seconds, "error": error, "nodes": node_seconds, "usage": usage.get(job_id)}
+
+
+async def run_scenario(name: str, entry: str, seed: int, providers_url: str | None) -> Dict[str, Any]:
+    scenario = SCENARIOS[name]
+    os.environ.update(BENCHMARK_ENV)
+
+    async with providers(scenario, seed, providers_url) as provider_stats:
+        # Imported once the provider endpoints are configured; clients read them on creation
+        if entry == "application":
+            level = logging.getLogger().level
+            import application  # noqa: F401
+            # The API configures logging on import
+            logging.getLogger().setLevel(level)
+        from backend.graph import get_graph
+        from backend.services.clients import clients
+        from backend.services.websocket_manager import WebSocketManager
+
+        get_graph()
+        websocket_manager = WebSocketManager()
+        baseline_rss = peak_rss_mb()
+
+        start = time.perf_counter()
+        async with LoopLagMonitor() as monitor:
+            jobs = await asyncio.gather(*(run_job(entry, i, websocket_manager) for i in range(scenario.jobs)))
+        wall = time.perf_counter() - start
+        served = await provider_stats()
+        await clients.close()
+
+    node_samples: Dict[str, List[float]] = {}
+    external: Dict[str, Dict[str, float]] = {}
+    for job in jobs:
+        for node, seconds in job["nodes"].items():
+            node_samples.setdefault(node, []).append(seconds)
+        for provider, totals in job["usage"]["by_provider"].items():
+            provider_totals = external.setdefault(provider, {})
+            for metric in ("calls", "errors", "input_tokens", "output_tokens", "credits", "cost_usd"):
+                provider_totals[metric] = round(provider_totals.get(metric, 0) + totals[metric], 6)
+
+    errors = [job["error"] for job in jobs if job["error"]]
+    return {
+        "scenario": name,
+        "description": scenario.description,
+        "entry": entry,
+        "jobs": scenario.jobs,
+        "failed_jobs": len(errors),
+        "errors": sorted(set(errors))[:5],
+        "wall_s": round(wall, 3),
+        "throughput_jobs_per_s": round(scenario.jobs / wall, 3) if wall else 0.0,
+        "latency_s": percentiles([job["seconds"] for job in jobs]),
+        "node_s": {node: percentiles(samples) for node, samples in sorted(node_samples.items())},
+        "loop_lag": monitor.stats(),
+        "baseline_rss_mb": baseline_rss,
+        "peak_rss_mb": peak_rss_mb(),
+        "external_calls": external,
+        "provider_requests": served,
+        "profiles": {provider: asdict(profile) for provider, profile in scenario.profiles.items()},
+    }
+
+
+def run_isolated(name: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Run one scenario in a fresh interpreter and return its result."""
+    with tempfile.NamedTemporaryFile(suffix=".json") as output:
+        command = [sys.executable, "-m", "benchmarks.bench_pipeline", "--scenario", name, "--entry", args.entry,
+                   "--seed", str(args.seed), "--log-level", args.log_level, "--output", output.name]
+        if args.providers_url:
+            command += ["--providers-url", args.providers_url]
+        # Results come back through the file; nodes may print to stdout
+        completed = subprocess.run(command, stdout=subprocess.DEVNULL)
+        try:
+            return json.load(output)["scenarios"][0]
+        except ValueError:
+            return {"scenario": name, "failed": True, "returncode": completed.returncode}
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Relative change of the headline metrics per scenario present in both runs."""
+    previous = {scenario["scenario"]: scenario for scenario in baseline.get("scenarios", [])}
+    changes: Dict[str, Dict[str, Any]] = {}
+    for scenario in current["scenarios"]:
+        if scenario.get("failed") or scenario["scenario"] not in previous:
+            continue
+        rows = {}
+        for path in COMPARED_METRICS:
+            before, after = previous[scenario["scenario"]], scenario
+            for key in path:
+                before, after = (before or {}).get(key), (after or {}).get(key)
+            if isinstance(before, (int, float)) and isinstance(after, (int, float)):
+                rows[".".join(path)] = {
+                    "baseline": before,
+                    "current": after,
+                    "change_pct": round((after - before) / before * 100, 1) if before else None,
+                }
+        changes[scenario["scenario"]] = rows
+    return changes
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenario', choices=SCENARIOS, action='append',
+                        help="Scenario to run (repeatable); defaults to all")
+    parser.add_argument('--entry', choices=('graph', 'application'), default='graph',
+                        help="Drive Graph.run directly or application.run_research_process")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--providers-url', help="Use a standalone fake providers server instead of an in-process one")
+    parser.add_argument('--output', help="Also write the JSON results to this file")
+    parser.add_argument('--baseline', help="Results file from an earlier run to compare against")
+    parser.add_argument('--log-level', default='ERROR')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level)
+    logging.getLogger().setLevel(args.log_level)
+
+    names = args.scenario or list(SCENARIOS)
+    if len(names) == 1:
+        scenarios = [asyncio.run(run_scenario(names[0], args.entry, args.seed, args.providers_url))]
+    else:
+        scenarios = [run_isolated(name, args) for name in names]
+
+    result: Dict[str, Any] = {
+        "benchmark": "pipeline",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "scenarios": scenarios,
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            result["comparison"] = compare(json.load(f), result)
+
+    output = json.dumps(result, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    return 1 if any(scenario.get("failed") or scenario.get("failed_jobs") for scenario in scenarios) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
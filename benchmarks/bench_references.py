@@ -0,0 +1,77 @@
+"""Micro-benchmark for reference selection over large curated document sets.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_references
+
+Prints the time spent in ``process_references_from_search_results`` per
+curated document. The per-document cost should stay flat as the curated set
+grows; the command exits non-zero if it grows more than ``--max-growth`` times
+between the smallest and largest run.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+
+from backend.utils.references import process_references_from_search_results
+
+CATEGORIES = ['curated_company_data', 'curated_industry_data', 'curated_financial_data', 'curated_news_data']
+
+
+def build_state(doc_count: int, seed: int = 0) -> dict:
+    """Build a state with ``doc_count`` curated documents spread over all categories."""
+    rng = random.Random(seed)
+    state = {category: {} for category in CATEGORIES}
+    for i in range(doc_count):
+        # Roughly one in five URLs is repeated across categories with a query string
+        site = rng.randint(0, doc_count // 5 or 1)
+        url = f"https://www.site{site}.com/articles/{i % 7}-company-news"
+        if rng.random() < 0.2:
+            url += "?utm_source=search"
+        state[rng.choice(CATEGORIES)][url] = {
+            'url': url,
+            'title': f"2024-05-01 Article {i} about the company",
+            'content': "Lorem ipsum",
+            'evaluation': {'overall_score': rng.random()}
+        }
+    return state
+
+
+def time_run(state: dict, repeat: int) -> float:
+    """Return the best wall time in seconds over ``repeat`` runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        process_references_from_search_results(state)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[250, 1000, 4000, 16000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--max-growth', type=float, default=3.0)
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        state = build_state(size)
+        doc_count = sum(len(docs) for docs in state.values())
+        seconds = time_run(state, args.repeat)
+        results.append({
+            'docs': doc_count,
+            'seconds': round(seconds, 6),
+            'us_per_doc': round(seconds / doc_count * 1e6, 3)
+        })
+
+    growth = results[-1]['us_per_doc'] / max(results[0]['us_per_doc'], 1e-9)
+    print(json.dumps({'benchmark': 'references', 'results': results, 'per_doc_growth': round(growth, 2)}, indent=2))
+    return 0 if growth <= args.max_growth else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,444 @@
+"""Local fake OpenAI, Gemini and Tavily servers for offline load and latency testing.
+
+Run from the repository root:
+
+    python -m benchmarks.fake_providers --port 8900 --latency-p50-ms 400 --latency-p99-ms 3000
+
+and point the backend at it:
+
+    OPENAI_BASE_URL=http://127.0.0.1:8900/v1
+    TAVILY_BASE_URL=http://127.0.0.1:8900
+    GEMINI_BASE_URL=http://127.0.0.1:8900
+
+One app serves the endpoints the pipeline calls, with canned content shaped so
+every node has something to work with: OpenAI chat completions (streamed with
+a usage chunk or not), Gemini generateContent and streamGenerateContent, and
+Tavily search and extract. Each provider has its own profile: time to first
+byte drawn from a lognormal distribution fitted to a p50 and p99, a token
+streaming rate, and the share of requests that fail with a 500 or a 429.
+Counts of what was served are at ``GET /fake/stats``.
+
+Benchmarks can run the server inside their own process with ``serve()`` and
+swap profiles between runs with ``configure()``, or reconfigure a standalone
+server with ``PUT /fake/config``. Set ``LLM_CACHE_ENABLED=false`` when load
+testing so deterministic calls keep reaching the fakes instead of the LLM
+cache.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field, replace
+from typing import Any, AsyncIterator, Dict, List
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+PROVIDERS = ("openai", "gemini", "tavily")
+# z-score of the 99th percentile of a standard normal distribution
+Z_99 = 2.326
+# Streamed text is flushed at most this often, however fast the token rate
+MIN_CHUNK_INTERVAL = 0.02
+
+ERROR_STATUS = {
+    429: ("rate_limit_exceeded", "RESOURCE_EXHAUSTED", "Rate limit reached, please retry after a short wait."),
+    500: ("server_error", "INTERNAL", "The server had an error while processing your request."),
+}
+QUERY_TOPICS = {
+    "financial": ["funding rounds", "revenue growth", "investors", "valuation"],
+    "news": ["latest announcements", "partnerships", "product launches", "press coverage"],
+    "industry": ["market position", "competitors", "industry trends", "market size"],
+    "company": ["products and services", "leadership team", "customers", "business model"],
+}
+
+
+@dataclass
+class ProviderProfile:
+    """How one fake provider behaves."""
+    latency_p50_ms: float = 300.0
+    latency_p99_ms: float = 1500.0
+    tokens_per_second: float = 80.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+
+    def first_byte_delay(self, rng: random.Random) -> float:
+        """Seconds before the response starts, from a lognormal fitted to the p50 and p99."""
+        p50 = max(self.latency_p50_ms, 0.0) / 1000
+        if p50 <= 0:
+            return 0.0
+        sigma = math.log(max(self.latency_p99_ms / max(self.latency_p50_ms, 1e-9), 1.0)) / Z_99
+        return rng.lognormvariate(math.log(p50), sigma)
+
+
+@dataclass
+class FakeConfig:
+    """Profiles per provider, plus canned text that replaces the generated content.
+
+    ``content`` may hold ``openai``, ``gemini`` and ``tavily`` entries; a
+    provider without one gets content generated from the request.
+    """
+    profiles: Dict[str, ProviderProfile] = field(default_factory=lambda: {
+        "openai": ProviderProfile(),
+        "gemini": ProviderProfile(latency_p50_ms=500, latency_p99_ms=2500, tokens_per_second=150),
+        "tavily": ProviderProfile(latency_p50_ms=400, latency_p99_ms=1500),
+    })
+    content: Dict[str, str] = field(default_factory=dict)
+    seed: int | None = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FakeConfig":
+        config = cls(content=data.get("content") or {}, seed=data.get("seed"))
+        for provider, profile in (data.get("profiles") or {}).items():
+            config.profiles[provider] = ProviderProfile(**profile)
+        return config
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")[:40] or "result"
+
+
+def _tokens(text: str) -> List[str]:
+    """Split text into word-sized pieces that join back to the original."""
+    return re.findall(r"\s*\S+\s*", text) or [text]
+
+
+def _count_tokens(text: str) -> int:
+    return max(len(text) // 4, 1)
+
+
+def _company(text: str) -> str:
+    match = re.search(r"researching ([^,\n]+?), a company", text) or re.search(r"\b(?:about|for) ([A-Z][\w&-]*)", text)
+    return match.group(1) if match else "Acme"
+
+
+def report(company: str) -> str:
+    return f"""# {company} Research Report
+
+## Company Overview
+* {company} builds a logistics platform for mid-sized shippers.
+* The company was founded in 2015 and is headquartered in Berlin.
+
+## Industry Overview
+* {company} competes with Flexport and project44 in freight visibility.
+* The freight software market is growing roughly 10% a year.
+
+## Financial Overview
+* {company} raised $20 million in a Series B round led by Sequoia.
+* Annual revenue is estimated at $35 million.
+
+## News
+* {company} announced a partnership with DHL in March.
+* {company} launched an AI routing product this year.
+"""
+
+
+def briefing(company: str) -> str:
+    return f"""### Key Facts
+* {company} raised $20 million in a Series B round led by Sequoia.
+* {company} serves more than 400 shippers across Europe.
+* {company} announced a partnership with DHL in March.
+
+### Outlook
+* {company} plans to expand into North America next year.
+"""
+
+
+def structured_briefing(company: str) -> str:
+    return json.dumps({
+        "summary": f"{company} is a growing logistics software company.",
+        "sections": [
+            {"heading": "Key Facts", "bullets": [
+                f"{company} raised $20 million in a Series B round led by Sequoia.",
+                f"{company} serves more than 400 shippers across Europe.",
+            ]},
+            {"heading": "Outlook", "bullets": [f"{company} plans to expand into North America next year."]},
+        ]
+    })
+
+
+def chat_content(messages: List[Dict[str, Any]]) -> str:
+    """Canned reply shaped for whichever node sent ``messages``."""
+    text = "\n".join(str(message.get("content", "")) for message in messages)
+    company = _company(text)
+    system = next((str(m.get("content", "")) for m in messages if m.get("role") == "system"), "")
+    if "You are researching" in system:
+        topics = next((topics for name, topics in QUERY_TOPICS.items() if name in text.lower()), QUERY_TOPICS["company"])
+        return "\n".join(f"{company} {topic}" for topic in topics)
+    if "outreach" in system:
+        return (f"Subject: A faster way to grow {company}\n\nHi there,\n\nCongratulations on the Series B. "
+                f"We help logistics teams like {company}'s cut routing costs by 15%.\n\n"
+                f"Would you be open to a 20 minute call next week?\n\nBest,\nAlex")
+    if "proposal" in system:
+        return (f"# Partnership Proposal for {company}\n\n## Goals\n* Reduce routing costs by 15%\n\n"
+                f"## Approach\n* Pilot with two regional teams\n\n## Next Steps\n* Schedule a scoping call\n")
+    return report(company)
+
+
+def search_results(query: str, max_results: int, include_raw_content: bool) -> List[Dict[str, Any]]:
+    slug = _slug(query)
+    results = []
+    for i in range(max_results):
+        content = (f"Coverage of {query}. The company raised $20 million in a Series B round led by Sequoia "
+                   f"and serves more than 400 shippers across Europe. ") * 3
+        results.append({
+            "url": f"https://{slug}.example.com/article-{i}",
+            "title": f"{query.title()} - Article {i + 1}",
+            "content": content[:500],
+            "score": round(0.95 - i * 0.1, 2),
+            "raw_content": content * 10 if include_raw_content else None,
+        })
+    return results
+
+
+def error_response(provider: str, status: int) -> JSONResponse:
+    code, google_status, message = ERROR_STATUS[status]
+    headers = {"retry-after": "1"} if status == 429 else {}
+    if provider == "gemini":
+        body = {"error": {"code": status, "message": message, "status": google_status}}
+    elif provider == "openai":
+        body = {"error": {"message": message, "type": code, "code": code}}
+    else:
+        body = {"detail": {"error": message}}
+    return JSONResponse(body, status_code=status, headers=headers)
+
+
+def configure(app: FastAPI, config: FakeConfig) -> None:
+    """Apply ``config`` to a fake providers app and reset its random stream and counts.
+
+    Every provider missing from ``config.profiles`` gets the default profile.
+    """
+    app.state.config = config
+    app.state.profiles = {**FakeConfig().profiles, **config.profiles}
+    app.state.rng = random.Random(config.seed)
+    app.state.stats = {
+        provider: dict.fromkeys(("requests", "errors", "rate_limited", "output_tokens"), 0) for provider in PROVIDERS
+    }
+
+
+def create_app(config: FakeConfig | None = None) -> FastAPI:
+    """Build the fake providers app."""
+    app = FastAPI(title="Fake providers")
+    configure(app, config or FakeConfig())
+    state = app.state
+
+    async def admit(provider: str) -> JSONResponse | None:
+        """Count the request, wait out its latency and return an injected error, if any."""
+        profile, stats = state.profiles[provider], state.stats
+        stats[provider]["requests"] += 1
+        await asyncio.sleep(profile.first_byte_delay(state.rng))
+        roll = state.rng.random()
+        if roll < profile.rate_limit_rate:
+            stats[provider]["rate_limited"] += 1
+            return error_response(provider, 429)
+        if roll < profile.rate_limit_rate + profile.error_rate:
+            stats[provider]["errors"] += 1
+            return error_response(provider, 500)
+        return None
+
+    async def paced(provider: str, text: str) -> AsyncIterator[str]:
+        """Yield ``text`` at the provider's token rate, a few tokens per chunk."""
+        rate = max(state.profiles[provider].tokens_per_second, 1e-3)
+        per_chunk = max(int(rate * MIN_CHUNK_INTERVAL), 1)
+        pieces = _tokens(text)
+        for start in range(0, len(pieces), per_chunk):
+            chunk = pieces[start:start + per_chunk]
+            state.stats[provider]["output_tokens"] += len(chunk)
+            yield "".join(chunk)
+            await asyncio.sleep(len(chunk) / rate)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        if error := await admit("openai"):
+            return error
+        messages = body.get("messages", [])
+        model = body.get("model", "gpt-4.1-mini")
+        text = state.config.content.get("openai") or chat_content(messages)
+        prompt_tokens = sum(_count_tokens(str(message.get("content", ""))) for message in messages)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": _count_tokens(text),
+                 "total_tokens": prompt_tokens + _count_tokens(text)}
+
+        if not body.get("stream"):
+            async for _ in paced("openai", text):
+                pass
+            return {
+                "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": usage,
+            }
+
+        def event(choices: List[Dict[str, Any]], **extra: Any) -> str:
+            chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                     "model": model, "choices": choices, **extra}
+            return f"data: {json.dumps(chunk)}\n\n"
+
+        async def events() -> AsyncIterator[str]:
+            yield event([{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}])
+            async for piece in paced("openai", text):
+                yield event([{"index": 0, "delta": {"content": piece}, "finish_reason": None}])
+            yield event([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+            if (body.get("stream_options") or {}).get("include_usage"):
+                yield event([], usage=usage)
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.post("/v1beta/models/{model}:generateContent")
+    async def generate_content(model: str, request: Request):
+        return await gemini(model, request, stream=False)
+
+    @app.post("/v1beta/models/{model}:streamGenerateContent")
+    async def stream_generate_content(model: str, request: Request):
+        return await gemini(model, request, stream=True)
+
+    async def gemini(model: str, request: Request, stream: bool):
+        body = await request.json()
+        if error := await admit("gemini"):
+            return error
+        prompt = "".join(part.get("text", "") for content in body.get("contents", []) for part in content.get("parts", []))
+        structured = (body.get("generationConfig") or {}).get("responseMimeType") == "application/json"
+        company = _company(prompt)
+        text = state.config.content.get("gemini") or (structured_briefing(company) if structured else briefing(company))
+        usage = {"promptTokenCount": _count_tokens(prompt), "candidatesTokenCount": _count_tokens(text),
+                 "totalTokenCount": _count_tokens(prompt) + _count_tokens(text)}
+
+        def candidate(piece: str, finished: bool) -> Dict[str, Any]:
+            result = {"content": {"role": "model", "parts": [{"text": piece}]}, "index": 0}
+            return {**result, "finishReason": "STOP"} if finished else result
+
+        if not stream:
+            async for _ in paced("gemini", text):
+                pass
+            return {"candidates": [candidate(text, True)], "usageMetadata": usage, "modelVersion": model}
+
+        async def events() -> AsyncIterator[str]:
+            async for piece in paced("gemini", text):
+                yield f"data: {json.dumps({'candidates': [candidate(piece, False)], 'modelVersion': model})}\n\n"
+            final = {"candidates": [candidate("", True)], "usageMetadata": usage, "modelVersion": model}
+            yield f"data: {json.dumps(final)}\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.post("/search")
+    async def search(request: Request):
+        body = await request.json()
+        if error := await admit("tavily"):
+            return error
+        query = body.get("query", "")
+        results = search_results(query, int(body.get("max_results") or 5), bool(body.get("include_raw_content")))
+        if canned := state.config.content.get("tavily"):
+            for result in results:
+                result["content"] = canned[:500]
+                result["raw_content"] = canned if result["raw_content"] else None
+        return {"query": query, "answer": None, "images": [], "results": results, "response_time": 0.1}
+
+    @app.post("/extract")
+    async def extract(request: Request):
+        body = await request.json()
+        if error := await admit("tavily"):
+            return error
+        urls = body.get("urls") or []
+        urls = [urls] if isinstance(urls, str) else urls
+        results = [
+            {"url": url, "raw_content": state.config.content.get("tavily") or f"# {url}\n\n{report('Acme')}"}
+            for url in urls
+        ]
+        return {"results": results, "failed_results": [], "response_time": 0.1}
+
+    @app.get("/fake/stats")
+    async def fake_stats():
+        return state.stats
+
+    @app.put("/fake/config")
+    async def fake_config(request: Request):
+        configure(app, FakeConfig.from_dict(await request.json()))
+        return {"profiles": {provider: vars(profile) for provider, profile in state.profiles.items()}}
+
+    return app
+
+
+def provider_env(base_url: str) -> Dict[str, str]:
+    """Environment variables that point the backend's clients at fake providers served from ``base_url``."""
+    return {
+        "OPENAI_BASE_URL": f"{base_url}/v1",
+        "TAVILY_BASE_URL": base_url,
+        "GEMINI_BASE_URL": base_url,
+    }
+
+
+@asynccontextmanager
+async def serve(app: FastAPI, host: str = "127.0.0.1", port: int = 0) -> AsyncIterator[str]:
+    """Run a fake providers app on this event loop and yield its base URL.
+
+    The server shares the loop with the code under test; run it as its own
+    process for latency numbers that don't include its overhead.
+    """
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            await task
+            raise RuntimeError("Fake providers failed to start")
+        await asyncio.sleep(0.01)
+    bound_port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f"http://{host}:{bound_port}"
+    finally:
+        server.should_exit = True
+        await task
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--provider', choices=PROVIDERS, action='append',
+                        help="Apply the profile options to this provider only (repeatable); defaults to all")
+    parser.add_argument('--latency-p50-ms', type=float)
+    parser.add_argument('--latency-p99-ms', type=float)
+    parser.add_argument('--tokens-per-second', type=float)
+    parser.add_argument('--error-rate', type=float, help="Share of requests answered with a 500")
+    parser.add_argument('--rate-limit-rate', type=float, help="Share of requests answered with a 429")
+    parser.add_argument('--content', help="JSON file of canned text keyed by openai, gemini and tavily")
+    parser.add_argument('--seed', type=int)
+    return parser.parse_args()
+
+
+def config_from_args(args: argparse.Namespace) -> FakeConfig:
+    config = FakeConfig(seed=args.seed)
+    overrides = {
+        name: value for name, value in {
+            "latency_p50_ms": args.latency_p50_ms,
+            "latency_p99_ms": args.latency_p99_ms,
+            "tokens_per_second": args.tokens_per_second,
+            "error_rate": args.error_rate,
+            "rate_limit_rate": args.rate_limit_rate,
+        }.items() if value is not None
+    }
+    for provider in args.provider or PROVIDERS:
+        config.profiles[provider] = replace(config.profiles[provider], **overrides)
+    if args.content:
+        with open(args.content) as f:
+            config.content = json.load(f)
+    return config
+
+
+def main() -> None:
+    args = parse_args()
+    base_url = f"http://{args.host}:{args.port}"
+    for name, value in provider_env(base_url).items():
+        print(f"{name}={value}")
+    uvicorn.run(create_app(config_from_args(args)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Event loop lag sampling shared by the benchmarks."""
+
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes a periodic timer while work runs.
+
+    Use as an async context manager around the code under test; any blocking
+    call on the loop shows up as lag in the samples.
+    """
+
+    def __init__(self, interval: float = 0.01) -> None:
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _sample(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(time.perf_counter() - start - self.interval, 0.0))
+
+    async def __aenter__(self) -> "LoopLagMonitor":
+        self._task = asyncio.create_task(self._sample())
+        # Let the first sample start, or work that blocks before its first await goes unmeasured
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    def stats(self) -> Dict[str, float]:
+        """Lag statistics in milliseconds."""
+        if not self.samples:
+            return {"samples": 0, "max_ms": 0.0, "p50_ms": 0.0, "p99_ms": 0.0}
+        ordered = sorted(self.samples)
+        return {
+            "samples": len(ordered),
+            "max_ms": round(ordered[-1] * 1000, 2),
+            "p50_ms": round(statistics.median(ordered) * 1000, 2),
+            "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 2),
+        }
@@ -0,0 +1,156 @@
+import asyncio
+import gc
+from types import SimpleNamespace
+
+import pytest
+
+from backend.nodes import briefing as briefing_module
+from backend.nodes.briefing import Briefing
+from backend.services.cache import DiskCache
+from benchmarks.loop_lag import LoopLagMonitor
+
+# Worst event loop stall tolerated while a briefing compresses, packs and waits on Gemini
+MAX_LOOP_LAG_MS = 100
+
+
+class FakeGemini:
+    """Answers map prompts with one fact per document and the reduce prompt with a briefing."""
+
+    def __init__(self, fail_on: str | None = None, latency: float = 0) -> None:
+        self.fail_on = fail_on
+        self.latency = latency
+        self.prompts = []
+
+    def generate_content(self, prompt, **kwargs):
+        raise AssertionError("Briefing called the blocking Gemini API")
+
+    async def generate_content_async(self, prompt, stream=False, **kwargs):
+        self.prompts.append(prompt)
+        await asyncio.sleep(self.latency)
+        if self.fail_on and self.fail_on in prompt:
+            raise RuntimeError("map chunk failed")
+        if "list every relevant, verifiable fact" in prompt:
+            text = "\n".join(f"* Fact from {line[len('Title: '):]}" for line in prompt.splitlines() if line.startswith("Title: "))
+        else:
+            text = "### Funding & Investment\n* Acme raised $10M in 2024."
+        return SimpleNamespace(text=text, usage_metadata=SimpleNamespace(prompt_token_count=0))
+
+
+@pytest.fixture
+def make_briefing(monkeypatch, tmp_path):
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    monkeypatch.setattr(briefing_module, "cache", DiskCache(str(tmp_path)))
+
+    def make(model: FakeGemini, **settings) -> Briefing:
+        node = Briefing()
+        node._gemini_model = lambda name: model
+        for name, value in settings.items():
+            setattr(node, name, value)
+        return node
+    return make
+
+
+@pytest.fixture
+def frozen_heap():
+    # A full collection over everything pytest and the SDKs imported can pause the loop for 100ms+;
+    # that depends on the process, not on the code under test
+    gc.collect()
+    gc.freeze()
+    yield
+    gc.unfreeze()
+
+
+def documents(count: int, words: int = 300) -> dict:
+    return {
+        f"https://example.com/{i}": {
+            "title": f"Doc {i}",
+            "content": " ".join(f"word{i}" for _ in range(words)),
+            "evaluation": {"overall_score": 1 - i / 100},
+        }
+        for i in range(count)
+    }
+
+
+def test_partial_map_reduce_briefing_is_not_cached(make_briefing, tmp_path):
+    context = {"company": "Acme", "industry": "Software"}
+    docs = documents(4)
+    failing = FakeGemini(fail_on="Title: Doc 1\n")
+    node = make_briefing(failing, mode="map_reduce", map_chunk_tokens=600)
+
+    result = asyncio.run(node.generate_category_briefing(docs, "financial", context))
+
+    assert result["content"]
+    assert not list(tmp_path.rglob("*.json"))
+
+    # A complete run over the same documents is cached and served on the next call
+    healthy = FakeGemini()
+    node = make_briefing(healthy, mode="map_reduce", map_chunk_tokens=600)
+    asyncio.run(node.generate_category_briefing(docs, "financial", context))
+    calls = len(healthy.prompts)
+    asyncio.run(node.generate_category_briefing(docs, "financial", context))
+    assert len(healthy.prompts) == calls
+
+
+@pytest.mark.parametrize("mode", ["single", "map_reduce"])
+def test_briefing_does_not_block_the_event_loop(make_briefing, frozen_heap, mode):
+    sentence = "Acme raised $20 million in a Series B round led by Sequoia to expand its freight platform. "
+    docs = {
+        f"https://example{i}.com/funding": {
+            "title": f"Doc {i}",
+            "raw_content": sentence * 600,
+            "evaluation": {"overall_score": 1 - i / 20},
+        }
+        for i in range(20)
+    }
+    node = make_briefing(FakeGemini(latency=0.05), mode=mode)
+
+    async def run():
+        async with LoopLagMonitor() as monitor:
+            result = await node.generate_category_briefing(docs, "financial", {"company": "Acme"})
+        return result, monitor.stats()
+
+    result, lag = asyncio.run(run())
+
+    assert result["content"]
+    assert lag["samples"] > 0
+    assert lag["max_ms"] <= MAX_LOOP_LAG_MS, lag
+
+
+def test_partition_keeps_score_order_within_the_chunk_budget(make_briefing):
+    node = make_briefing(FakeGemini(), map_chunk_tokens=1000)
+    separator = "\n----\n"
+    instructions = "Extract the facts."
+    entries = [(1 - i / 10, f"Title: Doc {i}\n\nContent: " + " ".join(f"word{i}" for _ in range(150))) for i in range(8)]
+
+    chunks = node._partition(entries, instructions, separator)
+
+    assert len(chunks) > 1
+    assert [text for chunk in chunks for text in chunk] == [text for _, text in entries]
+    budget = node.map_chunk_tokens - briefing_module.token_estimator.count(instructions, node.model_name)
+    for chunk in chunks:
+        assert briefing_module.token_estimator.count(separator.join(chunk), node.model_name) <= budget
+
+
+def test_partition_gives_an_oversized_document_its_own_chunk(make_briefing):
+    node = make_briefing(FakeGemini(), map_chunk_tokens=300)
+    entries = [(0.9, "short one"), (0.8, "word " * 2000), (0.7, "short two")]
+
+    chunks = node._partition(entries, "Extract the facts.", "\n")
+
+    assert chunks == [["short one"], ["word " * 2000], ["short two"]]
+
+
+@pytest.mark.parametrize("max_prompt_tokens, map_reduce", [(30000, False), (2000, True)])
+def test_auto_mode_switches_to_map_reduce_only_when_documents_do_not_fit(make_briefing, max_prompt_tokens, map_reduce):
+    model = FakeGemini()
+    node = make_briefing(model, mode="auto", max_prompt_tokens=max_prompt_tokens, map_chunk_tokens=1500)
+
+    result = asyncio.run(node.generate_category_briefing(documents(6), "financial", {"company": "Acme"}))
+
+    assert result["content"]
+    map_prompts = [prompt for prompt in model.prompts if "list every relevant, verifiable fact" in prompt]
+    assert bool(map_prompts) == map_reduce
+    if map_reduce:
+        # Every document reaches a map prompt, and the reduce prompt sees the facts from each
+        assert all(any(f"Title: Doc {i}\n" in prompt for prompt in map_prompts) for i in range(6))
+        assert all(f"* Fact from Doc {i}" in model.prompts[-1] for i in range(6))
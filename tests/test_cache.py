@@ -0,0 +1,74 @@
+import os
+
+from backend.services import cache as cache_module
+from backend.services.cache import DiskCache, fingerprint
+
+
+def test_entries_expire_after_their_ttl(tmp_path, monkeypatch):
+    cache = DiskCache(str(tmp_path))
+    now = 1_000_000.0
+    monkeypatch.setattr(cache_module.time, "time", lambda: now)
+    cache.set("briefings", "a" * 64, {"content": "Acme"})
+
+    now += 60
+    assert cache.get("briefings", "a" * 64, ttl=120) == {"content": "Acme"}
+    now += 120
+    assert cache.get("briefings", "a" * 64, ttl=120) is None
+    assert not list(tmp_path.rglob("*.json"))
+    assert cache._counts["briefings"] == 0
+
+
+def test_eviction_drops_least_recently_used_entries(tmp_path):
+    cache = DiskCache(str(tmp_path), max_entries=10)
+    keys = [fingerprint(i) for i in range(10)]
+    for i, key in enumerate(keys):
+        cache.set("llm", key, i)
+        os.utime(cache._path("llm", key), (i, i))
+    # A read marks the oldest entry as recently used
+    assert cache.get("llm", keys[0], ttl=3600) == 0
+
+    cache.set("llm", fingerprint(10), 10)
+
+    # Trimmed to 90% of the cap: the two least recently used entries go
+    remaining = {path.stem for path in tmp_path.rglob("*.json")}
+    assert len(remaining) == 9 == cache._counts["llm"]
+    assert keys[0] in remaining and fingerprint(10) in remaining
+    assert not {keys[1], keys[2]} & remaining
+
+
+def test_counts_track_writes_and_removals_per_namespace(tmp_path):
+    DiskCache(str(tmp_path)).set("llm", fingerprint("old"), "value")
+    cache = DiskCache(str(tmp_path))
+
+    cache.set("llm", fingerprint("new"), "value")
+    cache.set("llm", fingerprint("new"), "overwritten")
+    cache.set("briefings", fingerprint("new"), "value")
+
+    # The first write scans what an earlier process left; overwrites don't count twice
+    assert cache._counts == {"llm": 2, "briefings": 1}
+    (cache._path("llm", fingerprint("old"))).write_text("not json")
+    assert cache.get("llm", fingerprint("old"), ttl=3600) is None
+    assert cache._counts["llm"] == 1
+
+
+def test_disabled_cache_reads_and_writes_nothing(tmp_path, monkeypatch):
+    monkeypatch.setenv("CACHE_ENABLED", "false")
+    cache = DiskCache(str(tmp_path))
+
+    cache.set("llm", fingerprint(1), "value")
+
+    assert cache.get("llm", fingerprint(1), ttl=3600) is None
+    assert not list(tmp_path.rglob("*"))
+
+
+def test_default_root_does_not_depend_on_the_working_directory(tmp_path, monkeypatch):
+    monkeypatch.delenv("CACHE_DIR", raising=False)
+    monkeypatch.chdir(tmp_path)
+
+    cache = DiskCache()
+
+    assert cache.root == cache_module.DEFAULT_CACHE_DIR
+    assert cache.root.is_absolute() and (cache.root.parent / "backend").is_dir()
+
+    monkeypatch.setenv("CACHE_DIR", str(tmp_path / "shared"))
+    assert DiskCache().root == tmp_path / "shared"
@@ -0,0 +1,67 @@
+import asyncio
+
+from backend.nodes.cleaner import ContentCleaner, shutdown_process_pool
+from backend.utils.content_cleaner import clean_document, is_boilerplate, remove_repeated_lines, site_of
+
+
+def test_drops_lines_made_only_of_boilerplate():
+    for line in [
+        "Accept all cookies",
+        "Privacy Policy | Terms of Service",
+        "[Sign in](https://example.com/login) · [Sign up](https://example.com/join)",
+        "Read more »",
+        "We use cookies to give you the best experience on our website.",
+        "© 2024 Acme Inc. All rights reserved.",
+    ]:
+        assert is_boilerplate(line), line
+
+
+def test_keeps_facts_that_mention_boilerplate_phrases():
+    facts = [
+        "Users can sign up for the new analytics platform starting in June.",
+        "The company updated its privacy policy after the GDPR fine in 2023.",
+        "Customers log in to the dashboard to track shipments in real time.",
+    ]
+    text = "\n".join(["Accept all cookies", *facts, "Privacy Policy", "Read more"])
+
+    cleaned = clean_document(text)
+
+    for fact in facts:
+        assert fact in cleaned
+    assert "Accept all cookies" not in cleaned
+    assert "Read more" not in cleaned
+
+
+def test_fact_shared_by_articles_on_different_sites_survives():
+    fact = "Acme raised a $40M Series B led by Example Ventures in March 2024."
+    texts = {
+        url: f"{url} coverage of the round.\n{fact}\nNewsletter and privacy settings for {url}"
+        for url in ("https://news.example.com/a", "https://www.wire.example.org/b", "https://blog.example.net/c")
+    }
+
+    cleaned = remove_repeated_lines(texts, {url: site_of(url) for url in texts})
+
+    for text in cleaned.values():
+        assert fact in text
+
+
+def test_lines_repeated_across_pages_of_one_site_are_removed():
+    footer = "Example News Group | Contact | Careers"
+    texts = {f"https://www.example.com/{i}": f"Story number {i} body text.\n{footer}" for i in range(3)}
+
+    cleaned = remove_repeated_lines(texts, {url: site_of(url) for url in texts})
+
+    for i, text in enumerate(cleaned.values()):
+        assert text == f"Story number {i} body text."
+
+
+def test_clean_texts_uses_process_pool_for_heavy_documents():
+    cleaner = ContentCleaner()
+    cleaner.pool_threshold = 100
+    texts = {1: "Accept all cookies\n" + "Acme ships freight software. " * 10, 2: "Accept all cookies\nShort page."}
+    try:
+        cleaned = asyncio.run(cleaner.clean_texts(texts, {}))
+    finally:
+        shutdown_process_pool()
+
+    assert cleaned == {1: ("Acme ships freight software. " * 10).strip(), 2: "Short page."}
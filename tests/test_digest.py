@@ -0,0 +1,97 @@
+from backend.utils.digest import MAX_FACT_CHARS, build_fact_sheet, strip_references
+
+FLAT_REPORT = """# Acme Research Report
+
+## Company Overview
+
+* Acme builds route-planning software for regional freight carriers.
+* Its platform cuts empty truck miles by matching loads across carriers.
+* Jane Doe is the CEO and co-founder of Acme.
+* Customers include Northline Freight and Baltic Haulage.
+
+## Financial Overview
+
+* Acme raised a $40M Series B in March 2024.
+
+## News
+
+* Acme launched a carbon reporting module in May 2024.
+
+## References
+
+* Example. "Acme raises $40M." Example News, 2024.
+"""
+
+
+def test_flat_company_overview_still_yields_what_the_company_does():
+    fact_sheet = build_fact_sheet(FLAT_REPORT, "Acme")
+
+    products = fact_sheet.split("Products & services:\n", 1)[1].split("\n\n", 1)[0]
+    assert "* Acme builds route-planning software for regional freight carriers." in products
+    assert "Jane Doe" not in products
+    assert "Leadership:\n* Jane Doe is the CEO and co-founder of Acme." in fact_sheet
+    assert "References" not in fact_sheet and "Example News" not in fact_sheet
+
+
+def test_subsection_headings_pick_facts_by_group():
+    report = """## Company Overview
+
+### Core Product/Service
+* Acme builds route-planning software.
+
+### Leadership Team
+* Jane Doe is the CEO.
+
+### Target Market
+* Regional freight carriers in Europe.
+
+## News
+
+* Acme launched a carbon reporting module.
+"""
+    fact_sheet = build_fact_sheet(report, "Acme")
+
+    assert "Products & services:\n* Acme builds route-planning software." in fact_sheet
+    assert "Leadership:\n* Jane Doe is the CEO." in fact_sheet
+    assert "Customers & market:\n* Regional freight carriers in Europe." in fact_sheet
+    assert "Recent news:\n* Acme launched a carbon reporting module." in fact_sheet
+
+
+def test_unstructured_report_falls_back_to_an_extractive_digest():
+    report = (
+        "Acme builds route-planning software for freight carriers. The weather was mild this year. "
+        "Acme raised $40M in funding from investors to grow its platform.\n\n"
+        "## References\n\n* Example. \"Acme raises $40M.\" Example News, 2024.\n"
+    )
+
+    fact_sheet = build_fact_sheet(report, "Acme")
+
+    assert "Acme raised $40M in funding" in fact_sheet
+    assert "Products & services:" not in fact_sheet
+    assert "Example News" not in fact_sheet
+
+
+def test_long_facts_are_truncated_and_shared_bullets_listed_once():
+    long_fact = "Acme's platform " + "matches loads across carriers and " * 20 + "cuts empty miles."
+    report = f"""## Company Overview
+
+### Products and Customers
+* {long_fact}
+* Acme sells to regional freight carriers.
+* Jane Doe is the CEO.
+
+## News
+
+* Acme launched a carbon reporting module.
+"""
+    fact_sheet = build_fact_sheet(report, "Acme")
+
+    facts = [line for line in fact_sheet.splitlines() if line.startswith("* ")]
+    assert len(facts) == len(set(facts))
+    assert all(len(fact) <= MAX_FACT_CHARS + len("* ") + 1 for fact in facts)
+    assert any(fact.endswith("…") for fact in facts)
+
+
+def test_strip_references_keeps_everything_before_the_section():
+    assert strip_references(FLAT_REPORT).endswith("* Acme launched a carbon reporting module in May 2024.")
+    assert strip_references("No references here.\n") == "No references here."
@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from backend.nodes import editor as editor_module
+from backend.nodes.editor import Editor
+
+
+class RecordingWebSocketManager:
+    def __init__(self) -> None:
+        self.updates = []
+
+    async def send_status_update(self, job_id, status, message=None, result=None, **kwargs):
+        self.updates.append((status, result or {}))
+
+    def client_report(self) -> str:
+        """The report as the UI shows it: report_chunk text appended, report_reset clearing it."""
+        report = ""
+        for status, result in self.updates:
+            if status == "report_chunk":
+                report += result["chunk"]
+            elif status == "report_reset":
+                report = ""
+        return report
+
+
+def fake_chat_stream(chunks, fail_after: int | None = None):
+    def chat_stream(client, **kwargs):
+        async def stream():
+            for i, chunk in enumerate(chunks):
+                if fail_after is not None and i == fail_after:
+                    raise RuntimeError("stream dropped")
+                yield chunk
+        return stream()
+    return chat_stream
+
+
+@pytest.fixture
+def editor(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    node = Editor()
+    node.sweep_mode = "never"
+    node.stream_window = 0
+    return node
+
+
+def run_edit(editor: Editor) -> tuple:
+    websocket_manager = RecordingWebSocketManager()
+    state = {"company": "Acme", "job_id": "job", "websocket_manager": websocket_manager}
+    briefings = {"company": "### Products\n* Acme builds freight software.", "news": "* Acme launched X."}
+    report = asyncio.run(editor.edit_report(state, briefings, {"company": "Acme"}))
+    return report, websocket_manager
+
+
+def test_clients_end_with_the_normalized_report(editor, monkeypatch):
+    chunks = ["# Acme Research Report\n## Company Overview\n", "- Acme builds freight software.\n\n\n", "## News\n- Acme launched X.\n"]
+    monkeypatch.setattr(editor_module.llm_cache, "chat_stream", fake_chat_stream(chunks))
+
+    report, websocket_manager = run_edit(editor)
+
+    assert "* Acme builds freight software." in report
+    assert websocket_manager.client_report() == report
+
+
+def test_clients_end_with_the_fallback_when_the_compile_stream_fails(editor, monkeypatch):
+    chunks = ["# Acme Research Report\n## Company Overview\n", "* Acme builds", " freight software.\n"]
+    monkeypatch.setattr(editor_module.llm_cache, "chat_stream", fake_chat_stream(chunks, fail_after=2))
+
+    report, websocket_manager = run_edit(editor)
+
+    assert "Acme launched X." in report
+    assert websocket_manager.client_report() == report
+
+
+def test_no_reset_when_the_stream_already_matches(editor, monkeypatch):
+    chunks = ["# Acme Research Report\n\n## Company Overview\n\n", "* Acme builds freight software.\n\n## News\n\n* Acme launched X.\n"]
+    monkeypatch.setattr(editor_module.llm_cache, "chat_stream", fake_chat_stream(chunks))
+
+    report, websocket_manager = run_edit(editor)
+
+    assert websocket_manager.client_report() == report
+    assert "report_reset" not in [status for status, _ in websocket_manager.updates]
+
+
+def fake_section_chat(delays: dict, fail: str | None = None):
+    """Edits a section after its delay; the ``fail`` section raises instead."""
+    async def chat(client, **kwargs):
+        prompt = kwargs["messages"][-1]["content"]
+        title = prompt[len("You are editing the "):prompt.index(" section")]
+        await asyncio.sleep(delays.get(title, 0))
+        if title == fail:
+            raise RuntimeError("section edit failed")
+        return f"* Edited {title}.\n"
+    return chat
+
+
+def test_sectioned_report_is_stitched_in_report_order(editor, monkeypatch):
+    # The news section finishes first, company overview last
+    delays = {"Company Overview": 0.05, "Financial Overview": 0.02, "News": 0}
+    monkeypatch.setattr(editor_module.llm_cache, "chat", fake_section_chat(delays, fail="Financial Overview"))
+    editor.mode = "sectioned"
+    websocket_manager = RecordingWebSocketManager()
+    state = {"company": "Acme", "job_id": "job", "websocket_manager": websocket_manager}
+    briefings = {
+        "news": "* Acme launched X.",
+        "financial": "* Acme raised $10M.",
+        "company": "### Products\n* Acme builds freight software.",
+    }
+
+    report = asyncio.run(editor.edit_report(state, briefings, {"company": "Acme"}))
+
+    sections = [line for line in report.splitlines() if line.startswith("## ")]
+    assert sections == ["## Company Overview", "## Financial Overview", "## News"]
+    assert "* Edited Company Overview." in report and "* Edited News." in report
+    # A failed section edit falls back to the briefing itself
+    assert "* Acme raised $10M." in report
+    assert websocket_manager.client_report().strip() == report.strip()
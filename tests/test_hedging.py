@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from backend.services.hedging import Hedger
+
+
+class FakeModels:
+    """Streams per model after a first-token delay, recording which streams started and were closed."""
+
+    def __init__(self, delays: dict, fail: str | None = None) -> None:
+        self.delays = delays
+        self.fail = fail
+        self.started = []
+        self.closed = []
+
+    def attempt(self, model: str):
+        async def stream():
+            self.started.append(model)
+            try:
+                await asyncio.sleep(self.delays[model])
+                if model == self.fail:
+                    raise RuntimeError(f"{model} is down")
+                for text in (f"{model}: ", "done"):
+                    yield text
+            finally:
+                self.closed.append(model)
+        return stream()
+
+
+def hedger(enabled: bool = True) -> Hedger:
+    hedger = Hedger()
+    hedger.enabled = enabled
+    hedger.default_delay = 0.02
+    return hedger
+
+
+async def collect(hedger: Hedger, models: FakeModels, model: str = "gpt-4o") -> str:
+    return "".join([text async for text in hedger.stream("email", model, models.attempt)])
+
+
+def test_slow_primary_is_hedged_and_the_loser_cancelled():
+    models = FakeModels({"gpt-4o": 5, "gpt-4.1-mini": 0.01})
+    h = hedger()
+
+    text = asyncio.run(asyncio.wait_for(collect(h, models), 1))
+
+    assert text == "gpt-4.1-mini: done"
+    assert models.started == ["gpt-4o", "gpt-4.1-mini"]
+    assert "gpt-4o" in models.closed
+    assert h._inflight == 0
+
+
+def test_fast_primary_is_not_hedged():
+    models = FakeModels({"gpt-4o": 0, "gpt-4.1-mini": 0})
+
+    assert asyncio.run(collect(hedger(), models)) == "gpt-4o: done"
+    assert models.started == ["gpt-4o"]
+
+
+def test_primary_failing_before_its_first_token_fails_over():
+    models = FakeModels({"gpt-4o": 0, "gpt-4.1-mini": 0}, fail="gpt-4o")
+
+    assert asyncio.run(collect(hedger(), models)) == "gpt-4.1-mini: done"
+
+
+def test_disabled_hedger_waits_for_the_primary_and_raises_its_errors():
+    models = FakeModels({"gpt-4o": 0.05, "gpt-4.1-mini": 0})
+
+    assert asyncio.run(collect(hedger(enabled=False), models)) == "gpt-4o: done"
+    assert models.started == ["gpt-4o"]
+
+    failing = FakeModels({"gpt-4o": 0, "gpt-4.1-mini": 0}, fail="gpt-4o")
+    with pytest.raises(RuntimeError, match="gpt-4o is down"):
+        asyncio.run(collect(hedger(enabled=False), failing))
@@ -0,0 +1,83 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from backend.services.cache import DiskCache
+from backend.services.llm_cache import LLMCache
+
+MESSAGES = [{"role": "user", "content": "Summarize Acme."}]
+
+
+class FakeOpenAI:
+    def __init__(self) -> None:
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **request):
+        self.requests.append(request)
+        message = SimpleNamespace(content=f"Answer {len(self.requests)}")
+        return SimpleNamespace(usage=None, choices=[SimpleNamespace(message=message)])
+
+
+@pytest.fixture
+def llm_cache(monkeypatch, tmp_path):
+    monkeypatch.setenv("CACHE_ENABLED", "true")
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "true")
+    cache = LLMCache()
+    cache.store = DiskCache(str(tmp_path))
+    return cache
+
+
+def test_key_covers_what_changes_the_response(llm_cache):
+    key = llm_cache.key("openai", "gpt-4.1", MESSAGES, {"temperature": 0, "stream": True}, "1")
+
+    assert key == llm_cache.key("openai", "gpt-4.1", MESSAGES, {"temperature": 0, "stream": False}, "1")
+    assert key != llm_cache.key("openai", "gpt-4.1", MESSAGES, {"temperature": 0}, "2")
+    assert key != llm_cache.key("openai", "gpt-4.1-mini", MESSAGES, {"temperature": 0}, "1")
+    assert key != llm_cache.key("openai", "gpt-4.1", MESSAGES, {"temperature": 0, "max_tokens": 10}, "1")
+    assert llm_cache.key("openai", "gpt-4.1", MESSAGES, {"temperature": 0.7}, "1") is None
+    assert llm_cache.key("openai", "gpt-4.1", MESSAGES, {}, "1") is None
+
+
+@pytest.mark.parametrize("temperature, calls", [(0, 1), (0.7, 2)])
+def test_only_deterministic_calls_are_served_from_the_cache(llm_cache, temperature, calls):
+    client = FakeOpenAI()
+
+    async def ask():
+        return await llm_cache.chat(client, model="gpt-4.1", messages=MESSAGES, temperature=temperature)
+
+    first, second = asyncio.run(ask()), asyncio.run(ask())
+
+    assert len(client.requests) == calls
+    assert (first == second) == (calls == 1)
+
+
+def test_responses_served_by_another_model_are_not_stored(llm_cache, tmp_path):
+    key = llm_cache.key("openai", "gpt-4o", MESSAGES, {"temperature": 0})
+
+    async def produce():
+        yield "from the backup"
+
+    async def run(served_by):
+        return "".join([text async for text in llm_cache.stream(key, produce, "openai", "gpt-4o", served_by)])
+
+    assert asyncio.run(run(["gpt-4.1-mini"])) == "from the backup"
+    assert not list(tmp_path.rglob("*.json"))
+    asyncio.run(run(["gpt-4o"]))
+    assert len(list(tmp_path.rglob("*.json"))) == 1
+
+
+def test_failed_streams_are_not_stored(llm_cache, tmp_path):
+    key = llm_cache.key("openai", "gpt-4o", MESSAGES, {"temperature": 0})
+
+    async def produce():
+        yield "partial"
+        raise RuntimeError("stream dropped")
+
+    async def run():
+        return [text async for text in llm_cache.stream(key, produce, "openai", "gpt-4o")]
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
+    assert not list(tmp_path.rglob("*.json"))
@@ -0,0 +1,26 @@
+from backend.utils.markdown import normalize_report, validate_report
+
+
+def test_preamble_before_first_section_fails_validation():
+    report = normalize_report("Here is the report:\n\n## Company Overview\n* Acme builds freight software.\n", "Acme")
+
+    issues = validate_report(report)
+
+    assert any(issue.startswith("preamble:") for issue in issues)
+    assert any(issue.startswith("meta_commentary:") for issue in issues)
+
+
+def test_clean_report_passes_validation():
+    report = normalize_report("# Acme Research Report\n## Company Overview\n* Acme builds freight software.\n", "Acme")
+
+    assert validate_report(report) == []
+
+
+def test_news_is_flattened_and_code_fences_dropped():
+    report = normalize_report(
+        "```markdown\n# Acme Research Report\n## News\n### Launches\n- Acme launched X.\n```\n", "Acme"
+    )
+
+    assert "```" not in report
+    assert "### Launches" not in report
+    assert "## News\n\n* Acme launched X." in report
@@ -0,0 +1,72 @@
+import asyncio
+
+from backend.services.outreach import OutreachService
+
+REPORT = "# Acme Research Report\n\n## Company Overview\n\n* Acme builds freight software.\n"
+
+
+def fake_generator(service: OutreachService, fail_persona: str | None = None) -> list:
+    """Replace the email/proposal generators; returns the contexts they were called with."""
+    calls = []
+
+    async def chunks(kind, context):
+        calls.append(context)
+        await asyncio.sleep(0.01)
+        if context["persona"] == fail_persona:
+            raise RuntimeError("generation failed")
+        yield f"{kind} for {context['persona']}: "
+        yield context["help_description"]
+
+    service._chunks = chunks
+    return calls
+
+
+async def collect(service: OutreachService, variants: list) -> list:
+    context = {"company": "Acme", "report": REPORT, "help_description": "freight analytics"}
+    return [result async for result in service.batch("email", "job", context, variants)]
+
+
+def test_batch_generates_identical_variants_once():
+    service = OutreachService()
+    calls = fake_generator(service)
+    variants = [{"persona": "CFO"}, {"persona": "CTO", "help_description": "routing"}, {"persona": " CFO "}]
+
+    results = asyncio.run(collect(service, variants))
+
+    assert len(calls) == 2
+    assert sorted(result["index"] for result in results) == [0, 1, 2]
+    texts = {result["index"]: result["text"] for result in results}
+    assert texts[0] == texts[2] == "email for CFO: freight analytics"
+    assert texts[1] == "email for CTO: routing"
+    # Generators read the fact sheet, not the report
+    assert all(call["digest"] for call in calls)
+
+
+def test_batch_reports_failed_variants_without_memoizing_them():
+    service = OutreachService()
+    fake_generator(service, fail_persona="CTO")
+
+    results = asyncio.run(collect(service, [{"persona": "CFO"}, {"persona": "CTO"}]))
+
+    failed = [result for result in results if "error" in result]
+    assert [(result["index"], result["text"]) for result in failed] == [(1, "")]
+
+    # A retry regenerates the failed variant and serves the other from memory
+    retry_calls = fake_generator(service)
+    results = asyncio.run(collect(service, [{"persona": "CFO"}, {"persona": "CTO"}]))
+    assert [call["persona"] for call in retry_calls] == ["CTO"]
+    assert not any("error" in result for result in results)
+
+
+def test_concurrent_requests_share_one_generation():
+    service = OutreachService()
+    calls = fake_generator(service)
+    context = {"company": "Acme", "report": REPORT, "persona": "CFO", "help_description": "freight analytics"}
+
+    async def run():
+        return await asyncio.gather(*[service.generate("email", "job", dict(context)) for _ in range(3)])
+
+    texts = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert texts == ["email for CFO: freight analytics"] * 3
@@ -0,0 +1,60 @@
+import random
+
+from backend.utils.references import ReferenceIndex, process_references_from_search_results
+
+CATEGORIES = ['curated_company_data', 'curated_industry_data', 'curated_financial_data', 'curated_news_data']
+
+
+def search_results(count: int, seed: int = 0) -> list:
+    """Search result documents where every other URL repeats the previous one with a tracking parameter."""
+    rng = random.Random(seed)
+    scores = rng.sample(range(1000), count)
+    docs = []
+    for i in range(count):
+        url = f"https://www.site{i // 2 % 17}.com/articles/{i // 2}"
+        if i % 2:
+            url += "?utm_source=search"
+        docs.append({'url': url, 'title': f"Article {i} about Acme", 'score': scores[i] / 1000})
+    return docs
+
+
+def test_index_ranks_references_like_the_full_rebuild():
+    # Scores are distinct: the rebuild breaks ties by category order, the index by search order
+    docs = search_results(200)
+    index = ReferenceIndex()
+    state = {category: {} for category in CATEGORIES}
+    rng = random.Random(1)
+    for doc in docs:
+        index.add_document(doc)
+        state[rng.choice(CATEGORIES)][doc['url']] = doc
+
+    baseline_urls, _, baseline_info = process_references_from_search_results(state)
+    urls, _, info = index.select_references([url for docs in state.values() for url in docs])
+
+    assert urls == baseline_urls
+    assert [info[url]['score'] for url in urls] == [baseline_info[url]['score'] for url in baseline_urls]
+
+
+def test_index_keeps_best_score_and_restricts_to_curated_urls():
+    index = ReferenceIndex()
+    index.add("https://example.com/a?utm_source=x", "A", 0.4)
+    index.add("https://example.com/a", "", 0.8)
+    index.add("https://example.com/b", "B", 0.9)
+    index.add("https://example.com/c", "C", 0.6)
+
+    urls, titles, info = index.select_references(["https://example.com/a", "https://example.com/c"])
+
+    assert urls == ["https://example.com/a", "https://example.com/c"]
+    assert info["https://example.com/a"]['score'] == 0.8
+    assert titles["https://example.com/a"] == "A"
+    assert "https://example.com/b" not in info
+
+
+def test_index_breaks_score_ties_by_search_order():
+    index = ReferenceIndex()
+    for name in ("first", "second", "third"):
+        index.add(f"https://example.com/{name}", name.title(), 0.5)
+
+    urls, _, _ = index.select_references(k=2)
+
+    assert urls == ["https://example.com/first", "https://example.com/second"]
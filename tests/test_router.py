@@ -0,0 +1,56 @@
+from backend.services import router as router_module
+from backend.services.router import ModelRouter, latency_tier
+from backend.services.usage import Call
+
+
+def failed_call(model: str) -> Call:
+    call = Call("openai", model)
+    call.error = True
+    return call
+
+
+def test_input_size_and_tier_pick_the_model():
+    router = ModelRouter()
+
+    assert router.choose("email", 500) == "gpt-4.1-mini"
+    assert router.choose("email", 5_000) == "gpt-4o"
+    with latency_tier("fast"):
+        assert router.choose("email", 5_000) == "gpt-4.1-mini"
+    with latency_tier("quality"):
+        assert router.choose("email", 500) == "gpt-4o"
+    # Too large for gpt-4o's context window
+    assert router.choose("email", 200_000) == "gpt-4.1"
+
+
+def test_unhealthy_models_are_skipped_until_the_cooldown_ends(monkeypatch):
+    router = ModelRouter()
+    now = 1000.0
+    monkeypatch.setattr(router_module.time, "monotonic", lambda: now)
+
+    for _ in range(router.failure_threshold):
+        router.observe(failed_call("gpt-4.1-nano"))
+
+    assert router.choose("query_generation", 500) == "gpt-4.1-mini"
+    now += router.cooldown + 1
+    assert router.choose("query_generation", 500) == "gpt-4.1-nano"
+
+
+def test_a_success_resets_the_failure_count():
+    router = ModelRouter()
+    for _ in range(router.failure_threshold - 1):
+        router.observe(failed_call("gpt-4.1-nano"))
+    router.observe(Call("openai", "gpt-4.1-nano"))
+    router.observe(failed_call("gpt-4.1-nano"))
+
+    assert router.healthy("gpt-4.1-nano")
+
+
+def test_backup_is_a_healthy_model_with_at_least_the_same_context():
+    router = ModelRouter()
+
+    assert router.backup("email", "gpt-4o") == "gpt-4.1-mini"
+    assert router.backup("email", "gpt-4.1") == "gpt-4.1-mini"
+    for _ in range(router.failure_threshold):
+        router.observe(failed_call("gpt-4.1-mini"))
+    assert router.backup("email", "gpt-4o") == "gpt-4.1"
+    assert router.backup("briefing", "gemini-2.0-flash") == "gemini-2.0-flash-lite"
@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from tavily.errors import BadRequestError, InvalidAPIKeyError, UsageLimitExceededError
+
+from backend.services.tavily_client import TavilyClient
+
+
+def tavily(handler) -> TavilyClient:
+    return TavilyClient(httpx.AsyncClient(base_url="https://api.tavily.com", transport=httpx.MockTransport(handler)))
+
+
+def respond(status_code: int, body=None):
+    return lambda request: httpx.Response(status_code, json=body)
+
+
+@pytest.mark.parametrize("status_code, body, error, message", [
+    (400, {"detail": {"error": "Query is too long."}}, BadRequestError, "Query is too long."),
+    (400, None, BadRequestError, "Bad request. The request was invalid or cannot be served."),
+    (401, {"detail": {"error": "Unauthorized"}}, InvalidAPIKeyError, None),
+    (429, {"detail": {"error": "Plan limit reached."}}, UsageLimitExceededError, "Plan limit reached."),
+])
+def test_errors_map_to_the_sdk_exceptions(status_code, body, error, message):
+    client = tavily(respond(status_code, body))
+
+    with pytest.raises(error) as raised:
+        asyncio.run(client.search("Acme funding"))
+
+    if message:
+        assert message in str(raised.value)
+
+
+def test_other_errors_raise_http_status_errors():
+    client = tavily(respond(500, {"detail": "boom"}))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(client.extract(["https://example.com"]))
+
+
+def test_requests_match_the_sdk_bodies_and_defaults():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append((request.url.path, json.loads(request.content)))
+        return httpx.Response(200, json={"query": "Acme"})
+
+    client = tavily(handler)
+    search = asyncio.run(client.search("Acme funding", search_depth="advanced", include_domains=["acme.com"]))
+    extract = asyncio.run(client.extract("https://acme.com", extract_depth="advanced"))
+
+    assert requests[0] == ("/search", {
+        "query": "Acme funding", "search_depth": "advanced", "topic": "general", "days": 3,
+        "include_answer": False, "include_raw_content": False, "max_results": 5,
+        "include_domains": ["acme.com"], "exclude_domains": None, "include_images": False,
+    })
+    assert requests[1] == ("/extract", {"urls": "https://acme.com", "extract_depth": "advanced"})
+    assert search["results"] == []
+    assert extract["results"] == [] and extract["failed_results"] == []
+
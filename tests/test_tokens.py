@@ -0,0 +1,46 @@
+from backend.utils.tokens import count_pieces, pack_by_value, pack_documents, token_estimator
+
+
+def test_pack_by_value_fills_by_value_per_token():
+    # (value, tokens): the two dense items fit together and beat the single large one
+    items = [(1.0, 100), (0.9, 40), (0.8, 40), (0.1, 50)]
+
+    assert pack_by_value(items, 100) == [1, 2]
+
+
+def test_pack_by_value_prefers_one_item_worth_more_than_the_greedy_fill():
+    items = [(0.2, 10), (5.0, 95)]
+
+    assert pack_by_value(items, 100) == [1]
+
+
+def test_pack_by_value_never_exceeds_the_budget():
+    items = [(float(i % 7 + 1), i * 3 + 1) for i in range(40)]
+
+    chosen = pack_by_value(items, 200)
+
+    assert sum(items[i][1] for i in chosen) <= 200
+    assert pack_by_value([(1.0, 300)], 200) == []
+
+
+def test_pack_documents_keeps_order_and_reports_stats():
+    entries = [
+        (0.9, "Acme raised $40M in a Series B. " * 20),
+        (0.1, "Unrelated filler text about weather. " * 200),
+        (0.8, "Acme launched a carbon reporting module. " * 20),
+    ]
+    budget = token_estimator.count(entries[0][1]) + token_estimator.count(entries[2][1]) + 10
+
+    texts, stats = pack_documents(entries, budget, separator="\n")
+
+    assert texts == [entries[0][1], entries[2][1]]
+    assert stats["docs_packed"] == 2 and stats["docs_dropped"] == 1
+    assert stats["packed_tokens"] <= budget
+    assert stats["available_tokens"] > stats["packed_tokens"]
+
+
+def test_count_pieces_is_stable_across_cache_hits():
+    text = "Acme builds route-planning software for freight carriers. " * 20
+
+    assert count_pieces(text) == count_pieces(text) > 0
+    assert count_pieces("") == 0
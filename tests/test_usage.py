@@ -0,0 +1,77 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from backend.services.clients import tavily_credits
+from backend.services.usage import UsageTracker, usage_scope
+
+
+def openai_usage(prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0):
+    return SimpleNamespace(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=cached_tokens),
+    )
+
+
+def test_calls_are_charged_to_the_scope_of_the_task_that_made_them():
+    tracker = UsageTracker()
+
+    async def call(model: str) -> None:
+        async with tracker.track("openai", model) as usage:
+            usage.add_openai(openai_usage(1_000_000, 500_000, cached_tokens=200_000))
+
+    async def run():
+        with usage_scope("job", "editor"):
+            # Tasks started inside the scope inherit it
+            await asyncio.gather(call("gpt-4.1-mini"), call("gpt-4.1-mini"))
+        await call("gpt-4.1-mini")
+
+    asyncio.run(run())
+
+    rows = tracker.get("job")["by_node"]
+    assert [(row["node"], row["calls"], row["input_tokens"]) for row in rows] == [("editor", 2, 2_000_000)]
+    # 800k uncached input at $0.40/M, 200k cached at $0.10/M and 500k output at $1.60/M, twice
+    assert rows[0]["cost_usd"] == pytest.approx(2 * (0.32 + 0.02 + 0.80))
+    assert tracker.aggregate()["total"]["calls"] == 3
+
+
+def test_errors_cache_hits_and_tavily_credits_are_counted():
+    tracker = UsageTracker()
+    tracker.tavily_credit_price = 0.01
+
+    async def run():
+        with usage_scope("job", "researcher"):
+            with pytest.raises(RuntimeError):
+                async with tracker.track("gemini", "gemini-2.0-flash"):
+                    raise RuntimeError("timeout")
+            async with tracker.track("tavily") as call:
+                call.credits = 2
+            tracker.cache_hit("openai", "gpt-4.1")
+
+    asyncio.run(run())
+
+    by_provider = tracker.get("job")["by_provider"]
+    assert by_provider["gemini"]["errors"] == 1 and by_provider["gemini"]["calls"] == 1
+    assert by_provider["tavily"]["cost_usd"] == pytest.approx(0.02)
+    assert by_provider["openai"]["cache_hits"] == 1 and by_provider["openai"]["calls"] == 0
+
+
+def test_oldest_jobs_are_forgotten_but_totals_keep_them():
+    tracker = UsageTracker(max_jobs=2)
+    for job_id in ("a", "b", "c"):
+        with usage_scope(job_id, "briefing"):
+            tracker.cache_hit("gemini", "gemini-2.0-flash")
+
+    assert tracker.get("a")["by_node"] == []
+    assert tracker.get("c")["total"]["cache_hits"] == 1
+    assert tracker.aggregate()["jobs"] == 3
+    assert tracker.aggregate()["total"]["cache_hits"] == 3
+
+
+def test_tavily_credits_follow_depth_and_extract_url_count():
+    assert tavily_credits("/search", {"search_depth": "basic"}) == 1
+    assert tavily_credits("/search", {"search_depth": "advanced"}) == 2
+    assert tavily_credits("/extract", {"urls": "https://acme.com"}) == 1
+    assert tavily_credits("/extract", {"urls": [f"https://acme.com/{i}" for i in range(6)], "extract_depth": "advanced"}) == 4
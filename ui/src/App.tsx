@@ -20,7 +20,7 @@ import { useCustomAuthStore } from './stores/customAuth';
 import {ResearchOutput, DocCount,DocCounts, EnrichmentCounts, ResearchState, ResearchStatusType} from './types';
 import { checkForFinalReport } from './utils/handlers';
 import { colorAnimation, dmSansStyle, glassStyle, fadeInAnimation } from './styles';
-import { apiRequest } from './utils/api';
+import { apiRequest, streamOutreach } from './utils/api';
 import { API_BASE_URL, WS_BASE_URL } from './utils/constants';
 
 // Use centralized API configuration
@@ -142,6 +142,7 @@ function AppContent() {
   
   // Research session management
   const [currentResearchId, setCurrentResearchId] = useState<string | null>(null);
+  const [jobId, setJobId] = useState<string | null>(null);
   
   // Add useEffect for color cycling
   useEffect(() => {
@@ -199,6 +200,7 @@ function AppContent() {
       setIsEmailGenerating(false);
       setProposal(null); // Reset proposal state
       setIsProposalGenerating(false);
+      setJobId(null);
     }, 300); // Match this with CSS transition duration
   };
 
@@ -331,6 +333,8 @@ function AppContent() {
             step: "Generating Email",
             message: statusData.message || "Generating personalized outreach email..."
           });
+        } else if (statusData.status === "email_chunk") {
+          setEmail((prev) => (prev || "") + statusData.result.chunk);
         } else if (statusData.status === "email_ready") {
           setIsEmailGenerating(false);
           if (statusData.result?.email) {
@@ -345,6 +349,8 @@ function AppContent() {
             step: "Generating Proposal",
             message: statusData.message || "Generating partnership proposal..."
           });
+        } else if (statusData.status === "proposal_chunk") {
+          setProposal((prev) => (prev || "") + statusData.result.chunk);
         } else if (statusData.status === "proposal_ready") {
           setIsProposalGenerating(false);
           if (statusData.result?.proposal) {
@@ -661,6 +667,15 @@ function AppContent() {
             },
           }));
         }
+        // The editor is about to re-stream a revised report
+        else if (statusData.status === "report_reset") {
+          setOutput(() => ({
+            summary: "Generating report...",
+            details: {
+              report: "",
+            },
+          }));
+        }
         // Handle other status updates
         else if (statusData.status === "processing") {
           setIsComplete(false);
@@ -782,6 +797,7 @@ function AppContent() {
       const data = await response.json();
 
       if (data.job_id) {
+        setJobId(data.job_id);
         console.log("Connecting WebSocket with job_id:", data.job_id);
         connectWebSocket(data.job_id);
       } else {
@@ -812,6 +828,27 @@ function AppContent() {
     }
   };
 
+  // Stream an outreach email or proposal for the finished report
+  const handleGenerateOutreach = async (kind: 'email' | 'proposal') => {
+    if (!jobId) return;
+    const setText = kind === 'email' ? setEmail : setProposal;
+    const setGenerating = kind === 'email' ? setIsEmailGenerating : setIsProposalGenerating;
+
+    setText(null);
+    setGenerating(true);
+    try {
+      await streamOutreach(jobId, kind, (chunk) => {
+        setGenerating(false);
+        setText((prev) => (prev || "") + chunk);
+      });
+    } catch (err) {
+      console.error(`Failed to generate ${kind}: `, err);
+      setError(err instanceof Error ? err.message : `Failed to generate ${kind}`);
+    } finally {
+      setGenerating(false);
+    }
+  };
+
   // Add document count display component
 
   // Add BriefingProgress component
@@ -843,6 +880,30 @@ function AppContent() {
       );
     }
 
+    // Email and proposal are generated on demand once the report is ready
+    if (isComplete && jobId && ((!email && !isEmailGenerating) || (!proposal && !isProposalGenerating))) {
+      components.push(
+        <div key="outreach-actions" className={`${glassStyle.card} ${fadeInAnimation.fadeIn} flex flex-wrap gap-3 font-['DM_Sans']`}>
+          {!email && !isEmailGenerating && (
+            <button
+              onClick={() => handleGenerateOutreach('email')}
+              className="inline-flex items-center justify-center px-4 py-2 rounded-lg bg-[#468BFF] text-white hover:bg-[#8FBCFA] transition-all duration-200"
+            >
+              Generate outreach email
+            </button>
+          )}
+          {!proposal && !isProposalGenerating && (
+            <button
+              onClick={() => handleGenerateOutreach('proposal')}
+              className="inline-flex items-center justify-center px-4 py-2 rounded-lg bg-[#468BFF] text-white hover:bg-[#8FBCFA] transition-all duration-200"
+            >
+              Generate proposal
+            </button>
+          )}
+        </div>
+      );
+    }
+
     // Email Display (show when email is available or being generated)
     if (email || isEmailGenerating) {
       components.push(
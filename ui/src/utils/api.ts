@@ -63,4 +63,31 @@ export const getResearchStatus = async (jobId: string) => {
   }
 
   return response.json();
-}; 
\ No newline at end of file
+}; 
+export const streamOutreach = async (
+  jobId: string,
+  kind: 'email' | 'proposal',
+  onChunk: (text: string) => void,
+  helpDescription?: string
+) => {
+  const response = await fetch(`${API_BASE_URL}/research/${jobId}/${kind}`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify(helpDescription ? { help_description: helpDescription } : {}),
+  });
+
+  if (!response.ok || !response.body) {
+    const error = await response.json().catch(() => ({}));
+    throw new Error(error.detail || `Failed to generate ${kind}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    onChunk(decoder.decode(value, { stream: true }));
+  }
+};